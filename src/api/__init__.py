@@ -6,5 +6,6 @@ parallel processing of images and video streams.
 """
 
 from src.api.async_detector import AsyncDetector
+from src.api.batch_scheduler import BatchScheduler
 
-__all__ = ['AsyncDetector']
+__all__ = ['AsyncDetector', 'BatchScheduler']
@@ -150,7 +150,7 @@ class AsyncDetector:
             )
 
         # Submit detection task to thread pool
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         try:
             result = await loop.run_in_executor(
                 self.executor,
@@ -279,7 +279,7 @@ class AsyncDetector:
         batches = self._split_into_batches(images, batch_size)
 
         # Process batches asynchronously
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         tasks = [
             loop.run_in_executor(self.executor, self._detect_batch_sync, batch)
             for batch in batches
@@ -0,0 +1,233 @@
+"""
+BatchScheduler - Micro-batching scheduler for concurrent detection requests.
+
+Coalesces images submitted from many coroutines into detect_batch calls,
+so concurrent callers share one batched forward pass instead of each
+running its own single-image inference.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.detection.base import AbstractDetector, DetectionResult
+
+
+# Queue item telling the consumer to finish the current batch and exit
+_STOP = object()
+
+
+class BatchScheduler:
+    """
+    Async micro-batcher in front of a detector's detect_batch.
+
+    Submitted images are queued; a single consumer coroutine takes the
+    first waiting image, keeps collecting until it has max_batch images or
+    max_delay_ms has passed, then runs detect_batch once on a worker thread
+    and hands each caller its own result. Images submitted while a batch is
+    running are queued for the next one.
+
+    Example:
+        >>> base_detector = YOLOv8Detector()
+        >>> base_detector.load_model('yolov8n.pt', device='cpu')
+        >>>
+        >>> async def process(images):
+        ...     async with BatchScheduler(base_detector, max_batch=8) as scheduler:
+        ...         return await asyncio.gather(*(scheduler.submit(img) for img in images))
+    """
+
+    def __init__(
+        self,
+        detector: AbstractDetector,
+        max_batch: int = 8,
+        max_delay_ms: float = 5.0,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize BatchScheduler.
+
+        Args:
+            detector: Base detector implementing AbstractDetector interface
+            max_batch: Maximum number of images per detect_batch call (default: 8)
+            max_delay_ms: Longest time the first image of a batch waits for
+                more images before the batch is dispatched (default: 5.0)
+            executor: Executor for detect_batch calls (default: the event
+                loop's default executor)
+
+        Raises:
+            ValueError: If detector is None, max_batch < 1 or max_delay_ms < 0
+        """
+        if detector is None:
+            raise ValueError("Detector cannot be None")
+
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch}")
+
+        if max_delay_ms < 0:
+            raise ValueError(f"max_delay_ms must be >= 0, got {max_delay_ms}")
+
+        self.detector = detector
+        self.max_batch = max_batch
+        self.max_delay_ms = max_delay_ms
+        self.executor = executor
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self._batches = 0
+        self._images = 0
+
+    async def start(self) -> None:
+        """
+        Start the consumer on the running event loop.
+
+        Called automatically by submit() and on entering the async context.
+        """
+        if self._consumer is None:
+            self._queue = asyncio.Queue()
+            self._consumer = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, image: np.ndarray) -> DetectionResult:
+        """
+        Queue an image for batched detection and wait for its result.
+
+        Args:
+            image: Input image as numpy array (H, W, C) in RGB format
+
+        Returns:
+            DetectionResult for this image
+
+        Raises:
+            RuntimeError: If the scheduler has been closed
+            ValueError: If image format is invalid
+            Exception: Propagates the detect_batch error of the batch the
+                image was part of
+        """
+        if self._closed:
+            raise RuntimeError("BatchScheduler has been closed")
+
+        if not isinstance(image, np.ndarray):
+            raise ValueError(f"Image must be numpy array, got {type(image)}")
+
+        if len(image.shape) != 3 or image.shape[2] != 3:
+            raise ValueError(
+                f"Image must have shape (H, W, 3), got {image.shape}"
+            )
+
+        await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((image, future))
+        return await future
+
+    async def close(self) -> None:
+        """
+        Stop accepting images and wait for queued ones to be processed.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        if self._consumer is not None:
+            self._queue.put_nowait(_STOP)
+            await self._consumer
+
+    async def __aenter__(self):
+        """Async context manager entry - starts the consumer."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - drains the queue."""
+        await self.close()
+        return False
+
+    async def _run(self) -> None:
+        """Consumer loop: collect a batch, dispatch it, repeat until stopped."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.max_delay_ms / 1000
+
+            while len(batch) < self.max_batch:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._dispatch(loop, batch)
+
+    async def _dispatch(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        batch: List[Tuple[np.ndarray, asyncio.Future]]
+    ) -> None:
+        """
+        Run detect_batch on a worker thread and resolve each caller's future.
+
+        Args:
+            loop: Running event loop
+            batch: (image, future) pairs
+        """
+        # Callers that gave up (e.g. timed out) don't need a result
+        batch = [(image, future) for image, future in batch if not future.done()]
+        if not batch:
+            return
+
+        images = [image for image, _ in batch]
+        try:
+            results = await loop.run_in_executor(
+                self.executor, self.detector.detect_batch, images
+            )
+            if len(results) != len(images):
+                raise RuntimeError(
+                    f"detect_batch returned {len(results)} results for {len(images)} images"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._images += len(images)
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics.
+
+        Returns:
+            Dictionary with scheduler stats
+        """
+        return {
+            'max_batch': self.max_batch,
+            'max_delay_ms': self.max_delay_ms,
+            'batches': self._batches,
+            'images': self._images,
+            'avg_batch_size': self._images / self._batches if self._batches else 0.0,
+            'closed': self._closed
+        }
@@ -6,11 +6,18 @@ Supports nested configuration access with dot notation.
 """
 
 import os
+import copy
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, IO, Optional, Union
 import yaml
 
+# Use the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:  # pragma: no cover - PyYAML without libyaml bindings
+    from yaml import SafeLoader as _YAMLLoader
+
 from .defaults import DEFAULT_CONFIG, get_default_config_path
 from .validation import validate_config, EdgeDetectionConfig
 from .profile_manager import ProfileManager
@@ -53,20 +60,26 @@ class ConfigManager:
         self._profile = profile
         self._profile_manager = ProfileManager(Path('./config'))
 
-    def load(self, config_path: Optional[str] = None, skip_validation: bool = False) -> None:
+    def load(
+        self,
+        config_path: Optional[Union[str, Path, IO[str]]] = None,
+        skip_validation: bool = False
+    ) -> None:
         """
         Load configuration from file and environment variables.
 
         Args:
-            config_path: Optional path to configuration file.
+            config_path: Optional path to configuration file, or an open
+                        text stream (e.g. io.StringIO) with YAML content.
                         If not specified, searches default locations.
             skip_validation: If True, skip configuration validation.
 
         Raises:
             ConfigurationError: If configuration file cannot be loaded or is invalid.
         """
-        # Start with defaults
-        self._config = DEFAULT_CONFIG.copy()
+        # Start with defaults (deep copy: merges and env overrides modify
+        # nested sections in place)
+        self._config = copy.deepcopy(DEFAULT_CONFIG)
 
         # Load profile if specified
         if self._profile:
@@ -85,7 +98,9 @@ class ConfigManager:
             self._load_yaml_file(project_config)
 
         # Load user config if exists
-        if config_path:
+        if config_path is not None and hasattr(config_path, 'read'):
+            self._load_yaml_file(config_path)
+        elif config_path:
             self._load_yaml_file(Path(config_path))
         else:
             user_config = get_default_config_path() / 'config.yaml'
@@ -103,19 +118,24 @@ class ConfigManager:
 
         logger.info(f"Configuration loaded successfully from {len(self._config_paths)} source(s)")
 
-    def _load_yaml_file(self, config_path: Path) -> None:
+    def _load_yaml_file(self, config_path: Union[Path, IO[str]]) -> None:
         """
         Load configuration from YAML file.
 
         Args:
-            config_path: Path to YAML configuration file.
+            config_path: Path to YAML configuration file, or an open text stream.
 
         Raises:
             ConfigurationError: If YAML file is invalid.
         """
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                user_config = yaml.safe_load(f)
+            if hasattr(config_path, 'read'):
+                stream = config_path
+                config_path = getattr(stream, 'name', '<stream>')
+                user_config = yaml.load(stream, Loader=_YAMLLoader)
+            else:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    user_config = yaml.load(f, Loader=_YAMLLoader)
 
             if user_config:
                 self._merge_config(self._config, user_config)
@@ -9,6 +9,12 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 import yaml
 
+# Use the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:  # pragma: no cover - PyYAML without libyaml bindings
+    from yaml import SafeLoader as _YAMLLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,7 +76,7 @@ class ProfileManager:
 
         try:
             with open(profile_path, 'r', encoding='utf-8') as f:
-                profile_config = yaml.safe_load(f)
+                profile_config = yaml.load(f, Loader=_YAMLLoader)
 
             if not isinstance(profile_config, dict):
                 raise ValueError(
@@ -4,18 +4,64 @@ Supports YAML files, environment variable overrides, and validation
 """
 import os
 import re
+import copy
 import logging
-from typing import Dict, Any, Optional, Union, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Union, List, Tuple
 from pathlib import Path
 
 import yaml
 
+# Use the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:  # pragma: no cover - PyYAML without libyaml bindings
+    from yaml import SafeLoader as _YAMLLoader
+
 from .errors import EdgeDetectionError, ErrorCode
 from .validators import ConfigValidator, ValidationError
 
 
 logger = logging.getLogger(__name__)
 
+# Parsed YAML documents keyed by path, validated against (st_mtime, st_size)
+_YAML_CACHE: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+_YAML_CACHE_MAXSIZE = 100
+
+
+def _load_yaml_cached(path: Union[str, Path]) -> Any:
+    """
+    Parse a YAML file, reusing the previous result if the file is unchanged
+
+    Args:
+        path: Path to YAML file
+
+    Returns:
+        Deep copy of the parsed document (callers may mutate it freely)
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        yaml.YAMLError: If the file is not valid YAML
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+
+    cached = _YAML_CACHE.get(key)
+    if cached is not None and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        _YAML_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+
+    with open(key, 'r') as f:
+        # CRITICAL: Use a safe loader to prevent code injection
+        data = yaml.load(f, Loader=_YAMLLoader)
+
+    _YAML_CACHE[key] = (stat.st_mtime, stat.st_size, data)
+    _YAML_CACHE.move_to_end(key)
+    if len(_YAML_CACHE) > _YAML_CACHE_MAXSIZE:
+        _YAML_CACHE.popitem(last=False)
+
+    return copy.deepcopy(data)
+
 
 class ConfigManager:
     """
@@ -80,9 +126,14 @@ class ConfigManager:
         self.config_path = config_path
         self.profile = profile
         self.default_config_path = default_config
-        self._config: Dict[str, Any] = {}
+        # Built-in defaults are usable before load_config() is called
+        self._config: Dict[str, Any] = self._deep_copy(self.DEFAULT_CONFIG)
+        # Defaults + config files, before profile and env layers
+        self._base_config: Optional[Dict[str, Any]] = None
         self._validation_errors: List[str] = []
         self.validator = ConfigValidator()
+        # (validated values, errors) from the last validator run
+        self._validation_cache: Optional[Tuple[Tuple[Any, ...], List[ValidationError]]] = None
 
         # Determine config directory
         if config_path:
@@ -104,23 +155,63 @@ class ConfigManager:
             EdgeDetectionError: If configuration is invalid or profile not found
         """
         # Start with built-in defaults
-        self._config = self._deep_copy(self.DEFAULT_CONFIG)
+        base = self._deep_copy(self.DEFAULT_CONFIG)
 
         # 1. Load default config file if provided
         if self.default_config_path:
             default_from_file = self._load_yaml_file(self.default_config_path)
             if default_from_file:
-                self._merge_configs(self._config, default_from_file)
+                self._merge_configs(base, default_from_file)
 
         # 2. Load user configuration
         if self.config_path and Path(self.config_path).exists():
             user_config = self._load_yaml_file(self.config_path)
             if user_config:
-                self._merge_configs(self._config, user_config)
+                self._merge_configs(base, user_config)
         elif self.config_path:
             # Config file specified but doesn't exist - use defaults
             logger.warning(f"Config file not found: {self.config_path}, using defaults")
 
+        # Keep the profile-independent layers for switch_profile()
+        self._base_config = base
+
+        return self._apply_profile_and_overrides()
+
+    def switch_profile(self, profile: Optional[str]) -> Dict[str, Any]:
+        """
+        Switch to another profile without reloading the base configuration
+
+        Only the profile layer and environment overrides are re-applied on top
+        of the defaults and files merged by the last load_config() call.
+
+        Args:
+            profile: Profile name (dev/prod/testing), or None for no profile
+
+        Returns:
+            Complete configuration dictionary
+
+        Raises:
+            EdgeDetectionError: If configuration is invalid or profile not found
+        """
+        self.profile = profile
+
+        if self._base_config is None:
+            return self.load_config()
+
+        return self._apply_profile_and_overrides()
+
+    def _apply_profile_and_overrides(self) -> Dict[str, Any]:
+        """
+        Merge profile and environment layers over the base configuration
+
+        Returns:
+            Complete configuration dictionary
+
+        Raises:
+            EdgeDetectionError: If configuration is invalid or profile not found
+        """
+        self._config = self._deep_copy(self._base_config)
+
         # 3. Load profile if specified
         if self.profile:
             profile_config = self._load_profile(self.profile)
@@ -192,8 +283,8 @@ class ConfigManager:
         """
         self._validation_errors = []
 
-        # Use validator framework
-        errors = self.validator.validate(self._config)
+        # Use validator framework (reuses load_config()'s pass if unchanged)
+        errors = self._run_validator()
 
         # Convert ValidationError objects to strings
         for error in errors:
@@ -207,13 +298,41 @@ class ConfigManager:
 
         return len(self._validation_errors) == 0
 
+    def _run_validator(self) -> List[ValidationError]:
+        """
+        Run the validator, reusing the previous result if nothing it checks changed
+
+        The result depends only on the values at the rule paths, so those
+        values (compared by identity) key the cached errors. This catches
+        changes made through set() as well as direct edits of _config. The
+        same lookup pass feeds the rules, so the config is walked once.
+
+        Returns:
+            List of validation errors (empty if valid)
+        """
+        values = self.validator.collect_values(self._config)
+
+        cached = self._validation_cache
+        if cached is not None and len(cached[0]) == len(values) and \
+                all(old is new for old, new in zip(cached[0], values)):
+            return cached[1]
+
+        errors = self.validator.validate_values(values)
+        self._validation_cache = (values, errors)
+        return errors
+
     def get_validation_errors(self) -> list:
         """Get list of validation error messages"""
         return self._validation_errors
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached YAML documents, forcing the next load to re-parse"""
+        _YAML_CACHE.clear()
+
     def _load_yaml_file(self, file_path: str) -> Optional[Dict[str, Any]]:
         """
-        Load YAML file using safe_load
+        Load YAML file using the safe loader (cached by mtime and size)
 
         Args:
             file_path: Path to YAML file
@@ -225,21 +344,19 @@ class ConfigManager:
             EdgeDetectionError: If YAML is invalid
         """
         try:
-            with open(file_path, 'r') as f:
-                # CRITICAL: Use safe_load to prevent code injection
-                config = yaml.safe_load(f)
+            config = _load_yaml_cached(file_path)
 
-                if config is None:
-                    return {}
+            if config is None:
+                return {}
 
-                if not isinstance(config, dict):
-                    raise EdgeDetectionError(
-                        ErrorCode.INVALID_CONFIG,
-                        f"Configuration file must contain a dictionary, got {type(config).__name__}",
-                        hint="Ensure your YAML file contains top-level key-value pairs"
-                    )
+            if not isinstance(config, dict):
+                raise EdgeDetectionError(
+                    ErrorCode.INVALID_CONFIG,
+                    f"Configuration file must contain a dictionary, got {type(config).__name__}",
+                    hint="Ensure your YAML file contains top-level key-value pairs"
+                )
 
-                return config
+            return config
 
         except yaml.YAMLError as e:
             # Extract line number from error if available
@@ -366,7 +483,7 @@ class ConfigManager:
         Raises:
             EdgeDetectionError: If configuration is invalid
         """
-        errors = self.validator.validate(self._config)
+        errors = self._run_validator()
 
         if errors:
             # Raise first error with full details
@@ -452,5 +569,4 @@ class ConfigManager:
     @staticmethod
     def _deep_copy(obj: Any) -> Any:
         """Create a deep copy of an object"""
-        import copy
         return copy.deepcopy(obj)
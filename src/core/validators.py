@@ -2,8 +2,8 @@
 Configuration validation framework for edge detection toolkit
 Provides structured validation with clear error messages and hints
 """
-from typing import Any, Callable, Dict, List, Optional
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from .errors import EdgeDetectionError, ErrorCode
@@ -19,11 +19,16 @@ class ValidationRule:
         validator: Callable that returns True if value is valid
         error_message: Error message describing what's wrong
         hint: Resolution hint for the user
+        keys: parameter_path split into keys (derived, used for lookups)
     """
     parameter_path: str
     validator: Callable[[Any], bool]
     error_message: str
     hint: str
+    keys: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.keys = tuple(self.parameter_path.split('.'))
 
 
 @dataclass
@@ -65,11 +70,33 @@ class ConfigValidator:
         Returns:
             List of validation errors (empty if valid)
         """
-        errors = []
+        return self.validate_values(self.collect_values(config))
+
+    def collect_values(self, config: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        Look up the value checked by each rule
+
+        Args:
+            config: Configuration dictionary
 
-        for rule in self.rules:
-            value = self._get_value(config, rule.parameter_path)
+        Returns:
+            Values in rule order (None where the parameter is not set)
+        """
+        return tuple(self._lookup(config, rule.keys) for rule in self.rules)
 
+    def validate_values(self, values: Sequence[Any]) -> List[ValidationError]:
+        """
+        Validate values previously gathered with collect_values()
+
+        Args:
+            values: Values in rule order
+
+        Returns:
+            List of validation errors (empty if valid)
+        """
+        errors = []
+
+        for rule, value in zip(self.rules, values):
             # Skip validation if value is None (not set)
             # ConfigManager will handle required parameters
             if value is None:
@@ -105,7 +132,11 @@ class ConfigValidator:
         Returns:
             Value at path or None if not found
         """
-        keys = path.split('.')
+        return self._lookup(config, path.split('.'))
+
+    @staticmethod
+    def _lookup(config: Dict[str, Any], keys: Sequence[str]) -> Any:
+        """Get nested value for pre-split keys, or None if not found"""
         value = config
 
         for key in keys:
@@ -2,8 +2,11 @@
 YOLOv8 detector implementation.
 """
 
+import contextlib
+import threading
 import numpy as np
-from typing import List
+from pathlib import Path
+from typing import List, Optional
 from src.detection.base import AbstractDetector, DetectionResult, ModelInfo
 
 
@@ -12,25 +15,134 @@ class YOLOv8Detector(AbstractDetector):
     YOLOv8 detector implementation using ultralytics package.
 
     Supports all YOLOv8 variants: yolov8n, yolov8s, yolov8m, yolov8l, yolov8x
+
+    Besides PyTorch weights, load_model accepts an OpenVINO IR directory
+    produced by export_openvino(), which runs on CPU through OpenVINO
+    instead of the PyTorch backbone.
     """
 
+    # Suffix ultralytics gives exported OpenVINO model directories
+    OPENVINO_SUFFIX = "_openvino_model"
+
+    PRECISIONS = ("fp32", "fp16", "int8")
+
     def __init__(self):
         """Initialize YOLOv8 detector."""
         super().__init__()
         self._class_names: List[str] = []
+        self._backend = "pytorch"
+        self._amp = False
+        self._precision = "fp32"
+        self._compiled = False
+        # Extra ultralytics predict() arguments, e.g. half=True
+        self._predict_kwargs = {}
+        # Per-thread {shape: tensor} input buffers for detect_preprocessed
+        self._input_pool = threading.local()
+        # Side CUDA stream for host-to-device input copies (created lazily)
+        self._copy_stream = None
+
+    @staticmethod
+    def export_openvino(
+        model_path: str,
+        half: bool = True,
+        batch: int = 1,
+        int8: bool = False,
+        data: Optional[str] = None,
+        dynamic: bool = False
+    ) -> str:
+        """
+        Export YOLOv8 weights to an OpenVINO IR directory.
 
-    def load_model(self, model_path: str, device: str = "cpu") -> None:
+        The export is done once; pass the returned directory to load_model,
+        with the same batch to run it in OpenVINO's throughput mode.
+
+        Args:
+            model_path: Path to YOLOv8 weights (e.g., "yolov8n.pt")
+            half: Export FP16 weights
+            batch: Static batch size of the exported model
+            int8: Quantize to INT8 with NNCF post-training quantization
+            data: Dataset YAML with calibration images for int8 (default:
+                ultralytics' coco8 sample)
+            dynamic: Export a dynamic batch axis, so one IR serves every
+                batch size (batch is then only the calibration batch)
+
+        Returns:
+            Path to the exported "<name>[_int8]_openvino_model" directory
+
+        Raises:
+            ImportError: If ultralytics or openvino (and nncf, for int8)
+                is not installed
+        """
+        try:
+            from ultralytics import YOLO
+        except ImportError:
+            raise ImportError(
+                "ultralytics package is required for YOLOv8Detector. "
+                "Install it with: pip install ultralytics"
+            )
+
+        export_args = {"format": "openvino", "half": half, "batch": batch}
+        if dynamic:
+            export_args["dynamic"] = True
+        if int8:
+            export_args["int8"] = True
+            if data is not None:
+                export_args["data"] = data
+
+        return str(YOLO(model_path).export(**export_args))
+
+    def load_model(
+        self,
+        model_path: str,
+        device: str = "cpu",
+        amp: bool = False,
+        precision: str = "fp32",
+        compile_model: bool = False,
+        batch: int = 1
+    ) -> None:
         """
         Load YOLOv8 model.
 
+        precision selects the inference engine for PyTorch weights:
+        "fp32" runs them as is; "fp16" uses half precision on CUDA and an
+        FP16 OpenVINO IR on CPU; "int8" uses an INT8-quantized OpenVINO IR
+        (CPU only). The OpenVINO variants are exported on every call (with a
+        dynamic batch axis, so detect_batch and detect_preprocessed accept
+        any batch size), so to load one repeatedly, export it once with
+        export_openvino() and pass its directory instead.
+
+        OpenVINO fixes its performance mode when the first prediction sets
+        up the model: batch > 1 selects the throughput mode, which spreads
+        each batch over an async infer queue, and 1 selects latency mode.
+        Later calls cannot change it, so pass the batch size detect_batch()
+        will be called with.
+
         Args:
-            model_path: Path to YOLOv8 model file (e.g., "yolov8n.pt")
+            model_path: Path to YOLOv8 model file (e.g., "yolov8n.pt") or
+                OpenVINO IR directory from export_openvino()
             device: Device to load model on ("cpu", "cuda", "mps", etc.)
+            amp: Run the forward under autocast (bfloat16 on CPU, float16
+                on CUDA); trades a little accuracy for speed
+            precision: "fp32", "fp16" or "int8"
+            compile_model: Compile the PyTorch forward with torch.compile
+                (see _compile); ignored for OpenVINO models
+            batch: Batch size that selects the OpenVINO performance mode;
+                ignored for PyTorch models
 
         Raises:
             FileNotFoundError: If model file doesn't exist
-            ValueError: If model format is invalid
+            ValueError: If model format is invalid, or precision is unknown
+                or unsupported on device
         """
+        if precision not in self.PRECISIONS:
+            raise ValueError(
+                f"Unknown precision: {precision}. Available: {list(self.PRECISIONS)}"
+            )
+
+        on_cuda = str(device).startswith("cuda")
+        if precision == "int8" and on_cuda:
+            raise ValueError("int8 precision is only supported on CPU (OpenVINO)")
+
         try:
             from ultralytics import YOLO
         except ImportError:
@@ -40,9 +152,34 @@ class YOLOv8Detector(AbstractDetector):
             )
 
         try:
+            is_openvino = Path(model_path).name.endswith(self.OPENVINO_SUFFIX)
+            predict_kwargs = {}
+
+            if not is_openvino and precision == "fp16" and on_cuda:
+                predict_kwargs["half"] = True
+            elif not is_openvino and precision != "fp32":
+                model_path = self.export_openvino(
+                    model_path, half=True, int8=precision == "int8", dynamic=True
+                )
+                is_openvino = True
+
+            if is_openvino:
+                # Read once, by the predictor setup on the first call
+                predict_kwargs["batch"] = batch
+
             self._model = YOLO(model_path)
             self._model_path = model_path
             self._device = device
+            self._amp = amp
+            self._precision = precision
+            self._predict_kwargs = predict_kwargs
+            self._backend = "openvino" if is_openvino else "pytorch"
+
+            self._compiled = False
+            if not is_openvino:
+                self._use_channels_last()
+                if compile_model:
+                    self._compile()
 
             # Extract class names from model
             if hasattr(self._model, 'names') and self._model.names:
@@ -53,6 +190,107 @@ class YOLOv8Detector(AbstractDetector):
                 f"Failed to load YOLOv8 model from {model_path}: {e}"
             )
 
+    def _use_channels_last(self) -> None:
+        """
+        Switch the PyTorch model's weights to channels_last (NHWC) layout.
+
+        oneDNN (CPU) and cuDNN run convolutions natively in NHWC; with NCHW
+        weights every conv reorders its input first. The model is fused
+        (Conv+BN) first, because ultralytics fuses it on the first predict
+        and the fused convs would otherwise be rebuilt in NCHW.
+        """
+        import torch
+
+        module = getattr(self._model, "model", None)
+        if not isinstance(module, torch.nn.Module):
+            return
+
+        if hasattr(module, "fuse"):
+            module.fuse(verbose=False)
+        module.to(memory_format=torch.channels_last)
+
+    def _compile(self) -> None:
+        """
+        Compile the PyTorch model's forward with torch.compile.
+
+        Shapes are specialized (dynamic=False): each new input shape, e.g.
+        each batch size, compiles its own graph on first use and reuses it
+        afterwards, so call warmup() for every shape that will be timed.
+        On CUDA, "reduce-overhead" mode replays the graph as a CUDA Graph,
+        which removes the per-kernel launch cost that dominates small
+        batches. Dynamo keeps a bounded number of graphs per function
+        (torch._dynamo.config.cache_size_limit, 8 by default).
+        """
+        import torch
+
+        module = getattr(self._model, "model", None)
+        if not isinstance(module, torch.nn.Module) or not hasattr(torch, "compile"):
+            return
+
+        on_cuda = str(self._device).startswith("cuda")
+        module.forward = torch.compile(
+            module.forward,
+            dynamic=False,
+            mode="reduce-overhead" if on_cuda else "default"
+        )
+        self._compiled = True
+
+    def warmup(self, shape: tuple = (1, 3, 640, 640), iters: int = 3) -> None:
+        """
+        Run dummy inferences so later calls measure steady-state latency.
+
+        The first calls at a given input shape pay for predictor setup,
+        weight page-in and (on CUDA) cuDNN algorithm selection. Warm up
+        once per batch size / resolution that will be timed.
+
+        Args:
+            shape: Input shape as (batch, channels, height, width)
+            iters: Number of dummy inferences
+        """
+        self._ensure_loaded()
+
+        batch, _, height, width = shape
+        images = [np.zeros((height, width, 3), dtype=np.uint8)] * batch
+        for _ in range(iters):
+            if batch == 1:
+                self.detect(images[0])
+            else:
+                self.detect_batch(images)
+
+    def _predict(self, source, **kwargs) -> list:
+        """
+        Call the ultralytics model under _inference_context.
+
+        Args:
+            source: Image, list of images, or preprocessed tensor
+            **kwargs: Extra predict() arguments for this call
+
+        Returns:
+            List of ultralytics result objects
+        """
+        with self._inference_context():
+            return self._model(
+                source, device=self._device, verbose=False,
+                **self._predict_kwargs, **kwargs
+            )
+
+    def _inference_context(self) -> contextlib.ExitStack:
+        """
+        Context for model calls: inference_mode, plus autocast if amp is on.
+
+        inference_mode skips the autograd version-counter bookkeeping that
+        no_grad still does.
+        """
+        import torch
+
+        stack = contextlib.ExitStack()
+        stack.enter_context(torch.inference_mode())
+        if self._amp and self._backend == "pytorch":
+            device_type = "cuda" if str(self._device).startswith("cuda") else "cpu"
+            dtype = torch.float16 if device_type == "cuda" else torch.bfloat16
+            stack.enter_context(torch.autocast(device_type=device_type, dtype=dtype))
+        return stack
+
     def detect(self, image: np.ndarray) -> DetectionResult:
         """
         Run object detection on a single image.
@@ -75,11 +313,144 @@ class YOLOv8Detector(AbstractDetector):
             )
 
         # Run inference
-        results = self._model(image, device=self._device, verbose=False)
+        results = self._predict(image)
 
         # Extract detection data
         return self._extract_results(results[0], image.shape)
 
+    def detect_tensor(self, tensor) -> DetectionResult:
+        """
+        Run object detection on an already preprocessed image tensor.
+
+        Skips the HWC uint8 -> CHW float conversion that detect() does on
+        every call, so a caller that reuses one image (e.g. benchmarks) can
+        convert it once.
+
+        Channels must be in RGB order. ultralytics reads numpy images
+        (the detect() path) as BGR and reverses the channels itself, so a
+        tensor built from an array that is also passed to detect() needs
+        image[..., ::-1] first to get the same result.
+
+        Args:
+            tensor: torch.Tensor of shape (1, 3, H, W) or (3, H, W), float32
+                RGB scaled to [0, 1], with H and W multiples of 32
+
+        Returns:
+            DetectionResult with boxes, scores, classes, and metadata
+        """
+        self._ensure_loaded()
+
+        if tensor.ndim == 3:
+            tensor = tensor.unsqueeze(0)
+
+        if tensor.ndim != 4 or tensor.shape[0] != 1:
+            raise ValueError(
+                f"Tensor must have shape (1, 3, H, W) or (3, H, W), got {tuple(tensor.shape)}"
+            )
+
+        return self.detect_preprocessed(tensor)[0]
+
+    def detect_preprocessed(self, batch) -> List[DetectionResult]:
+        """
+        Run object detection on a batch of already preprocessed tensors.
+
+        A list of per-image tensors is stacked with a single copy into an
+        input buffer that is reused for every later batch of the same
+        shape (see _input_buffer). On CUDA the batch is then copied to the
+        GPU asynchronously (see _to_device).
+
+        Args:
+            batch: torch.Tensor of shape (B, 3, H, W), or a list of (3, H, W)
+                tensors; float32 RGB scaled to [0, 1], H and W multiples of 32
+
+        Returns:
+            List of DetectionResult objects, one per batch entry
+        """
+        self._ensure_loaded()
+
+        if isinstance(batch, (list, tuple)):
+            if not batch:
+                raise ValueError("Batch cannot be empty")
+
+            import torch
+            shape = (len(batch), *batch[0].shape)
+            batch = torch.stack(batch, dim=0, out=self._input_buffer(shape, batch[0].dtype))
+
+        if batch.ndim != 4 or batch.shape[1] != 3:
+            raise ValueError(
+                f"Batch must have shape (B, 3, H, W), got {tuple(batch.shape)}"
+            )
+
+        results = self._predict(self._to_device(batch))
+
+        height, width = batch.shape[2:]
+        return [self._extract_results(result, (height, width, 3)) for result in results]
+
+    def _input_buffer(self, shape: tuple, dtype):
+        """
+        Get this thread's reusable input tensor for shape and dtype.
+
+        Buffers are allocated once per shape (pinned when running on CUDA,
+        channels_last for 4-D batches), so steady-state batches don't go
+        through the allocator. They are
+        per thread because a buffer is only safe to refill once the model
+        call that read it has returned.
+        """
+        import torch
+
+        buffers = getattr(self._input_pool, "buffers", None)
+        if buffers is None:
+            buffers = self._input_pool.buffers = {}
+
+        key = (shape, dtype)
+        buffer = buffers.get(key)
+        if buffer is None:
+            pin = str(self._device).startswith("cuda") and torch.cuda.is_available()
+            # channels_last matches the model weights (see _use_channels_last)
+            memory_format = torch.channels_last if len(shape) == 4 else torch.contiguous_format
+            buffer = buffers[key] = torch.empty(
+                shape, dtype=dtype, pin_memory=pin, memory_format=memory_format
+            )
+        return buffer
+
+    def _to_device(self, batch):
+        """
+        Copy a CPU batch to the CUDA device on a side stream.
+
+        The copy is issued with non_blocking=True on _copy_stream, so from
+        a pinned buffer it runs as a DMA transfer instead of stalling the
+        host; the current stream waits for it before the forward pass.
+        Batches that are already on the device, or a non-CUDA model, are
+        returned unchanged.
+
+        Args:
+            batch: torch.Tensor of shape (B, 3, H, W)
+
+        Returns:
+            The batch on the model's device
+        """
+        import torch
+
+        if (
+            self._backend != "pytorch"
+            or batch.is_cuda
+            or not str(self._device).startswith("cuda")
+            or not torch.cuda.is_available()
+        ):
+            return batch
+
+        if self._copy_stream is None:
+            self._copy_stream = torch.cuda.Stream(device=self._device)
+
+        with torch.cuda.stream(self._copy_stream):
+            gpu_batch = batch.to(self._device, non_blocking=True)
+
+        current = torch.cuda.current_stream(self._device)
+        current.wait_stream(self._copy_stream)
+        # gpu_batch was allocated on the copy stream but is read on current
+        gpu_batch.record_stream(current)
+        return gpu_batch
+
     def detect_batch(self, images: List[np.ndarray]) -> List[DetectionResult]:
         """
         Run object detection on a batch of images.
@@ -96,7 +467,7 @@ class YOLOv8Detector(AbstractDetector):
             raise ValueError("Images list cannot be empty")
 
         # Run batch inference
-        results = self._model(images, device=self._device, verbose=False)
+        results = self._predict(images)
 
         # Extract results for each image
         detection_results = []
@@ -117,7 +488,7 @@ class YOLOv8Detector(AbstractDetector):
         self._ensure_loaded()
 
         # Extract model name from path
-        model_name = self._model_path.split('/')[-1].replace('.pt', '')
+        model_name = Path(self._model_path).name.replace('.pt', '').replace(self.OPENVINO_SUFFIX, '')
 
         # Get input size from model
         input_size = None
@@ -137,6 +508,10 @@ class YOLOv8Detector(AbstractDetector):
             class_names=self._class_names if self._class_names else None,
             metadata={
                 "framework": "ultralytics",
+                "backend": self._backend,
+                "amp": self._amp,
+                "precision": self._precision,
+                "compiled": self._compiled,
                 "device": self._device,
                 "model_type": "YOLOv8",
             }
@@ -161,14 +536,15 @@ class YOLOv8Detector(AbstractDetector):
 
         # Extract boxes
         if result.boxes is not None and len(result.boxes) > 0:
-            # Boxes are in xyxy format
-            boxes = result.boxes.xyxy.cpu().numpy()
+            # Boxes are in xyxy format; float() undoes autocast's reduced
+            # precision, which numpy can't represent (bfloat16)
+            boxes = result.boxes.xyxy.float().cpu().numpy()
 
             # Scores
-            scores = result.boxes.conf.cpu().numpy()
+            scores = result.boxes.conf.float().cpu().numpy()
 
             # Classes
-            classes = result.boxes.cls.cpu().numpy().astype(int)
+            classes = result.boxes.cls.float().cpu().numpy().astype(int)
         else:
             # No detections
             boxes = np.empty((0, 4), dtype=np.float32)
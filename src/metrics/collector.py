@@ -7,9 +7,17 @@ FPS, memory usage, GPU utilization, and error counts for detection operations.
 
 import time
 import psutil
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Optional, Dict, Any, Sequence
 from contextlib import contextmanager
 
+# Number of recent latency/FPS samples kept for inspection; aggregates
+# cover every recorded detection
+_SAMPLE_WINDOW = 1024
+
+# Seconds a memory reading is reused before the process RSS is read again
+_MEMORY_CACHE_TTL_S = 1.0
+
 
 class MetricsCollector:
     """
@@ -22,10 +30,31 @@ class MetricsCollector:
         enabled: Whether metrics collection is enabled
         total_detections: Total number of detections performed
         total_errors: Total number of errors encountered
-        inference_times: List of recent inference times (ms)
-        fps_samples: List of recent FPS measurements
+        inference_times: Most recent inference times (ms), bounded deque
+        fps_samples: Most recent FPS measurements, bounded deque
     """
 
+    __slots__ = (
+        'enabled',
+        '_total_detections',
+        '_total_errors',
+        '_inference_start_time',
+        '_inference_times',
+        '_latency_sum_ms',
+        '_latency_min_ms',
+        '_latency_max_ms',
+        '_frame_count',
+        '_fps_start_time',
+        '_fps_start_frames',
+        '_fps_samples',
+        '_memory_samples',
+        '_process',
+        '_memory_cache_time',
+        '_memory_cache_mb',
+        '_gpu_available',
+        '_gpu_utilization_samples',
+    )
+
     def __init__(self, enabled: bool = True):
         """
         Initialize the MetricsCollector.
@@ -41,15 +70,22 @@ class MetricsCollector:
 
         # Timing
         self._inference_start_time: Optional[float] = None
-        self._inference_times = []
+        self._inference_times = deque(maxlen=_SAMPLE_WINDOW)
+        self._latency_sum_ms = 0.0
+        self._latency_min_ms = float('inf')
+        self._latency_max_ms = float('-inf')
 
         # FPS tracking
         self._frame_count = 0
         self._fps_start_time: Optional[float] = None
-        self._fps_samples = []
+        self._fps_start_frames = 0
+        self._fps_samples = deque(maxlen=_SAMPLE_WINDOW)
 
         # Memory tracking (MB)
         self._memory_samples = []
+        self._process = psutil.Process()
+        self._memory_cache_time = float('-inf')
+        self._memory_cache_mb = 0.0
 
         # GPU tracking (if available)
         self._gpu_available = self._check_gpu_available()
@@ -79,36 +115,82 @@ class MetricsCollector:
         return self._total_errors
 
     @property
-    def inference_times(self) -> list:
-        """Get list of inference times in milliseconds."""
+    def inference_times(self) -> deque:
+        """Get the most recent inference times in milliseconds."""
         return self._inference_times
 
     @property
-    def fps_samples(self) -> list:
-        """Get list of FPS samples."""
+    def fps_samples(self) -> deque:
+        """Get the most recent FPS samples."""
         return self._fps_samples
 
-    def record_detection(self, inference_time_ms: float) -> None:
+    def record_detection(self, inference_time_ms: float, timestamp: Optional[float] = None) -> None:
         """
         Record a detection with its inference time.
 
         Args:
             inference_time_ms: Inference time in milliseconds
+            timestamp: time.perf_counter() value at which the detection
+                finished (default: now)
         """
         if not self.enabled:
             return
 
         self._total_detections += 1
         self._inference_times.append(inference_time_ms)
+        self._latency_sum_ms += inference_time_ms
+        if inference_time_ms < self._latency_min_ms:
+            self._latency_min_ms = inference_time_ms
+        if inference_time_ms > self._latency_max_ms:
+            self._latency_max_ms = inference_time_ms
+        self._track_fps(1, timestamp)
+
+    def record_detection_batch(
+        self,
+        inference_times_ms: Sequence[float],
+        timestamp: Optional[float] = None
+    ) -> None:
+        """
+        Record several detections that finished together.
 
-        # Track FPS
-        self._frame_count += 1
+        Equivalent to calling record_detection() for each time, but
+        updates the counters and the FPS sample once for the whole batch.
+
+        Args:
+            inference_times_ms: Inference time of each detection in milliseconds
+            timestamp: time.perf_counter() value at which the batch
+                finished (default: now)
+        """
+        if not self.enabled or not inference_times_ms:
+            return
+
+        self._total_detections += len(inference_times_ms)
+        self._inference_times.extend(inference_times_ms)
+        self._latency_sum_ms += sum(inference_times_ms)
+        self._latency_min_ms = min(self._latency_min_ms, min(inference_times_ms))
+        self._latency_max_ms = max(self._latency_max_ms, max(inference_times_ms))
+        self._track_fps(len(inference_times_ms), timestamp)
+
+    def _track_fps(self, frames: int, timestamp: Optional[float]) -> None:
+        """
+        Count finished frames and record an FPS sample.
+
+        Args:
+            frames: Number of frames that just finished
+            timestamp: time.perf_counter() value at which they finished
+                (default: now)
+        """
+        self._frame_count += frames
+        now = time.perf_counter() if timestamp is None else timestamp
         if self._fps_start_time is None:
-            self._fps_start_time = time.time()
+            # Frames of the call that starts the clock finished at time 0,
+            # so only later frames count towards the rate
+            self._fps_start_time = now
+            self._fps_start_frames = self._frame_count
         else:
-            elapsed = time.time() - self._fps_start_time
+            elapsed = now - self._fps_start_time
             if elapsed > 0:
-                fps = self._frame_count / elapsed
+                fps = (self._frame_count - self._fps_start_frames) / elapsed
                 self._fps_samples.append(fps)
 
     def record_error(self) -> None:
@@ -134,24 +216,30 @@ class MetricsCollector:
             yield
             return
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             yield
         finally:
-            end_time = time.time()
+            end_time = time.perf_counter()
             inference_time_ms = (end_time - start_time) * 1000.0
-            self.record_detection(inference_time_ms)
+            self.record_detection(inference_time_ms, end_time)
 
     def get_memory_usage_mb(self) -> float:
         """
         Get current memory usage in MB.
 
+        The reading is reused for up to one second, since collect_metrics()
+        may be called for every frame.
+
         Returns:
             Memory usage in megabytes
         """
-        process = psutil.Process()
-        memory_info = process.memory_info()
-        return memory_info.rss / (1024 * 1024)  # Convert bytes to MB
+        now = time.monotonic()
+        if now - self._memory_cache_time >= _MEMORY_CACHE_TTL_S:
+            memory_info = self._process.memory_info()
+            self._memory_cache_mb = memory_info.rss / (1024 * 1024)  # Convert bytes to MB
+            self._memory_cache_time = now
+        return self._memory_cache_mb
 
     def get_gpu_utilization(self) -> Optional[Dict[str, float]]:
         """
@@ -203,10 +291,10 @@ class MetricsCollector:
         metrics['errors_total'] = self._total_errors
 
         # Latency metrics
-        if self._inference_times:
-            metrics['latency_ms_count'] = len(self._inference_times)
-            metrics['latency_ms_sum'] = sum(self._inference_times)
-            metrics['latency_ms_avg'] = sum(self._inference_times) / len(self._inference_times)
+        if self._total_detections:
+            metrics['latency_ms_count'] = self._total_detections
+            metrics['latency_ms_sum'] = self._latency_sum_ms
+            metrics['latency_ms_avg'] = self._latency_sum_ms / self._total_detections
 
         # FPS metrics
         if self._fps_samples:
@@ -229,10 +317,14 @@ class MetricsCollector:
         """Reset all metrics."""
         self._total_detections = 0
         self._total_errors = 0
-        self._inference_times = []
+        self._inference_times.clear()
+        self._latency_sum_ms = 0.0
+        self._latency_min_ms = float('inf')
+        self._latency_max_ms = float('-inf')
         self._frame_count = 0
         self._fps_start_time = None
-        self._fps_samples = []
+        self._fps_start_frames = 0
+        self._fps_samples.clear()
         self._memory_samples = []
         self._gpu_utilization_samples = []
 
@@ -243,7 +335,7 @@ class MetricsCollector:
         Returns:
             Dictionary with metrics statistics
         """
-        if not self.enabled or not self._inference_times:
+        if not self.enabled or not self._total_detections:
             return {
                 'total_detections': 0,
                 'total_errors': 0,
@@ -257,9 +349,9 @@ class MetricsCollector:
         return {
             'total_detections': self._total_detections,
             'total_errors': self._total_errors,
-            'avg_inference_time_ms': sum(self._inference_times) / len(self._inference_times),
-            'min_inference_time_ms': min(self._inference_times),
-            'max_inference_time_ms': max(self._inference_times),
+            'avg_inference_time_ms': self._latency_sum_ms / self._total_detections,
+            'min_inference_time_ms': self._latency_min_ms,
+            'max_inference_time_ms': self._latency_max_ms,
             'fps': self._fps_samples[-1] if self._fps_samples else 0,
             'memory_mb': self.get_memory_usage_mb()
         }
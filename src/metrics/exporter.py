@@ -202,16 +202,21 @@ class PrometheusExporter:
         from prometheus_client.exposition import start_http_server
 
         try:
-            # Start the HTTP server
-            self._server = start_http_server(self.port, addr=self.host, registry=self.registry)
+            # Start the HTTP server (returns (server, thread) since
+            # prometheus-client 0.20); with port=0 the OS picks a free port,
+            # readable from self._server.server_address[1]
+            self._server, self._server_thread = start_http_server(
+                self.port, addr=self.host, registry=self.registry
+            )
         except Exception as e:
             raise RuntimeError(f"Failed to start Prometheus server: {e}")
 
     def stop_server(self) -> None:
         """Stop the Prometheus metrics HTTP server."""
         if self._server is not None:
-            # prometheus_client's start_http_server doesn't provide a clean way to stop
-            # The server runs in a daemon thread and will stop when the process exits
+            # Stop serve_forever() in the daemon thread and release the socket
+            self._server.shutdown()
+            self._server.server_close()
             self._server = None
             self._server_thread = None
 
@@ -6,6 +6,7 @@ both the existing CLI MetricsTracker and the new Prometheus exporter.
 """
 
 from typing import Optional, Dict, Any
+from prometheus_client import CollectorRegistry
 from src.metrics.collector import MetricsCollector
 from src.metrics.exporter import PrometheusExporter
 from src.cli.metrics import MetricsTracker as CLIMetricsTracker
@@ -25,13 +26,19 @@ class MetricsManager:
         cli_tracker: Legacy CLI metrics tracker
     """
 
-    def __init__(self, mode: str = 'none', prometheus_port: int = 9090):
+    def __init__(
+        self,
+        mode: str = 'none',
+        prometheus_port: int = 9090,
+        registry: Optional[CollectorRegistry] = None
+    ):
         """
         Initialize the MetricsManager.
 
         Args:
             mode: Metrics collection mode ('none', 'prometheus', 'both')
             prometheus_port: Port for Prometheus metrics server (default: 9090)
+            registry: Collector registry for the exporter (default: None creates new)
         """
         self.mode = mode
         self.prometheus_port = prometheus_port
@@ -43,7 +50,7 @@ class MetricsManager:
         # Initialize Prometheus exporter if needed
         self.exporter: Optional[PrometheusExporter] = None
         if mode == 'prometheus' or mode == 'both':
-            self.exporter = PrometheusExporter(port=prometheus_port)
+            self.exporter = PrometheusExporter(port=prometheus_port, registry=registry)
 
         # Initialize CLI tracker for backward compatibility
         self.cli_tracker = CLIMetricsTracker()
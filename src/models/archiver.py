@@ -34,6 +34,9 @@ class ModelArchiver:
     Manage model version archiving and restoration.
 
     Archives old model versions when new ones are downloaded.
+
+    The manifest is kept in memory and written to disk by flush(); use the
+    archiver as a context manager (or call close()) to persist changes.
     """
 
     def __init__(self, cache_dir: Optional[str] = None):
@@ -55,6 +58,7 @@ class ModelArchiver:
 
         # Load or create manifest
         self.manifest = self._load_manifest()
+        self._dirty = False
 
     def _load_manifest(self) -> Dict:
         """Load archive manifest."""
@@ -98,7 +102,8 @@ class ModelArchiver:
         # Archive path
         archive_path = model_archive_dir / model_path.name
 
-        # Copy model to archive
+        # Copy model to archive (a real copy, so writes to the live model
+        # file can never change an archived version)
         shutil.copy2(model_path, archive_path)
 
         # Create archive entry
@@ -111,9 +116,9 @@ class ModelArchiver:
             metadata=metadata or {}
         )
 
-        # Update manifest
+        # Update manifest (persisted by flush())
         self.manifest['archives'].append(asdict(entry))
-        self._save_manifest()
+        self._dirty = True
 
         logger.info(f"Archived {model_name} v{version} to {archive_path}")
         return str(archive_path)
@@ -189,3 +194,21 @@ class ModelArchiver:
                 entry_dict.get('version') == version_str):
                 return entry_dict.get('archive_path')
         return None
+
+    def flush(self):
+        """Write the manifest to disk if it changed since the last flush."""
+        if self._dirty:
+            self._save_manifest()
+            self._dirty = False
+
+    def close(self):
+        """Flush pending manifest changes."""
+        self.flush()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
@@ -3,14 +3,63 @@ Model Manager for automatic download and caching of detection models.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
+import functools
 import hashlib
 import logging
+import os
+import random
 import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    blake3 = None
+    BLAKE3_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Read size for hashing files from disk
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def _new_hasher(algorithm: str):
+    """
+    Create a hash object for checksum verification.
+
+    Args:
+        algorithm: "sha256" or "blake3"
+
+    Returns:
+        Object with update() and hexdigest()
+
+    Raises:
+        ImportError: If algorithm is "blake3" and blake3 isn't installed
+        ValueError: If algorithm is unknown
+    """
+    if algorithm == "sha256":
+        # Integrity check only, not a security boundary
+        return hashlib.new("sha256", usedforsecurity=False)
+    if algorithm == "blake3":
+        if not BLAKE3_AVAILABLE:
+            raise ImportError(
+                "blake3 package is required for blake3 checksums. "
+                "Install it with: pip install blake3"
+            )
+        return blake3.blake3()
+    raise ValueError(f"Unknown checksum algorithm: {algorithm}")
+
+
+def _split_checksum(checksum: str) -> Tuple[str, str]:
+    """Split "algorithm:hexdigest" into its parts; bare digests are SHA256."""
+    algorithm, sep, digest = checksum.strip().partition(":")
+    if not sep:
+        algorithm, digest = "sha256", algorithm
+    return algorithm.lower(), digest.lower()
+
 
 class ModelDownloadError(Exception):
     """Raised when model download fails."""
@@ -29,11 +78,10 @@ class ModelManager:
     """
     Manages model download, caching, and validation.
 
-    Implements singleton pattern for consistent model management.
+    Implements singleton pattern for consistent model management: one shared
+    instance per cache directory.
     """
 
-    _instance = None
-
     # Model download URLs
     BASE_URL = "https://github.com/ultralytics/assets/releases/download/v0.0.0/"
     MODELS = {
@@ -44,10 +92,22 @@ class ModelManager:
         "yolov8x": "yolov8x.pt",
     }
 
+    # Retry backoff: base * 2**attempt, plus up to 50% jitter, capped
+    RETRY_BACKOFF_BASE = 1.0
+    RETRY_BACKOFF_MAX = 30.0
+
     def __new__(cls, cache_dir: Optional[Path] = None):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        return cls._get(cache_dir)
+
+    @classmethod
+    @functools.cache
+    def _get(cls, cache_dir: Optional[Path]) -> 'ModelManager':
+        """
+        Return the shared instance for cache_dir, creating it on first use.
+
+        Use ModelManager._get.cache_clear() to drop all shared instances.
+        """
+        return super().__new__(cls)
 
     def __init__(self, cache_dir: Optional[Path] = None):
         if hasattr(self, '_initialized'):
@@ -55,6 +115,9 @@ class ModelManager:
 
         self.cache_dir = cache_dir or self._default_cache_dir()
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._session = self._create_session()
+        # path -> (size, mtime_ns, sha256) of files hashed while downloading
+        self._digests: Dict[Path, Tuple[int, int, str]] = {}
         self._initialized = True
         logger.info(f"ModelManager initialized with cache dir: {self.cache_dir}")
 
@@ -63,6 +126,21 @@ class ModelManager:
         """Get default cache directory."""
         return Path.home() / ".cache" / "edge-detection" / "models"
 
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """
+        Create the HTTP session used for downloads.
+
+        Reusing one session keeps TCP/TLS connections to the release host
+        alive across files. Retries are handled by _download_with_retry,
+        so the adapter itself never retries.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def get_model(self, model_name: str, version: str = "latest", force_download: bool = False) -> Path:
         """
         Get model path, downloading if necessary.
@@ -126,7 +204,10 @@ class ModelManager:
 
     def _download_with_retry(self, url: str, dest_path: Path, max_retries: int = 3) -> bool:
         """
-        Download with exponential backoff retry.
+        Download with jittered exponential backoff retry.
+
+        Jitter keeps parallel workers retrying against the same host from
+        doing so in lockstep.
 
         Args:
             url: URL to download from
@@ -138,25 +219,39 @@ class ModelManager:
         """
         for attempt in range(max_retries):
             try:
-                response = requests.get(url, stream=True, timeout=30)
+                response = self._session.get(url, stream=True, timeout=30)
                 response.raise_for_status()
 
                 total_size = int(response.headers.get('content-length', 0))
 
+                # Write to a side file and swap it in, so a failed download
+                # never leaves a truncated model behind
+                part_path = dest_path.with_name(dest_path.name + '.part')
+                sha256_hash = _new_hasher("sha256")
                 with tqdm(total=total_size, unit='B', unit_scale=True, desc="Downloading model") as progress_bar:
-                    with open(dest_path, 'wb') as f:
+                    with open(part_path, 'wb') as f:
                         for chunk in response.iter_content(chunk_size=8192):
                             if chunk:
                                 f.write(chunk)
+                                sha256_hash.update(chunk)
                                 progress_bar.update(len(chunk))
+                os.replace(part_path, dest_path)
+
+                # Remember the digest so validation needn't re-read the file
+                stat = dest_path.stat()
+                self._digests[dest_path] = (stat.st_size, stat.st_mtime_ns, sha256_hash.hexdigest())
 
                 return True
 
             except (requests.RequestException, IOError) as e:
                 if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
+                    # 1-1.5s, 2-3s, 4-6s, ... capped at RETRY_BACKOFF_MAX
+                    wait_time = min(
+                        self.RETRY_BACKOFF_BASE * 2 ** attempt * (1 + random.random() * 0.5),
+                        self.RETRY_BACKOFF_MAX,
+                    )
                     logger.warning(f"Download failed (attempt {attempt + 1}/{max_retries}): {e}")
-                    logger.info(f"Retrying in {wait_time} seconds...")
+                    logger.info(f"Retrying in {wait_time:.1f} seconds...")
                     import time
                     time.sleep(wait_time)
                 else:
@@ -166,38 +261,81 @@ class ModelManager:
 
     def _validate_integrity(self, model_path: Path, expected_checksum: Optional[str] = None) -> bool:
         """
-        Validate model file using SHA256 checksum.
+        Validate model file against a checksum.
+
+        expected_checksum is a hex digest, optionally prefixed with its
+        algorithm: "blake3:<hex>" or "sha256:<hex>"; bare digests are SHA256.
+        Without a checksum the file only has to be readable. For SHA256,
+        files downloaded by this manager reuse the digest computed while
+        streaming, as long as their size and mtime are unchanged.
 
         Args:
             model_path: Path to the model file
-            expected_checksum: Expected SHA256 checksum (optional)
+            expected_checksum: Expected checksum (optional)
 
         Returns:
             True if valid, False otherwise
+
+        Raises:
+            ImportError: If a blake3 checksum is given and blake3 isn't installed
         """
         if not model_path.exists():
             return False
 
         try:
-            sha256_hash = hashlib.sha256()
-            with open(model_path, "rb") as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-
-            calculated_checksum = sha256_hash.hexdigest()
+            # Without a checksum, only check that the file is readable
+            if not expected_checksum:
+                with open(model_path, "rb") as f:
+                    f.read(1)
+                return True
 
-            # If expected checksum provided, verify it
-            if expected_checksum:
-                return calculated_checksum == expected_checksum
+            algorithm, digest = _split_checksum(expected_checksum)
+            calculated_checksum = None
+            if algorithm == "sha256":
+                calculated_checksum = self._downloaded_digest(model_path)
+            if calculated_checksum is None:
+                calculated_checksum = self._hash_file(model_path, algorithm)
 
-            # For now, assume file is valid if it exists and is readable
-            # TODO: Implement official checksum verification
-            return True
+            return calculated_checksum == digest
 
         except (IOError, OSError) as e:
             logger.error(f"Integrity check failed for {model_path}: {e}")
             return False
 
+    def _downloaded_digest(self, model_path: Path) -> Optional[str]:
+        """
+        Get the digest recorded when model_path was downloaded.
+
+        Args:
+            model_path: Path to the model file
+
+        Returns:
+            SHA256 hex digest, or None if the file was not downloaded here
+            or has changed since
+        """
+        recorded = self._digests.get(model_path)
+        if recorded is None:
+            return None
+
+        size, mtime_ns, digest = recorded
+        stat = model_path.stat()
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            del self._digests[model_path]
+            return None
+        return digest
+
+    @staticmethod
+    def _hash_file(model_path: Path, algorithm: str = "sha256") -> str:
+        """Compute the hex digest of a file on disk with the given algorithm."""
+        hasher = _new_hasher(algorithm)
+        with open(model_path, "rb") as f:
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11+: hashes straight from the file descriptor
+                return hashlib.file_digest(f, lambda: hasher).hexdigest()
+            for byte_block in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                hasher.update(byte_block)
+        return hasher.hexdigest()
+
     def load_custom_model(self, model_path: Path) -> Path:
         """
         Load custom model from specified path.
@@ -241,11 +379,18 @@ class ModelManager:
 
         current_time = time.time()
 
-        for model_file in self.cache_dir.glob("*.pt"):
-            if older_than_days is not None:
-                file_age = current_time - model_file.stat().st_mtime
-                if file_age < older_than_days * 86400:
+        # scandir gets the file type from the directory read itself and
+        # skips building a Path per entry; only age checks need a stat
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".pt") or not entry.is_file():
                     continue
 
-            logger.info(f"Deleting cached model: {model_file}")
-            model_file.unlink()
+                if older_than_days is not None:
+                    file_age = current_time - entry.stat().st_mtime
+                    if file_age < older_than_days * 86400:
+                        continue
+
+                logger.info(f"Deleting cached model: {entry.path}")
+                os.unlink(entry.path)
+                self._digests.pop(Path(entry.path), None)
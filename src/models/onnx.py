@@ -40,6 +40,8 @@ class ONNXDetector(AbstractDetector):
         self.provider = config.get('provider', None)
         self.confidence_threshold = config.get('confidence_threshold', 0.25)
         self.iou_threshold = config.get('iou_threshold', 0.45)
+        # Set by load_model() when the model input is uint8 (raw pixels)
+        self.uint8_input = False
 
         # ONNX Runtime session
         self.session = None
@@ -101,6 +103,7 @@ class ONNXDetector(AbstractDetector):
             self.input_name = self.session.get_inputs()[0].name
             self.output_names = [output.name for output in self.session.get_outputs()]
             self.input_shape = self.session.get_inputs()[0].shape
+            self.uint8_input = self.session.get_inputs()[0].type == 'tensor(uint8)'
 
             print(f"   Input shape: {self.input_shape}")
             print(f"   Outputs: {self.output_names}")
@@ -206,8 +209,11 @@ class ONNXDetector(AbstractDetector):
         # Convert HWC to CHW
         img = img.transpose(2, 0, 1)
 
-        # Normalize to 0-1
-        img = img.astype(np.float32) / 255.0
+        # Normalize to 0-1 (models with a uint8 input take raw pixels)
+        if self.uint8_input:
+            img = np.ascontiguousarray(img)
+        else:
+            img = img.astype(np.float32) / 255.0
 
         # Add batch dimension
         img = np.expand_dims(img, axis=0)
@@ -5,14 +5,21 @@ Provides version parsing, comparison, and compatibility checking for models.
 """
 
 import re
+import functools
 import logging
 from dataclasses import dataclass
-from typing import Optional, List
+from pathlib import Path
+from typing import Optional, List, Sequence, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Semantic version: major[.minor[.patch]][-prerelease]
+_VERSION_RE = re.compile(r'^(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:[-.]([a-zA-Z0-9]+))?$')
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ModelVersion:
     """
     Semantic version for models.
@@ -21,6 +28,9 @@ class ModelVersion:
     - MAJOR: Incompatible changes
     - MINOR: Backwards-compatible functionality
     - PATCH: Backwards-compatible bug fixes
+
+    Instances are immutable and hashable, so they can be shared freely
+    and used as dict keys.
     """
     major: int
     minor: int
@@ -28,10 +38,13 @@ class ModelVersion:
     prerelease: Optional[str] = None
 
     @classmethod
+    @functools.lru_cache(maxsize=512)
     def parse(cls, version_str: str) -> 'ModelVersion':
         """
         Parse version string into ModelVersion.
 
+        Results are cached; instances are immutable, so sharing them is safe.
+
         Args:
             version_str: Version string (e.g., "2.1.3", "v2.0.0", "1.0.0-alpha")
 
@@ -49,8 +62,7 @@ class ModelVersion:
 
         # Match semantic version pattern
         # Format: major.minor.patch[-prerelease]
-        pattern = r'^(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:[-.]([a-zA-Z0-9]+))?$'
-        match = re.match(pattern, version_str)
+        match = _VERSION_RE.match(version_str)
 
         if not match:
             raise ValueError(f"Invalid version string: {version_str}")
@@ -62,6 +74,10 @@ class ModelVersion:
 
         return cls(major=major, minor=minor, patch=patch, prerelease=prerelease)
 
+    def to_tuple(self) -> Tuple[int, int, int]:
+        """Return (major, minor, patch), the part used for ordering."""
+        return (self.major, self.minor, self.patch)
+
     def __str__(self) -> str:
         """String representation of version."""
         version = f"{self.major}.{self.minor}.{self.patch}"
@@ -101,6 +117,61 @@ class ModelVersion:
         return self > other or self == other
 
 
+def version_array(versions: Sequence[ModelVersion]) -> np.ndarray:
+    """
+    Pack versions into an (N, 3) array of (major, minor, patch) rows.
+
+    Build it once for a list of available versions and pass it to
+    VersionRange.compatible_mask/filter_compatible to reuse it across ranges.
+
+    Args:
+        versions: Versions to pack
+
+    Returns:
+        int64 array of shape (len(versions), 3)
+    """
+    return np.array([v.to_tuple() for v in versions], dtype=np.int64).reshape(-1, 3)
+
+
+def _compare(array: np.ndarray, version: ModelVersion) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compare each row of a version_array to version by (major, minor, patch).
+
+    Returns:
+        (less, equal) boolean masks
+    """
+    major, minor, patch = array[:, 0], array[:, 1], array[:, 2]
+    less = (major < version.major) | (
+        (major == version.major) & (
+            (minor < version.minor) | ((minor == version.minor) & (patch < version.patch))
+        )
+    )
+    equal = (major == version.major) & (minor == version.minor) & (patch == version.patch)
+    return less, equal
+
+
+# Operator (optional), version, and optional hyphen-range upper bound
+_RANGE_RE = re.compile(
+    r'^(?P<op>\^|~|>=|<=|>|<|=)?\s*(?P<version>\S+)(?:\s+-\s+(?P<upper>\S+))?$'
+)
+
+# Range operator -> VersionRange fields for the parsed version
+_RANGE_OPERATORS = {
+    # Exact version: =2.1.3
+    '=': lambda v: {'exact_version': v},
+    # Caret range: ^2.1.3 -> >=2.1.3, <3.0.0
+    '^': lambda v: {'min_version': v, 'max_version': ModelVersion(v.major + 1, 0, 0),
+                    'min_inclusive': True, 'max_inclusive': False},
+    # Tilde range: ~2.1.3 -> >=2.1.3, <2.2.0
+    '~': lambda v: {'min_version': v, 'max_version': ModelVersion(v.major, v.minor + 1, 0),
+                    'min_inclusive': True, 'max_inclusive': False},
+    '>=': lambda v: {'min_version': v, 'min_inclusive': True},
+    '<=': lambda v: {'max_version': v, 'max_inclusive': True},
+    '>': lambda v: {'min_version': v, 'min_inclusive': False},
+    '<': lambda v: {'max_version': v, 'max_inclusive': False},
+}
+
+
 @dataclass
 class VersionRange:
     """
@@ -144,63 +215,28 @@ class VersionRange:
         if range_str == '*' or range_str == '':
             return cls(allow_any=True)
 
+        match = _RANGE_RE.match(range_str)
+        if not match:
+            raise ValueError(f"Invalid version range: {range_str}")
+
+        op, version_str, upper_str = match.group('op', 'version', 'upper')
+
         # Hyphen range: "2.0.0 - 2.5.0"
-        if ' - ' in range_str:
-            parts = range_str.split(' - ')
-            if len(parts) != 2:
+        if upper_str is not None:
+            if op is not None:
                 raise ValueError(f"Invalid hyphen range: {range_str}")
-            min_ver = ModelVersion.parse(parts[0].strip())
-            max_ver = ModelVersion.parse(parts[1].strip())
-            return cls(min_version=min_ver, max_version=max_ver,
+            return cls(min_version=ModelVersion.parse(version_str),
+                      max_version=ModelVersion.parse(upper_str),
                       min_inclusive=True, max_inclusive=True)
 
-        # Caret range: ^2.1.3 -> >=2.1.3, <3.0.0
-        if range_str.startswith('^'):
-            version = ModelVersion.parse(range_str[1:])
-            # Max version is next major
-            max_ver = ModelVersion(version.major + 1, 0, 0)
-            return cls(min_version=version, max_version=max_ver,
-                      min_inclusive=True, max_inclusive=False)
-
-        # Tilde range: ~2.1.3 -> >=2.1.3, <2.2.0
-        if range_str.startswith('~'):
-            version = ModelVersion.parse(range_str[1:])
-            # Max version is next minor
-            max_ver = ModelVersion(version.major, version.minor + 1, 0)
-            return cls(min_version=version, max_version=max_ver,
-                      min_inclusive=True, max_inclusive=False)
-
-        # Exact version: =2.1.3
-        if range_str.startswith('='):
-            version = ModelVersion.parse(range_str[1:])
-            return cls(exact_version=version)
-
-        # Greater than or equal: >=2.0.0
-        if range_str.startswith('>='):
-            version = ModelVersion.parse(range_str[2:])
-            return cls(min_version=version, min_inclusive=True)
-
-        # Less than or equal: <=2.5.0
-        if range_str.startswith('<='):
-            version = ModelVersion.parse(range_str[2:])
-            return cls(max_version=version, max_inclusive=True)
-
-        # Greater than: >2.0.0
-        if range_str.startswith('>'):
-            version = ModelVersion.parse(range_str[1:])
-            return cls(min_version=version, min_inclusive=False)
-
-        # Less than: <3.0.0
-        if range_str.startswith('<'):
-            version = ModelVersion.parse(range_str[1:])
-            return cls(max_version=version, max_inclusive=False)
-
         # If no operator, treat as exact version
-        try:
-            version = ModelVersion.parse(range_str)
-            return cls(exact_version=version)
-        except ValueError:
-            raise ValueError(f"Invalid version range: {range_str}")
+        if op is None:
+            try:
+                return cls(exact_version=ModelVersion.parse(version_str))
+            except ValueError:
+                raise ValueError(f"Invalid version range: {range_str}")
+
+        return cls(**_RANGE_OPERATORS[op](ModelVersion.parse(version_str)))
 
     def is_compatible(self, version: ModelVersion) -> bool:
         """
@@ -236,6 +272,64 @@ class VersionRange:
 
         return True
 
+    def compatible_mask(self, versions: Sequence[ModelVersion],
+                        array: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Check many versions against this range at once.
+
+        Equivalent to [self.is_compatible(v) for v in versions], but the
+        bounds are compared column-wise with NumPy. Only versions whose
+        (major, minor, patch) equals a bound go through is_compatible,
+        since equality there also depends on the prerelease tag.
+
+        Args:
+            versions: Versions to check
+            array: version_array(versions), if already built
+
+        Returns:
+            Boolean mask, True where the version is compatible
+        """
+        if array is None:
+            array = version_array(versions)
+
+        mask = np.ones(len(array), dtype=bool)
+        if self.allow_any:
+            return mask
+
+        on_bound = np.zeros(len(array), dtype=bool)
+        if self.exact_version:
+            less, equal = _compare(array, self.exact_version)
+            mask = equal
+            on_bound = equal
+        else:
+            if self.min_version:
+                less, equal = _compare(array, self.min_version)
+                mask &= ~less
+                on_bound |= equal
+            if self.max_version:
+                less, equal = _compare(array, self.max_version)
+                mask &= less | equal
+                on_bound |= equal
+
+        for i in np.flatnonzero(on_bound & mask):
+            mask[i] = self.is_compatible(versions[i])
+        return mask
+
+    def filter_compatible(self, versions: Sequence[ModelVersion],
+                          array: Optional[np.ndarray] = None) -> List[ModelVersion]:
+        """
+        Select the versions compatible with this range.
+
+        Args:
+            versions: Versions to filter
+            array: version_array(versions), if already built
+
+        Returns:
+            Compatible versions, in their original order
+        """
+        mask = self.compatible_mask(versions, array)
+        return [versions[i] for i in np.flatnonzero(mask)]
+
 
 @dataclass
 class ModelMetadata:
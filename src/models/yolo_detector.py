@@ -5,7 +5,11 @@ Real-time object detection using YOLO v8.
 """
 
 import cv2
+import logging
 import numpy as np
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Dict, Any, Optional, Union
 import time
 import warnings
@@ -20,6 +24,27 @@ except ImportError:
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from src.core.config import ConfigManager
 
+logger = logging.getLogger(__name__)
+
+# Frames buffered between the video reader, detector and writer
+_VIDEO_QUEUE_SIZE = 8
+
+# End-of-stream marker passed through the video frame queues
+_END_OF_STREAM = object()
+
+# ultralytics.YOLO, imported on first model load so that importing this
+# module stays cheap (and so tests can patch it)
+YOLO = None
+
+
+def _yolo_class():
+    """Return ultralytics.YOLO, importing it on first use"""
+    global YOLO
+    if YOLO is None:
+        from ultralytics import YOLO as _YOLO
+        YOLO = _YOLO
+    return YOLO
+
 
 class YOLODetector:
     """YOLO v8 object detector for edge devices"""
@@ -29,7 +54,8 @@ class YOLODetector:
         model_path: Optional[str] = None,
         conf_threshold: Optional[float] = None,
         iou_threshold: Optional[float] = None,
-        config: Optional[Union[ConfigManager, str]] = None
+        config: Optional[Union[ConfigManager, str]] = None,
+        lazy_load: bool = False
     ):
         """
         Initialize YOLO detector.
@@ -39,6 +65,8 @@ class YOLODetector:
             conf_threshold: Confidence threshold (deprecated, use config)
             iou_threshold: IOU threshold (deprecated, use config)
             config: ConfigManager instance or path to config file
+            lazy_load: Defer load_model() to the first detect() call instead
+                of raising when no model is loaded
 
         Examples:
             # New usage with config
@@ -81,14 +109,17 @@ class YOLODetector:
         self.iou_threshold = self.config.get('detection.iou_threshold')
         self.max_detections = self.config.get('detection.max_detections')
 
+        self.lazy_load = lazy_load
         self.model = None
         self.class_names = []
+
+        # Average FPS of the last detect_video() run
+        self._fps_metric = 0.0
     
     def load_model(self) -> None:
         """Load YOLO model"""
         try:
-            from ultralytics import YOLO
-            self.model = YOLO(self.model_path)
+            self.model = _yolo_class()(self.model_path)
             print(f"✅ Model loaded: {self.model_path}")
         except ImportError:
             print("⚠️  ultralytics not installed. Run: pip install ultralytics")
@@ -104,36 +135,102 @@ class YOLODetector:
         Returns:
             List of detections, each containing bbox, confidence, class_id, class_name
         """
-        if self.model is None:
-            raise RuntimeError("Model not loaded. Call load_model() first.")
+        self._ensure_model()
 
         # Run inference
         results = self.model(image, conf=self.conf_threshold, iou=self.iou_threshold)
 
-        # Parse results
+        return self._format_results(results)
+
+    def detect_batch(self, images: Union[List[np.ndarray], np.ndarray]) -> List[List[Dict[str, Any]]]:
+        """
+        Detect objects in several images with a single model call.
+
+        Args:
+            images: List of images, or a stacked (N, H, W, C) array
+
+        Returns:
+            One list of detections per image, in input order
+        """
+        self._ensure_model()
+
+        if isinstance(images, np.ndarray):
+            # ultralytics takes a list of HWC frames for batched inference
+            images = list(images)
+        if not images:
+            return []
+
+        results = self.model(images, conf=self.conf_threshold, iou=self.iou_threshold)
+
+        return [self._format_results([r]) for r in results]
+
+    def _ensure_model(self) -> None:
+        """Load the model on first use if lazy_load is set, else require load_model()"""
+        if self.model is None:
+            if not self.lazy_load:
+                raise RuntimeError("Model not loaded. Call load_model() first.")
+            self.load_model()
+
+    def _format_results(self, results) -> List[Dict[str, Any]]:
+        """
+        Convert YOLO results to detection dicts, truncated to max_detections
+
+        Boxes are copied to NumPy once per tensor and sliced before any
+        Python objects are built, so dropped detections cost nothing.
+        """
         detections = []
         for r in results:
-            boxes = r.boxes
-            for box in boxes:
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                conf = box.conf[0].cpu().numpy()
-                cls = int(box.cls[0].cpu().numpy())
-
-                detections.append({
-                    'bbox': [float(x1), float(y1), float(x2), float(y2)],
-                    'confidence': float(conf),
-                    'class_id': cls,
-                    'class_name': self.model.names[cls]
-                })
+            names = r.names if isinstance(getattr(r, 'names', None), dict) else self.model.names
 
+            for xyxy, conf, cls in self._box_arrays(r.boxes):
                 # Limit to max_detections
-                if len(detections) >= self.max_detections:
-                    break
+                remaining = self.max_detections - len(detections)
+                if remaining <= 0:
+                    return detections
+
+                xyxy = xyxy[:remaining].astype(np.float64, copy=False)
+                conf = conf[:remaining].astype(np.float64, copy=False)
+                cls = cls[:remaining].astype(np.int64, copy=False)
+
+                detections.extend(
+                    {
+                        'bbox': bbox,
+                        'confidence': score,
+                        'class_id': class_id,
+                        'class_name': names[class_id]
+                    }
+                    for bbox, score, class_id in zip(xyxy.tolist(), conf.tolist(), cls.tolist())
+                )
 
         return detections
+
+    @staticmethod
+    def _box_arrays(boxes):
+        """
+        Yield (xyxy[N, 4], conf[N], cls[N]) NumPy arrays for a result's boxes
+
+        ultralytics Boxes hold every box in one tensor; plain iterables of
+        boxes (one entry per box or per block of boxes) are handled too.
+        """
+        if hasattr(boxes, 'xyxy'):
+            parts = [(boxes.xyxy, boxes.conf, boxes.cls)]
+        else:
+            parts = ((box.xyxy[0], box.conf[0], box.cls[0]) for box in boxes)
+
+        for xyxy, conf, cls in parts:
+            yield (
+                np.asarray(xyxy.cpu().numpy()).reshape(-1, 4),
+                np.asarray(conf.cpu().numpy()).reshape(-1),
+                np.asarray(cls.cpu().numpy()).reshape(-1)
+            )
     
     def detect_video(self, video_path: str, output_path: str = None) -> None:
-        """Detect objects in video"""
+        """
+        Detect objects in video
+
+        Frames are decoded and encoded on background threads so capture
+        and writing overlap with inference, which stays on this thread.
+        """
         cap = cv2.VideoCapture(video_path)
         
         # Get video properties
@@ -149,37 +246,58 @@ class YOLODetector:
         
         frame_count = 0
         total_time = 0
-        
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Detect
-            start_time = time.time()
-            detections = self.detect(frame)
-            inference_time = time.time() - start_time
-            
-            # Draw detections
-            frame = self.draw_detections(frame, detections)
-            
-            # Add FPS
-            fps_text = f"FPS: {1/inference_time:.1f}"
-            cv2.putText(frame, fps_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            
+
+        frames = queue.Queue(maxsize=_VIDEO_QUEUE_SIZE)
+        annotated = queue.Queue(maxsize=_VIDEO_QUEUE_SIZE)
+        stop = threading.Event()
+
+        try:
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix='detect_video') as pool:
+                reader_job = pool.submit(_read_frames, cap, frames, stop)
+                writer_job = pool.submit(_write_frames, writer, annotated, stop) if writer else None
+
+                try:
+                    while True:
+                        frame = _queue_get(frames, stop)
+                        if frame is _END_OF_STREAM:
+                            break
+
+                        # Detect
+                        start_time = time.time()
+                        detections = self.detect(frame)
+                        inference_time = time.time() - start_time
+
+                        # Draw detections
+                        frame = self.draw_detections(frame, detections)
+
+                        # Add FPS
+                        fps_text = f"FPS: {1/inference_time:.1f}"
+                        cv2.putText(frame, fps_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+
+                        if writer_job and not _queue_put(annotated, frame, stop):
+                            break
+
+                        frame_count += 1
+                        total_time += inference_time
+
+                    if writer_job:
+                        _queue_put(annotated, _END_OF_STREAM, stop)
+                except BaseException:
+                    stop.set()
+                    raise
+
+                # Surface reader/writer errors
+                reader_job.result()
+                if writer_job:
+                    writer_job.result()
+        finally:
+            cap.release()
             if writer:
-                writer.write(frame)
-            
-            frame_count += 1
-            total_time += inference_time
-        
-        cap.release()
-        if writer:
-            writer.release()
+                writer.release()
         
         avg_fps = frame_count / total_time if total_time > 0 else 0
-        print(f"✅ Processed {frame_count} frames")
-        print(f"   Average FPS: {avg_fps:.1f}")
+        self._fps_metric = avg_fps
+        logger.info("processed_frames=%d avg_fps=%.1f", frame_count, avg_fps)
     
     def draw_detections(self, image: np.ndarray, detections: List[Dict[str, Any]]) -> np.ndarray:
         """Draw bounding boxes on image"""
@@ -194,3 +312,51 @@ class YOLODetector:
             cv2.putText(image, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
         
         return image
+
+
+def _queue_put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put item on a bounded queue, giving up once stop is set"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _queue_get(q: queue.Queue, stop: threading.Event) -> Any:
+    """Get the next queue item, or the end-of-stream marker once stop is set"""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _END_OF_STREAM
+
+
+def _read_frames(cap, frames: queue.Queue, stop: threading.Event) -> None:
+    """Decode frames from cap into the frames queue (video reader thread)"""
+    try:
+        while cap.isOpened():
+            ret, frame = cap.read()
+            if not ret or not _queue_put(frames, frame, stop):
+                break
+    except BaseException:
+        stop.set()
+        raise
+
+    _queue_put(frames, _END_OF_STREAM, stop)
+
+
+def _write_frames(writer, annotated: queue.Queue, stop: threading.Event) -> None:
+    """Encode annotated frames with writer (video writer thread)"""
+    try:
+        while True:
+            frame = _queue_get(annotated, stop)
+            if frame is _END_OF_STREAM:
+                return
+            writer.write(frame)
+    except BaseException:
+        stop.set()
+        raise
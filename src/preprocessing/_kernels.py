@@ -0,0 +1,141 @@
+"""
+Numba kernels for image preprocessing
+
+Numba is optional: NUMBA_AVAILABLE tells callers whether the kernels are
+JIT-compiled. Without it they are plain Python loops, so callers should
+use their OpenCV/NumPy path instead.
+"""
+
+import numpy as np
+
+try:
+    import numba
+    from numba import prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    prange = range
+    NUMBA_AVAILABLE = False
+
+
+def _jit(func):
+    """Compile func with Numba when available, otherwise return it unchanged"""
+    if not NUMBA_AVAILABLE:
+        return func
+    return numba.njit(parallel=True, fastmath=True, cache=True)(func)
+
+
+@_jit
+def letterbox_into(src, dst, pad_w, pad_h, new_w, new_h):
+    """
+    Bilinear-resize src into dst[pad_h:pad_h + new_h, pad_w:pad_w + new_w]
+
+    Resize and padding are fused into one pass over the destination rows;
+    the border of dst is left untouched (pre-fill it with the pad color).
+    Sampling uses pixel centers, like cv2.INTER_LINEAR.
+
+    Args:
+        src: Source image (H, W, C) uint8
+        dst: Destination image (target_h, target_w, C) uint8
+        pad_w: Left padding in pixels
+        pad_h: Top padding in pixels
+        new_w: Resized width
+        new_h: Resized height
+    """
+    h = src.shape[0]
+    w = src.shape[1]
+    channels = src.shape[2]
+    scale_x = w / new_w
+    scale_y = h / new_h
+
+    for y in prange(new_h):
+        fy = (y + 0.5) * scale_y - 0.5
+        if fy < 0.0:
+            fy = 0.0
+        y0 = min(int(fy), h - 1)
+        y1 = min(y0 + 1, h - 1)
+        wy = fy - y0
+
+        for x in range(new_w):
+            fx = (x + 0.5) * scale_x - 0.5
+            if fx < 0.0:
+                fx = 0.0
+            x0 = min(int(fx), w - 1)
+            x1 = min(x0 + 1, w - 1)
+            wx = fx - x0
+
+            for c in range(channels):
+                top = src[y0, x0, c] * (1.0 - wx) + src[y0, x1, c] * wx
+                bottom = src[y1, x0, c] * (1.0 - wx) + src[y1, x1, c] * wx
+                dst[pad_h + y, pad_w + x, c] = np.uint8(top * (1.0 - wy) + bottom * wy + 0.5)
+
+
+@_jit
+def preprocess_into(src, dst, pad_w, pad_h, new_w, new_h, scale, offset):
+    """
+    Resize a BGR uint8 image into an RGB float32 CHW buffer in one pass
+
+    Each output value is resized_pixel * scale[c] + offset[c], which covers
+    /255 and mean/std normalization. Like letterbox_into, only the resized
+    region of dst is written.
+
+    Args:
+        src: Source image (H, W, 3) uint8, BGR
+        dst: Destination buffer (3, target_h, target_w) float32, RGB
+        pad_w: Left padding in pixels
+        pad_h: Top padding in pixels
+        new_w: Resized width
+        new_h: Resized height
+        scale: Per-channel (RGB) multiplier, float32[3]
+        offset: Per-channel (RGB) offset, float32[3]
+    """
+    h = src.shape[0]
+    w = src.shape[1]
+    scale_x = w / new_w
+    scale_y = h / new_h
+
+    for y in prange(new_h):
+        fy = (y + 0.5) * scale_y - 0.5
+        if fy < 0.0:
+            fy = 0.0
+        y0 = min(int(fy), h - 1)
+        y1 = min(y0 + 1, h - 1)
+        wy = fy - y0
+
+        for x in range(new_w):
+            fx = (x + 0.5) * scale_x - 0.5
+            if fx < 0.0:
+                fx = 0.0
+            x0 = min(int(fx), w - 1)
+            x1 = min(x0 + 1, w - 1)
+            wx = fx - x0
+
+            for c in range(3):
+                # BGR source channel for RGB output channel c
+                s = 2 - c
+                top = src[y0, x0, s] * (1.0 - wx) + src[y0, x1, s] * wx
+                bottom = src[y1, x0, s] * (1.0 - wx) + src[y1, x1, s] * wx
+                dst[c, pad_h + y, pad_w + x] = (top * (1.0 - wy) + bottom * wy) * scale[c] + offset[c]
+
+
+@_jit
+def hwc_u8_to_chw_f32(src, dst, scale, offset):
+    """
+    Convert a BGR uint8 HWC image to an RGB float32 CHW buffer in one pass
+
+    Same per-channel scale/offset as preprocess_into, for images that are
+    already at the target size (no resampling).
+
+    Args:
+        src: Source image (H, W, 3) uint8, BGR
+        dst: Destination buffer (3, H, W) float32, RGB
+        scale: Per-channel (RGB) multiplier, float32[3]
+        offset: Per-channel (RGB) offset, float32[3]
+    """
+    h = src.shape[0]
+    w = src.shape[1]
+
+    for y in prange(h):
+        for x in range(w):
+            for c in range(3):
+                dst[c, y, x] = src[y, x, 2 - c] * scale[c] + offset[c]
@@ -4,9 +4,14 @@ Image Preprocessing for Edge Detection
 Handles image preprocessing, augmentation, and optimization for edge devices.
 """
 
+import io
+import math
 import cv2
 import numpy as np
-from typing import Tuple, List, Optional, Dict, Any
+from pathlib import Path
+from typing import Tuple, List, Optional, Dict, Any, Union
+
+from ._kernels import NUMBA_AVAILABLE, hwc_u8_to_chw_f32, letterbox_into, preprocess_into
 
 
 class ImageProcessor:
@@ -17,12 +22,16 @@ class ImageProcessor:
         target_size: Tuple[int, int] = (640, 640),
         normalize: bool = True,
         mean: Tuple[float, ...] = (0.485, 0.456, 0.406),
-        std: Tuple[float, ...] = (0.229, 0.224, 0.225)
+        std: Tuple[float, ...] = (0.229, 0.224, 0.225),
+        dtype: type = np.float32
     ):
         self.target_size = target_size
         self.normalize = normalize
         self.mean = np.array(mean, dtype=np.float32)
         self.std = np.array(std, dtype=np.float32)
+        # np.uint8 keeps raw RGB pixels for int8-quantized models, which
+        # fold the input scaling into their first layer
+        self.dtype = np.dtype(dtype)
     
     def preprocess(self, image: np.ndarray) -> np.ndarray:
         """
@@ -32,8 +41,19 @@ class ImageProcessor:
             image: Input image (BGR format from OpenCV)
             
         Returns:
-            Preprocessed image
+            Preprocessed image (float32, or raw uint8 pixels when dtype is uint8)
         """
+        if self.dtype == np.uint8:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            image = self.resize(image, self.target_size)
+            return np.ascontiguousarray(np.transpose(image, (2, 0, 1)))[np.newaxis]
+        
+        if self._can_fuse(image):
+            target_w, target_h = self.target_size
+            out = np.empty((1, 3, target_h, target_w), dtype=np.float32)
+            self._preprocess_into(image, out[0])
+            return out
+        
         # Convert BGR to RGB
         image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         
@@ -92,6 +112,61 @@ class ImageProcessor:
         
         return padded
     
+    def decode_scaled(
+        self,
+        source: Union[str, Path, bytes],
+        max_dim: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Decode an image, downscaling during decode where the codec allows it.
+        
+        JPEGs are decoded by libjpeg at the smallest 1/2, 1/4 or 1/8 scale
+        whose long side is still >= max_dim, so huge images are never
+        materialized at full size. The result is then resized to a long
+        side of max_dim (images already smaller are returned as is).
+        
+        Args:
+            source: Image file path or encoded image bytes
+            max_dim: Long side of the result (default: max of target_size)
+            
+        Returns:
+            Decoded image (BGR, uint8)
+            
+        Raises:
+            ValueError: If the data cannot be decoded as an image
+        """
+        from PIL import Image, UnidentifiedImageError
+        
+        if max_dim is None:
+            max_dim = max(self.target_size)
+        
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        
+        try:
+            with Image.open(source) as img:
+                w, h = img.size
+                scale = min(1.0, max_dim / max(w, h))
+                
+                # Let libjpeg reduce in the DCT domain (no-op for other formats)
+                img.draft('RGB', (math.ceil(w * scale), math.ceil(h * scale)))
+                rgb = np.asarray(img.convert('RGB'))
+        except UnidentifiedImageError as e:
+            raise ValueError(f"Cannot decode image: {e}") from e
+        
+        image = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+        
+        h, w = image.shape[:2]
+        if max(w, h) > max_dim:
+            scale = max_dim / max(w, h)
+            image = cv2.resize(
+                image,
+                (max(1, round(w * scale)), max(1, round(h * scale))),
+                interpolation=cv2.INTER_AREA
+            )
+        
+        return image
+    
     def letterbox(
         self,
         image: np.ndarray,
@@ -117,8 +192,8 @@ class ImageProcessor:
         new_w = int(w * scale)
         new_h = int(h * scale)
         
-        # Resize
-        resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        if new_w <= 0 or new_h <= 0:
+            raise ValueError(f"Cannot letterbox {w}x{h} image to {target_w}x{target_h}")
         
         # Calculate padding
         pad_w = (target_w - new_w) // 2
@@ -126,14 +201,79 @@ class ImageProcessor:
         
         # Create padded image
         padded = np.full((target_h, target_w, 3), color, dtype=np.uint8)
-        padded[pad_h:pad_h + new_h, pad_w:pad_w + new_w] = resized
+        
+        if NUMBA_AVAILABLE and image.dtype == np.uint8 and image.ndim == 3 and image.shape[2] == 3:
+            # Resize straight into the padded buffer
+            letterbox_into(np.ascontiguousarray(image), padded, pad_w, pad_h, new_w, new_h)
+        else:
+            resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+            padded[pad_h:pad_h + new_h, pad_w:pad_w + new_w] = resized
         
         return padded, scale, (pad_w, pad_h)
     
     def batch_preprocess(self, images: List[np.ndarray]) -> np.ndarray:
-        """Preprocess a batch of images"""
-        processed = [self.preprocess(img) for img in images]
-        return np.concatenate(processed, axis=0)
+        """Preprocess a batch of images into a single preallocated NCHW array of dtype"""
+        if not images:
+            raise ValueError("need at least one array to preprocess")
+        
+        target_w, target_h = self.target_size
+        batch = np.empty((len(images), 3, target_h, target_w), dtype=self.dtype)
+        
+        for i, img in enumerate(images):
+            if self._can_fuse(img):
+                self._preprocess_into(img, batch[i])
+            else:
+                batch[i] = self.preprocess(img)[0]
+        
+        return batch
+    
+    def _can_fuse(self, image: np.ndarray) -> bool:
+        """Whether image can go through the fused Numba preprocessing kernel"""
+        return (
+            NUMBA_AVAILABLE
+            and self.dtype == np.float32
+            and image.dtype == np.uint8
+            and image.ndim == 3
+            and image.shape[2] == 3
+        )
+    
+    def _preprocess_into(self, image: np.ndarray, out: np.ndarray) -> None:
+        """
+        Fused preprocess() of one BGR uint8 image into a (3, H, W) float32 view
+        
+        Args:
+            image: Input image (BGR format from OpenCV)
+            out: Destination view, e.g. one slot of a batch array
+        """
+        h, w = image.shape[:2]
+        target_w, target_h = self.target_size
+        
+        # Same geometry as resize(keep_ratio=True)
+        scale = min(target_w / w, target_h / h)
+        new_w = int(w * scale)
+        new_h = int(h * scale)
+        pad_x = (target_w - new_w) // 2
+        pad_y = (target_h - new_h) // 2
+        
+        if self.normalize:
+            channel_scale = (1.0 / (255.0 * self.std)).astype(np.float32)
+            channel_offset = (-self.mean / self.std).astype(np.float32)
+        else:
+            channel_scale = np.full(3, 1.0 / 255.0, dtype=np.float32)
+            channel_offset = np.zeros(3, dtype=np.float32)
+        
+        image = np.ascontiguousarray(image)
+        if (new_w, new_h) == (w, h) == (target_w, target_h):
+            # Already at target size: layout conversion only
+            hwc_u8_to_chw_f32(image, out, channel_scale, channel_offset)
+            return
+        
+        # Padding is black before normalization
+        out[...] = channel_offset[:, None, None]
+        preprocess_into(
+            image, out, pad_x, pad_y, new_w, new_h,
+            channel_scale, channel_offset
+        )
 
 
 class ImageAugmentor:
@@ -0,0 +1,120 @@
+"""
+Tests for BatchScheduler.
+
+Covers request coalescing, result routing, error propagation and shutdown.
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+import numpy as np
+
+from src.api.batch_scheduler import BatchScheduler
+from src.detection.base import DetectionResult
+
+
+def make_result(index: int) -> DetectionResult:
+    """Detection result tagged with the index of its image."""
+    return DetectionResult(
+        boxes=np.empty((0, 4), dtype=np.float32),
+        scores=np.empty((0,), dtype=np.float32),
+        classes=np.empty((0,), dtype=np.int32),
+        metadata={'index': index}
+    )
+
+
+@pytest.fixture
+def batch_detector():
+    """Mock detector whose detect_batch tags results with image[0, 0, 0]."""
+    detector = Mock()
+    detector.detect_batch.side_effect = lambda images: [
+        make_result(int(img[0, 0, 0])) for img in images
+    ]
+    return detector
+
+
+@pytest.fixture
+def images():
+    """Eight small images, each filled with its index."""
+    return [np.full((8, 8, 3), i, dtype=np.uint8) for i in range(8)]
+
+
+class TestBatchSchedulerInitialization:
+    """Test BatchScheduler argument validation."""
+
+    def test_rejects_none_detector(self):
+        """Test that None detector is rejected."""
+        with pytest.raises(ValueError, match="Detector cannot be None"):
+            BatchScheduler(None)
+
+    @pytest.mark.parametrize("kwargs", [{'max_batch': 0}, {'max_delay_ms': -1}])
+    def test_rejects_invalid_limits(self, batch_detector, kwargs):
+        """Test that invalid batch limits are rejected."""
+        with pytest.raises(ValueError):
+            BatchScheduler(batch_detector, **kwargs)
+
+
+class TestBatchScheduling:
+    """Test coalescing and routing of submitted images."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submits_share_one_batch(self, batch_detector, images):
+        """Test that concurrent submissions are run as one detect_batch call."""
+        async with BatchScheduler(batch_detector, max_batch=8, max_delay_ms=50) as scheduler:
+            results = await asyncio.gather(*(scheduler.submit(img) for img in images))
+
+        assert batch_detector.detect_batch.call_count == 1
+        assert [r.metadata['index'] for r in results] == list(range(8))
+        assert scheduler.get_stats()['avg_batch_size'] == 8
+
+    @pytest.mark.asyncio
+    async def test_batches_capped_at_max_batch(self, batch_detector, images):
+        """Test that batches never exceed max_batch images."""
+        async with BatchScheduler(batch_detector, max_batch=3, max_delay_ms=50) as scheduler:
+            results = await asyncio.gather(*(scheduler.submit(img) for img in images))
+
+        sizes = [len(call.args[0]) for call in batch_detector.detect_batch.call_args_list]
+        assert sizes == [3, 3, 2]
+        assert [r.metadata['index'] for r in results] == list(range(8))
+
+    @pytest.mark.asyncio
+    async def test_single_submit_dispatched_after_delay(self, batch_detector, images):
+        """Test that a lone image is not held back waiting for a full batch."""
+        async with BatchScheduler(batch_detector, max_batch=8, max_delay_ms=1) as scheduler:
+            result = await asyncio.wait_for(scheduler.submit(images[5]), timeout=1)
+
+        assert result.metadata['index'] == 5
+        batch_detector.detect_batch.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_whole_batch(self, batch_detector, images):
+        """Test that a detect_batch failure is raised to every caller in the batch."""
+        batch_detector.detect_batch.side_effect = RuntimeError("inference failed")
+
+        async with BatchScheduler(batch_detector, max_batch=4, max_delay_ms=50) as scheduler:
+            results = await asyncio.gather(
+                *(scheduler.submit(img) for img in images[:4]),
+                return_exceptions=True
+            )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_invalid_image_rejected(self, batch_detector):
+        """Test that non-image input is rejected before queueing."""
+        async with BatchScheduler(batch_detector) as scheduler:
+            with pytest.raises(ValueError):
+                await scheduler.submit(np.zeros((8, 8), dtype=np.uint8))
+
+        batch_detector.detect_batch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_submit_after_close(self, batch_detector, images):
+        """Test that submitting to a closed scheduler raises RuntimeError."""
+        scheduler = BatchScheduler(batch_detector)
+        await scheduler.start()
+        await scheduler.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            await scheduler.submit(images[0])
@@ -5,6 +5,7 @@ Tests cover YAML loading, environment variable overrides, error handling,
 and configuration validation.
 """
 
+import io
 import os
 import tempfile
 from pathlib import Path
@@ -126,6 +127,21 @@ class TestYAMLLoading:
         finally:
             os.unlink(temp_path)
 
+    def test_load_from_stream(self):
+        """Test loading YAML from an open text stream."""
+        config = ConfigManager()
+        config.load(io.StringIO("model:\n  name: yolov8s\n"))
+
+        assert config.get('model.name') == 'yolov8s'
+        # Default value still present
+        assert config.get('detection.confidence_threshold') == 0.25
+
+    def test_invalid_yaml_stream(self):
+        """Test error handling for invalid YAML in a stream."""
+        config = ConfigManager()
+        with pytest.raises(ConfigurationError, match="Invalid YAML syntax in <stream>"):
+            config.load(io.StringIO("model:\n  name: [yolov8n\n"))
+
     def test_nonexistent_yaml_path(self):
         """Test loading from non-existent path (should use defaults)."""
         config = ConfigManager()
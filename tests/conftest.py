@@ -172,6 +172,14 @@ def temp_output_dir(tmp_path):
     return str(output_dir)
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_home(tmp_path, monkeypatch):
+    """Keep per-user cache writes out of the developer's home directory"""
+    cache_home = tmp_path / "xdg-cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
+
+
 # ============================================================================
 # Pytest Configuration
 # ============================================================================
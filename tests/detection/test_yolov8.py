@@ -0,0 +1,391 @@
+"""
+Tests for the YOLOv8 detector with a mocked ultralytics model.
+"""
+
+import sys
+import threading
+import types
+import pytest
+import numpy as np
+from unittest.mock import MagicMock, Mock, patch
+from src.detection.yolov8 import YOLOv8Detector
+
+torch = pytest.importorskip("torch")
+
+
+def make_result(num_boxes: int = 0) -> Mock:
+    """Build a mock ultralytics result with num_boxes detections."""
+    if num_boxes == 0:
+        return Mock(boxes=None, speed={"inference": 1.0})
+
+    boxes = Mock()
+    boxes.xyxy = torch.tensor([[10.0, 20.0, 30.0, 40.0]] * num_boxes)
+    boxes.conf = torch.full((num_boxes,), 0.9)
+    boxes.cls = torch.zeros(num_boxes)
+    boxes.__len__ = Mock(return_value=num_boxes)
+    return Mock(boxes=boxes, speed={"inference": 1.0})
+
+
+@pytest.fixture
+def mock_yolo():
+    """Install a fake ultralytics module and return its YOLO mock."""
+    model = MagicMock()
+    model.names = {0: "person", 1: "car"}
+    model.side_effect = lambda source, **kwargs: [make_result() for _ in range(len(source))]
+
+    yolo = MagicMock(return_value=model)
+    module = types.ModuleType("ultralytics")
+    module.YOLO = yolo
+    with patch.dict(sys.modules, {"ultralytics": module}):
+        yield yolo
+
+
+@pytest.fixture
+def detector(mock_yolo):
+    """A YOLOv8Detector loaded with fp32 PyTorch weights on CPU."""
+    detector = YOLOv8Detector()
+    detector.load_model("yolov8n.pt", device="cpu")
+    return detector
+
+
+class TestLoadModelDispatch:
+    """Test precision/backend dispatch in load_model."""
+
+    def test_unknown_precision_raises_error(self, mock_yolo):
+        """Test that an unknown precision is rejected before loading."""
+        with pytest.raises(ValueError, match="Unknown precision"):
+            YOLOv8Detector().load_model("yolov8n.pt", precision="bf16")
+        mock_yolo.assert_not_called()
+
+    def test_int8_on_cuda_raises_error(self, mock_yolo):
+        """Test that int8 is only accepted on CPU."""
+        with pytest.raises(ValueError, match="only supported on CPU"):
+            YOLOv8Detector().load_model("yolov8n.pt", device="cuda", precision="int8")
+        mock_yolo.assert_not_called()
+
+    def test_fp32_loads_pytorch_weights(self, detector, mock_yolo):
+        """Test that fp32 runs the PyTorch weights as is."""
+        mock_yolo.assert_called_once_with("yolov8n.pt")
+        assert detector._backend == "pytorch"
+        assert detector._predict_kwargs == {}
+        assert detector._class_names == ["person", "car"]
+
+    def test_fp16_on_cuda_uses_half(self, mock_yolo):
+        """Test that fp16 on CUDA keeps PyTorch and predicts in half precision."""
+        detector = YOLOv8Detector()
+        with patch.object(YOLOv8Detector, "export_openvino") as export:
+            detector.load_model("yolov8n.pt", device="cuda:0", precision="fp16")
+
+        export.assert_not_called()
+        assert detector._backend == "pytorch"
+        assert detector._predict_kwargs == {"half": True}
+
+    @pytest.mark.parametrize("precision, int8", [("fp16", False), ("int8", True)])
+    def test_reduced_precision_on_cpu_exports_openvino(self, mock_yolo, precision, int8):
+        """Test that fp16/int8 on CPU load an exported OpenVINO IR."""
+        detector = YOLOv8Detector()
+        with patch.object(
+            YOLOv8Detector, "export_openvino", return_value="yolov8n_openvino_model"
+        ) as export:
+            detector.load_model("yolov8n.pt", device="cpu", precision=precision)
+
+        export.assert_called_once_with("yolov8n.pt", half=True, int8=int8, dynamic=True)
+        mock_yolo.assert_called_once_with("yolov8n_openvino_model")
+        assert detector._backend == "openvino"
+        assert detector.get_model_info().metadata["precision"] == precision
+
+    def test_openvino_directory_is_not_exported_again(self, mock_yolo):
+        """Test that an OpenVINO IR directory is loaded directly."""
+        detector = YOLOv8Detector()
+        with patch.object(YOLOv8Detector, "export_openvino") as export, \
+                patch.object(YOLOv8Detector, "_use_channels_last") as channels_last:
+            detector.load_model("yolov8n_openvino_model", precision="fp16")
+
+        export.assert_not_called()
+        channels_last.assert_not_called()
+        assert detector._backend == "openvino"
+        assert detector.get_model_info().name == "yolov8n"
+
+    def test_compile_is_ignored_for_openvino(self, mock_yolo):
+        """Test that compile_model only applies to PyTorch models."""
+        detector = YOLOv8Detector()
+        with patch.object(YOLOv8Detector, "_compile") as compile_:
+            detector.load_model("yolov8n_openvino_model", compile_model=True)
+        compile_.assert_not_called()
+
+    def test_missing_ultralytics_raises_import_error(self):
+        """Test that a missing ultralytics package is reported."""
+        with patch.dict(sys.modules, {"ultralytics": None}):
+            with pytest.raises(ImportError, match="ultralytics"):
+                YOLOv8Detector().load_model("yolov8n.pt")
+
+
+class TestInputBuffer:
+    """Test the per-thread input buffer pool."""
+
+    def test_same_shape_reuses_buffer(self, detector):
+        """Test that a shape is allocated once and then reused."""
+        first = detector._input_buffer((2, 3, 64, 64), torch.float32)
+        second = detector._input_buffer((2, 3, 64, 64), torch.float32)
+        assert first is second
+
+    def test_new_shape_or_dtype_gets_new_buffer(self, detector):
+        """Test that a different shape or dtype allocates its own buffer."""
+        base = detector._input_buffer((2, 3, 64, 64), torch.float32)
+        bigger = detector._input_buffer((4, 3, 64, 64), torch.float32)
+        half = detector._input_buffer((2, 3, 64, 64), torch.float16)
+
+        assert bigger is not base and bigger.shape == (4, 3, 64, 64)
+        assert half is not base and half.dtype == torch.float16
+        # Earlier shapes stay pooled
+        assert detector._input_buffer((2, 3, 64, 64), torch.float32) is base
+
+    def test_batch_buffer_is_channels_last(self, detector):
+        """Test that 4-D buffers match the channels_last model weights."""
+        buffer = detector._input_buffer((2, 3, 64, 64), torch.float32)
+        assert buffer.is_contiguous(memory_format=torch.channels_last)
+        assert not buffer.is_pinned()
+
+    def test_buffers_are_per_thread(self, detector):
+        """Test that each thread gets its own buffer for the same shape."""
+        main = detector._input_buffer((1, 3, 64, 64), torch.float32)
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(detector._input_buffer((1, 3, 64, 64), torch.float32))
+        )
+        thread.start()
+        thread.join()
+        assert other[0] is not main
+
+
+class TestDetectPreprocessed:
+    """Test batch inference on preprocessed tensors."""
+
+    def test_list_of_tensors(self, detector):
+        """Test that a list is stacked into the pooled buffer and run once."""
+        images = [torch.rand(3, 64, 64) for _ in range(3)]
+        results = detector.detect_preprocessed(images)
+
+        assert len(results) == 3
+        assert all(r.boxes.shape == (0, 4) for r in results)
+
+        model = detector._model
+        model.assert_called_once()
+        source = model.call_args.args[0]
+        assert source is detector._input_buffer((3, 3, 64, 64), torch.float32)
+        assert torch.equal(source[1], images[1])
+        assert model.call_args.kwargs["device"] == "cpu"
+
+    def test_batch_tensor(self, detector):
+        """Test that a (B, 3, H, W) tensor is passed through unchanged."""
+        batch = torch.rand(2, 3, 64, 64)
+        detector._model.side_effect = None
+        detector._model.return_value = [make_result(1), make_result(2)]
+
+        results = detector.detect_preprocessed(batch)
+
+        assert detector._model.call_args.args[0] is batch
+        assert [len(r.boxes) for r in results] == [1, 2]
+        assert results[1].classes.dtype.kind == "i"
+
+    def test_empty_list_raises_error(self, detector):
+        """Test that an empty batch is rejected."""
+        with pytest.raises(ValueError, match="Batch cannot be empty"):
+            detector.detect_preprocessed([])
+
+    def test_invalid_shape_raises_error(self, detector):
+        """Test that a non-(B, 3, H, W) tensor is rejected."""
+        with pytest.raises(ValueError, match="Batch must have shape"):
+            detector.detect_preprocessed(torch.rand(3, 64, 64))
+
+    def test_runs_under_inference_mode(self, detector):
+        """Test that the model is called with autograd disabled."""
+        modes = []
+        detector._model.side_effect = lambda source, **kwargs: (
+            modes.append(torch.is_inference_mode_enabled()) or [make_result()]
+        )
+        detector.detect_preprocessed(torch.rand(1, 3, 64, 64))
+        assert modes == [True]
+
+    def test_without_loading_raises_error(self):
+        """Test that detect_preprocessed requires a loaded model."""
+        with pytest.raises(RuntimeError, match="Model not loaded"):
+            YOLOv8Detector().detect_preprocessed(torch.rand(1, 3, 64, 64))
+
+
+class TestDetectTensor:
+    """Test single-image inference on a preprocessed tensor."""
+
+    @pytest.mark.parametrize("shape", [(3, 64, 64), (1, 3, 64, 64)])
+    def test_single_image(self, detector, shape):
+        """Test that (3, H, W) and (1, 3, H, W) tensors give one result."""
+        tensor = torch.rand(shape)
+        result = detector.detect_tensor(tensor)
+
+        assert result.boxes.shape == (0, 4)
+        source = detector._model.call_args.args[0]
+        assert source.shape == (1, 3, 64, 64)
+        assert torch.equal(source[0], tensor.reshape(3, 64, 64))
+
+    def test_batch_raises_error(self, detector):
+        """Test that more than one image is rejected."""
+        with pytest.raises(ValueError, match="Tensor must have shape"):
+            detector.detect_tensor(torch.rand(2, 3, 64, 64))
+
+    def test_channels_passed_unchanged(self, detector):
+        """Test that the tensor reaches the model in the caller's (RGB) order."""
+        tensor = torch.zeros(3, 64, 64)
+        tensor[0] = 1.0  # red only
+
+        detector.detect_tensor(tensor)
+
+        source = detector._model.call_args.args[0]
+        assert source[0, 0].eq(1.0).all() and source[0, 2].eq(0.0).all()
+
+
+class TestFallbacks:
+    """Test that missing CUDA or torch.compile falls back to eager fp32."""
+
+    def test_compile_unavailable_keeps_eager_model(self, mock_yolo, monkeypatch):
+        """Test that compile_model is a no-op without torch.compile."""
+        monkeypatch.delattr(torch, "compile")
+        net = torch.nn.Conv2d(3, 8, 3)
+        forward = net.forward
+        mock_yolo.return_value.model = net
+
+        detector = YOLOv8Detector()
+        detector.load_model("yolov8n.pt", compile_model=True)
+
+        assert net.forward == forward
+        assert detector.get_model_info().metadata["compiled"] is False
+        assert detector.get_model_info().metadata["precision"] == "fp32"
+
+    def test_compile_wraps_forward(self, mock_yolo):
+        """Test that compile_model replaces the PyTorch forward."""
+        net = torch.nn.Conv2d(3, 8, 3)
+        mock_yolo.return_value.model = net
+
+        detector = YOLOv8Detector()
+        with patch.object(torch, "compile", return_value="compiled") as compile_:
+            detector.load_model("yolov8n.pt", compile_model=True)
+
+        assert compile_.call_args.kwargs == {"dynamic": False, "mode": "default"}
+        assert net.forward == "compiled"
+        assert detector.get_model_info().metadata["compiled"] is True
+
+    def test_channels_last_weights(self, mock_yolo):
+        """Test that PyTorch weights are converted to channels_last."""
+        net = torch.nn.Conv2d(3, 8, 3)
+        mock_yolo.return_value.model = net
+
+        YOLOv8Detector().load_model("yolov8n.pt")
+
+        assert net.weight.is_contiguous(memory_format=torch.channels_last)
+
+    def test_cuda_unavailable_keeps_batch_on_host(self, mock_yolo, monkeypatch):
+        """Test that a CUDA model without CUDA skips pinning and the copy stream."""
+        monkeypatch.setattr(torch.cuda, "is_available", lambda: False)
+        detector = YOLOv8Detector()
+        detector.load_model("yolov8n.pt", device="cuda")
+
+        buffer = detector._input_buffer((1, 3, 64, 64), torch.float32)
+        assert not buffer.is_pinned()
+        assert detector._to_device(buffer) is buffer
+        assert detector._copy_stream is None
+
+    def test_cpu_model_is_not_copied(self, detector):
+        """Test that _to_device returns CPU batches unchanged on CPU."""
+        batch = torch.rand(1, 3, 64, 64)
+        assert detector._to_device(batch) is batch
+
+    def test_amp_on_cpu_uses_bfloat16(self, mock_yolo):
+        """Test that amp runs the CPU forward under bfloat16 autocast."""
+        detector = YOLOv8Detector()
+        detector.load_model("yolov8n.pt", amp=True)
+
+        with detector._inference_context():
+            assert torch.is_inference_mode_enabled()
+            assert torch.mm(torch.ones(2, 2), torch.ones(2, 2)).dtype == torch.bfloat16
+
+    def test_no_autocast_by_default(self, detector):
+        """Test that fp32 inference runs without autocast."""
+        with detector._inference_context():
+            assert torch.is_inference_mode_enabled()
+            assert torch.mm(torch.ones(2, 2), torch.ones(2, 2)).dtype == torch.float32
+
+
+class TestWarmup:
+    """Test dummy inference warmup."""
+
+    def test_single_image_warmup(self, detector):
+        """Test that batch 1 warms up through detect()."""
+        with patch.object(detector, "detect") as detect:
+            detector.warmup(shape=(1, 3, 64, 32), iters=2)
+
+        assert detect.call_count == 2
+        assert detect.call_args.args[0].shape == (64, 32, 3)
+
+    def test_batch_warmup(self, detector):
+        """Test that larger batches warm up through detect_batch()."""
+        with patch.object(detector, "detect_batch") as detect_batch:
+            detector.warmup(shape=(4, 3, 64, 64), iters=1)
+
+        assert len(detect_batch.call_args.args[0]) == 4
+
+    def test_warmup_without_loading_raises_error(self):
+        """Test that warmup requires a loaded model."""
+        with pytest.raises(RuntimeError, match="Model not loaded"):
+            YOLOv8Detector().warmup()
+
+
+class TestExportOpenVINO:
+    """Test OpenVINO IR export arguments."""
+
+    def test_fp16_export(self, mock_yolo):
+        """Test the default FP16, batch 1 export."""
+        mock_yolo.return_value.export.return_value = "yolov8n_openvino_model"
+
+        path = YOLOv8Detector.export_openvino("yolov8n.pt")
+
+        assert path == "yolov8n_openvino_model"
+        mock_yolo.return_value.export.assert_called_once_with(
+            format="openvino", half=True, batch=1
+        )
+
+    def test_int8_export_with_calibration_data(self, mock_yolo):
+        """Test that int8 export passes the calibration dataset."""
+        YOLOv8Detector.export_openvino("yolov8n.pt", batch=8, int8=True, data="coco.yaml")
+
+        mock_yolo.return_value.export.assert_called_once_with(
+            format="openvino", half=True, batch=8, int8=True, data="coco.yaml"
+        )
+
+    def test_dynamic_batch_export(self, mock_yolo):
+        """Test that dynamic=True exports a dynamic batch axis."""
+        YOLOv8Detector.export_openvino("yolov8n.pt", dynamic=True)
+
+        mock_yolo.return_value.export.assert_called_once_with(
+            format="openvino", half=True, batch=1, dynamic=True
+        )
+
+    def test_load_batch_reaches_predictor_setup(self, mock_yolo):
+        """Test that the load-time batch is passed from the first predict on."""
+        detector = YOLOv8Detector()
+        detector.load_model("yolov8n_openvino_model", batch=8)
+
+        detector.warmup(iters=1)
+        images = [np.zeros((64, 64, 3), dtype=np.uint8)] * 3
+        results = detector.detect_batch(images)
+
+        assert len(results) == 3
+        calls = detector._model.call_args_list
+        # The first (batch 1) call sets up the predictor and its OpenVINO mode
+        assert [c.kwargs["batch"] for c in calls] == [8, 8]
+
+    def test_batch_is_ignored_for_pytorch(self, mock_yolo):
+        """Test that PyTorch models get no batch predict argument."""
+        detector = YOLOv8Detector()
+        detector.load_model("yolov8n.pt", batch=8)
+        detector.detect_batch([np.zeros((64, 64, 3), dtype=np.uint8)] * 2)
+
+        assert "batch" not in detector._model.call_args.kwargs
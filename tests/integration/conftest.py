@@ -0,0 +1,106 @@
+"""
+Integration test fixtures and configuration.
+"""
+
+import cv2
+import numpy as np
+import pytest
+import yaml
+
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:  # PyYAML without libyaml bindings
+    from yaml import SafeDumper as _Dumper
+
+
+# Config layouts used by the E2E tests, keyed by name
+E2E_CONFIG_LAYOUTS = {
+    'default': {
+        'model': {'type': 'yolo_v8', 'path': 'default.pt'},
+        'detection': {'confidence_threshold': 0.5, 'iou_threshold': 0.4}
+    },
+    'user': {
+        'model': {'path': 'user.pt'},
+        'detection': {'confidence_threshold': 0.6}
+    },
+    'profile': {
+        'detection': {'iou_threshold': 0.5}
+    },
+    'invalid': {
+        'detection': {
+            'confidence_threshold': 1.5,  # Invalid: > 1.0
+            'iou_threshold': -0.5         # Invalid: < 0.0
+        }
+    },
+    'dev': {
+        'device': {'type': 'cpu'},
+        'detection': {'confidence_threshold': 0.3}
+    },
+    'prod': {
+        'device': {'type': 'cuda'},
+        'detection': {'confidence_threshold': 0.7}
+    },
+    'detection': {
+        'model': {'path': 'yolov8n.pt'},
+        'detection': {
+            'confidence_threshold': 0.5,
+            'iou_threshold': 0.4,
+            'max_detections': 100
+        }
+    },
+    'thresholds': {
+        'detection': {
+            'confidence_threshold': 0.75,
+            'iou_threshold': 0.55
+        }
+    },
+    'video': {
+        'model': {'path': 'yolov8n.pt'}
+    },
+}
+
+
+@pytest.fixture(scope="session")
+def e2e_config_bytes():
+    """
+    Pre-serialized YAML for each E2E config layout
+
+    Serialized once per session; tests write the bytes into their own
+    tmp_path with Path.write_bytes().
+    """
+    return {
+        name: yaml.dump(layout, Dumper=_Dumper).encode('utf-8')
+        for name, layout in E2E_CONFIG_LAYOUTS.items()
+    }
+
+
+def _write_mp4(path, frames, fps=30.0):
+    """Encode BGR frames to an mp4v video at path"""
+    height, width = frames[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    try:
+        for frame in frames:
+            writer.write(frame)
+    finally:
+        writer.release()
+
+
+@pytest.fixture(scope="session")
+def single_frame_mp4(tmp_path_factory):
+    """
+    One-frame 640x480 mp4, encoded once per session
+
+    Tests must only read it; encoder start-up would otherwise dominate
+    the single-frame video tests.
+    """
+    path = tmp_path_factory.mktemp('video') / 'single.mp4'
+    _write_mp4(path, [np.zeros((480, 640, 3), dtype=np.uint8)])
+    return path
+
+
+@pytest.fixture(scope="session")
+def cpu_manager():
+    """CPU DeviceManager shared across tests (device detection runs once)"""
+    from src.hardware.device_manager import DeviceManager
+
+    return DeviceManager('cpu')
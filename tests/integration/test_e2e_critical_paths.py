@@ -12,15 +12,99 @@ Tests cover:
 import pytest
 import numpy as np
 import tempfile
-import yaml
+from itertools import repeat
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 
 from src.core.config import ConfigManager
 from src.models.yolo_detector import YOLODetector
 from src.preprocessing.image_processor import ImageProcessor
 
 
+# Keep this module on one xdist worker so module-scoped fixtures are built once
+pytestmark = pytest.mark.xdist_group("integration_e2e")
+
+# Shared blank images: no test inspects pixel values, so one buffer per
+# shape replaces per-test random generation
+_IMG_640 = np.zeros((640, 640, 3), np.uint8)
+_IMG_480x640 = np.zeros((480, 640, 3), np.uint8)
+
+
+class _FakeCap:
+    """
+    Minimal cv2.VideoCapture stand-in
+
+    Plain methods instead of MagicMock, so the per-frame read() calls in the
+    video tests skip Mock's call recording and signature handling.
+    """
+
+    def __init__(self, frames, fps=30, width=640, height=480):
+        self._frames = iter(frames)
+        # CAP_PROP_FPS, CAP_PROP_FRAME_WIDTH, CAP_PROP_FRAME_HEIGHT
+        self._props = {0: fps, 3: width, 4: height}
+        self.read_count = 0
+        self.released = False
+
+    def isOpened(self):
+        return not self.released
+
+    def read(self):
+        self.read_count += 1
+        return next(self._frames, (False, None))
+
+    def get(self, prop):
+        return self._props.get(prop, 0)
+
+    def release(self):
+        self.released = True
+
+
+# ============================================================================
+# Canned YOLO results (built once per module; tests only read them, and the
+# tensors are dropped in teardown once the module is done)
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def canned_yolo_result():
+    """YOLO result with a single 'person' detection"""
+    import torch
+    mock_box = Mock()
+    mock_box.xyxy = [torch.tensor([[100, 100, 200, 200]], device='cpu')]
+    mock_box.conf = [torch.tensor([0.85], device='cpu')]
+    mock_box.cls = [torch.tensor([0], device='cpu')]
+
+    mock_result = Mock()
+    mock_result.boxes = [mock_box]
+    mock_result.names = {0: "person"}
+    yield mock_result
+    mock_box.xyxy = mock_box.conf = mock_box.cls = None
+
+
+@pytest.fixture(scope="module")
+def canned_crowded_yolo_result():
+    """YOLO result with 20 'person' detections"""
+    import torch
+    mock_box = Mock()
+    mock_box.xyxy = [torch.tensor([[i * 10, i * 10, (i + 1) * 10, (i + 1) * 10]
+                                   for i in range(20)], device='cpu')]
+    mock_box.conf = [torch.tensor([0.9] * 20, device='cpu')]
+    mock_box.cls = [torch.tensor([0] * 20, device='cpu')]
+
+    mock_result = Mock()
+    mock_result.boxes = [mock_box]
+    mock_result.names = {0: "person"}
+    yield mock_result
+    mock_box.xyxy = mock_box.conf = mock_box.cls = None
+
+
+@pytest.fixture(scope="module")
+def canned_empty_yolo_result():
+    """YOLO result without detections"""
+    mock_result = Mock()
+    mock_result.boxes = []
+    return mock_result
+
+
 @pytest.mark.integration
 class TestConfigurationE2E:
     """
@@ -29,41 +113,26 @@ class TestConfigurationE2E:
     """
 
     @pytest.mark.integration
-    def test_full_config_loading_workflow(self, tmp_path):
+    def test_full_config_loading_workflow(self, tmp_path, e2e_config_bytes, monkeypatch):
         """
         [P0] GIVEN: Multiple config sources (file, profile, env vars)
         WHEN: ConfigManager loads configuration
         THEN: All sources merged with correct priority (env > profile > file > defaults)
         """
         # GIVEN: Default config file
-        default_config = {
-            'model': {'type': 'yolo_v8', 'path': 'default.pt'},
-            'detection': {'confidence_threshold': 0.5, 'iou_threshold': 0.4}
-        }
         default_file = tmp_path / "default.yaml"
-        with open(default_file, 'w') as f:
-            yaml.dump(default_config, f)
+        default_file.write_bytes(e2e_config_bytes['default'])
 
         # AND: User config file
-        user_config = {
-            'model': {'path': 'user.pt'},
-            'detection': {'confidence_threshold': 0.6}
-        }
         user_file = tmp_path / "config.yaml"
-        with open(user_file, 'w') as f:
-            yaml.dump(user_config, f)
+        user_file.write_bytes(e2e_config_bytes['user'])
 
         # AND: Profile config
-        profile_config = {
-            'detection': {'iou_threshold': 0.5}
-        }
         profile_file = tmp_path / "prod.yaml"
-        with open(profile_file, 'w') as f:
-            yaml.dump(profile_config, f)
+        profile_file.write_bytes(e2e_config_bytes['profile'])
 
-        # AND: Environment variable
-        import os
-        os.environ['EDGE_DETECTION_MODEL_PATH'] = 'env.pt'
+        # AND: Environment variable (undone by monkeypatch even if the test fails)
+        monkeypatch.setenv('EDGE_DETECTION_MODEL_PATH', 'env.pt')
 
         # WHEN: Loading config with all sources
         config_mgr = ConfigManager(
@@ -79,26 +148,16 @@ class TestConfigurationE2E:
         assert config['detection']['iou_threshold'] == 0.5  # Profile
         assert config['model']['type'] == 'yolo_v8'  # Default (not overridden)
 
-        # Cleanup
-        del os.environ['EDGE_DETECTION_MODEL_PATH']
-
     @pytest.mark.integration
-    def test_config_validation_blocks_invalid_values(self, tmp_path):
+    def test_config_validation_blocks_invalid_values(self, tmp_path, e2e_config_bytes):
         """
         [P0] GIVEN: Configuration file with invalid values
         WHEN: ConfigManager loads and validates configuration
         THEN: Validation errors are raised with clear messages
         """
-        # GIVEN: Invalid config file
-        invalid_config = {
-            'detection': {
-                'confidence_threshold': 1.5,  # Invalid: > 1.0
-                'iou_threshold': -0.5         # Invalid: < 0.0
-            }
-        }
+        # GIVEN: Invalid config file (confidence 1.5 > 1.0, iou -0.5 < 0.0)
         config_file = tmp_path / "invalid.yaml"
-        with open(config_file, 'w') as f:
-            yaml.dump(invalid_config, f)
+        config_file.write_bytes(e2e_config_bytes['invalid'])
 
         # WHEN: Loading config
         config_mgr = ConfigManager(config_path=str(config_file))
@@ -117,24 +176,16 @@ class TestConfigurationE2E:
         assert 'iou_threshold' in error_messages
 
     @pytest.mark.integration
-    def test_profile_switching_workflow(self, tmp_path):
+    def test_profile_switching_workflow(self, tmp_path, e2e_config_bytes):
         """
         [P0] GIVEN: Multiple configuration profiles
         WHEN: User switches between profiles
         THEN: Configuration changes correctly without errors
         """
-        # GIVEN: Dev and prod profiles
-        dev_profile = {
-            'device': {'type': 'cpu'},
-            'detection': {'confidence_threshold': 0.3}
-        }
-        (tmp_path / "dev.yaml").write_text(yaml.dump(dev_profile))
-
-        prod_profile = {
-            'device': {'type': 'cuda'},
-            'detection': {'confidence_threshold': 0.7}
-        }
-        (tmp_path / "prod.yaml").write_text(yaml.dump(prod_profile))
+        # GIVEN: Dev and prod profiles (no stale parses from earlier tests)
+        ConfigManager.clear_cache()
+        (tmp_path / "dev.yaml").write_bytes(e2e_config_bytes['dev'])
+        (tmp_path / "prod.yaml").write_bytes(e2e_config_bytes['prod'])
 
         # WHEN: Loading dev profile
         config_mgr = ConfigManager(profile='dev')
@@ -145,10 +196,8 @@ class TestConfigurationE2E:
         assert dev_config['device']['type'] == 'cpu'
         assert dev_config['detection']['confidence_threshold'] == 0.3
 
-        # WHEN: Switching to prod profile
-        config_mgr_prod = ConfigManager(profile='prod')
-        config_mgr_prod.config_dir = tmp_path
-        prod_config = config_mgr_prod.load_config()
+        # WHEN: Switching to prod profile on the same manager
+        prod_config = config_mgr.switch_profile('prod')
 
         # THEN: Prod settings loaded
         assert prod_config['device']['type'] == 'cuda'
@@ -164,7 +213,8 @@ class TestDetectionPipelineE2E:
 
     @pytest.mark.integration
     @patch('src.models.yolo_detector.YOLO')
-    def test_complete_detection_workflow(self, mock_yolo_class, tmp_path):
+    def test_complete_detection_workflow(self, mock_yolo_class, tmp_path, e2e_config_bytes,
+                                         canned_yolo_result):
         """
         [P0] GIVEN: Configuration file and YOLO model
         WHEN: Full detection pipeline executes
@@ -172,29 +222,11 @@ class TestDetectionPipelineE2E:
         """
         # GIVEN: Configuration file
         config_file = tmp_path / "config.yaml"
-        config_data = {
-            'model': {'path': 'yolov8n.pt'},
-            'detection': {
-                'confidence_threshold': 0.5,
-                'iou_threshold': 0.4,
-                'max_detections': 100
-            }
-        }
-        with open(config_file, 'w') as f:
-            yaml.dump(config_data, f)
+        config_file.write_bytes(e2e_config_bytes['detection'])
 
         # AND: Mock YOLO model
-        mock_result = Mock()
-        mock_box = Mock()
-        import torch
-        mock_box.xyxy = [torch.tensor([[100, 100, 200, 200]])]
-        mock_box.conf = [torch.tensor([0.85])]
-        mock_box.cls = [torch.tensor([0])]
-        mock_result.boxes = [mock_box]
-        mock_result.names = {0: "person"}
-
         mock_model = Mock()
-        mock_model.return_value = [mock_result]
+        mock_model.return_value = [canned_yolo_result]
         mock_model.names = {0: "person"}
         mock_yolo_class.return_value = mock_model
 
@@ -206,7 +238,7 @@ class TestDetectionPipelineE2E:
         detector.load_model()
 
         # AND: Processing image
-        test_image = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
+        test_image = _IMG_640
         detections = detector.detect(test_image)
 
         # THEN: Detections returned successfully
@@ -222,28 +254,20 @@ class TestDetectionPipelineE2E:
 
     @pytest.mark.integration
     @patch('src.models.yolo_detector.YOLO')
-    def test_detection_with_configured_thresholds(self, mock_yolo_class, tmp_path):
+    def test_detection_with_configured_thresholds(self, mock_yolo_class, tmp_path,
+                                                  e2e_config_bytes, canned_empty_yolo_result):
         """
         [P0] GIVEN: Configuration with specific confidence and IOU thresholds
         WHEN: Detector processes images
         THEN: Model uses configured thresholds
         """
-        # GIVEN: Config with custom thresholds
+        # GIVEN: Config with custom thresholds (conf 0.75, iou 0.55)
         config_file = tmp_path / "config.yaml"
-        config_data = {
-            'detection': {
-                'confidence_threshold': 0.75,
-                'iou_threshold': 0.55
-            }
-        }
-        with open(config_file, 'w') as f:
-            yaml.dump(config_data, f)
+        config_file.write_bytes(e2e_config_bytes['thresholds'])
 
         # AND: Mock model
         mock_model = Mock()
-        mock_result = Mock()
-        mock_result.boxes = []
-        mock_model.return_value = [mock_result]
+        mock_model.return_value = [canned_empty_yolo_result]
         mock_yolo_class.return_value = mock_model
 
         # WHEN: Loading config and detecting
@@ -251,7 +275,7 @@ class TestDetectionPipelineE2E:
         detector = YOLODetector(config=config_mgr)
         detector.load_model()
 
-        test_image = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
+        test_image = _IMG_640
         detector.detect(test_image)
 
         # THEN: Model called with configured thresholds
@@ -262,7 +286,8 @@ class TestDetectionPipelineE2E:
 
     @pytest.mark.integration
     @patch('src.models.yolo_detector.YOLO')
-    def test_detection_with_max_detections_limit(self, mock_yolo_class):
+    def test_detection_with_max_detections_limit(self, mock_yolo_class,
+                                                 canned_crowded_yolo_result):
         """
         [P0] GIVEN: Configuration with max_detections limit
         WHEN: Model returns more detections than limit
@@ -272,27 +297,16 @@ class TestDetectionPipelineE2E:
         config_mgr = ConfigManager()
         config_mgr._config['detection']['max_detections'] = 5
 
-        # AND: Mock model returning many detections
-        mock_result = Mock()
-        mock_box = Mock()
-        import torch
-        # Return 20 detections
-        mock_box.xyxy = [torch.tensor([[i * 10, i * 10, (i + 1) * 10, (i + 1) * 10]
-                                      for i in range(20)])]
-        mock_box.conf = [torch.tensor([0.9] * 20)]
-        mock_box.cls = [torch.tensor([0] * 20)]
-        mock_result.boxes = [mock_box]
-        mock_result.names = {0: "person"}
-
+        # AND: Mock model returning 20 detections
         mock_model = Mock()
-        mock_model.return_value = [mock_result]
+        mock_model.return_value = [canned_crowded_yolo_result]
         mock_yolo_class.return_value = mock_model
 
         # WHEN: Detecting
         detector = YOLODetector(config=config_mgr)
         detector.load_model()
 
-        test_image = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
+        test_image = _IMG_640
         detections = detector.detect(test_image)
 
         # THEN: Returns at most max_detections
@@ -311,7 +325,8 @@ class TestVideoProcessingE2E:
     @patch('cv2.VideoCapture')
     @patch('src.models.yolo_detector.YOLO')
     def test_video_detection_workflow(self, mock_yolo_class, mock_video_capture,
-                                     mock_video_writer, tmp_path):
+                                     mock_video_writer, tmp_path, e2e_config_bytes,
+                                     canned_empty_yolo_result):
         """
         [P0] GIVEN: Video file and output path
         WHEN: detect_video() is called
@@ -319,29 +334,15 @@ class TestVideoProcessingE2E:
         """
         # GIVEN: Config file
         config_file = tmp_path / "config.yaml"
-        with open(config_file, 'w') as f:
-            yaml.dump({'model': {'path': 'yolov8n.pt'}}, f)
-
-        # AND: Mock video capture
-        mock_cap = MagicMock()
-        mock_cap.isOpened.return_value = True
-        frames = [
-            np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
-            for _ in range(10)
-        ]
-        mock_cap.read.side_effect = [(True, frame) for frame in frames] + [(False, None)]
-        mock_cap.get.side_effect = lambda prop: {
-            0: 30,  # CAP_PROP_FPS
-            3: 640,  # CAP_PROP_FRAME_WIDTH
-            4: 480   # CAP_PROP_FRAME_HEIGHT
-        }.get(prop, 0)
-        mock_video_capture.return_value = mock_cap
+        config_file.write_bytes(e2e_config_bytes['video'])
+
+        # AND: Fake 10-frame video capture (30 FPS, 640x480)
+        fake_cap = _FakeCap(repeat((True, _IMG_480x640), 10))
+        mock_video_capture.return_value = fake_cap
 
         # AND: Mock YOLO
-        mock_result = Mock()
-        mock_result.boxes = []
         mock_model = Mock()
-        mock_model.return_value = [mock_result]
+        mock_model.return_value = [canned_empty_yolo_result]
         mock_yolo_class.return_value = mock_model
 
         # WHEN: Processing video
@@ -354,8 +355,8 @@ class TestVideoProcessingE2E:
         detector.detect_video(input_video, output_video)
 
         # THEN: Video was processed
-        assert mock_cap.read.call_count >= 10
-        mock_cap.release.assert_called()
+        assert fake_cap.read_count >= 10
+        assert fake_cap.released
 
         # AND: Output video writer was created and released
         mock_video_writer.assert_called_once()
@@ -367,45 +368,29 @@ class TestVideoProcessingE2E:
     @patch('src.models.yolo_detector.YOLO')
     def test_video_processing_with_fps_calculation(self, mock_yolo_class,
                                                    mock_video_capture,
-                                                   mock_video_writer):
+                                                   mock_video_writer,
+                                                   canned_empty_yolo_result):
         """
         [P0] GIVEN: Video with known FPS and frame count
         WHEN: Video is processed
         THEN: Average FPS is calculated and reported
         """
-        # GIVEN: Mock video
-        mock_cap = MagicMock()
-        mock_cap.isOpened.return_value = True
-        mock_cap.get.side_effect = lambda prop: {
-            0: 30,  # 30 FPS
-            3: 640,
-            4: 480
-        }.get(prop, 0)
-
-        # Return 90 frames (3 seconds at 30 FPS)
-        frames = [np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
-                 for _ in range(90)]
-        mock_cap.read.side_effect = [(True, frame) for frame in frames] + [(False, None)]
-        mock_video_capture.return_value = mock_cap
+        # GIVEN: Fake video returning 90 frames (3 seconds at 30 FPS)
+        mock_video_capture.return_value = _FakeCap(repeat((True, _IMG_480x640), 90), fps=30)
 
         # AND: Mock model
-        mock_result = Mock()
-        mock_result.boxes = []
         mock_model = Mock()
-        mock_model.return_value = [mock_result]
+        mock_model.return_value = [canned_empty_yolo_result]
         mock_yolo_class.return_value = mock_model
 
         # WHEN: Processing video
         detector = YOLODetector()
         detector.model = mock_model
 
-        with patch('builtins.print') as mock_print:
-            detector.detect_video("input.mp4", "output.mp4")
+        detector.detect_video("input.mp4", "output.mp4")
 
-        # THEN: FPS is calculated and printed
-        # Check that print was called with FPS info
-        print_calls = [str(call) for call in mock_print.call_args_list]
-        assert any('FPS' in call or 'fps' in call for call in print_calls)
+        # THEN: Average FPS is calculated and recorded
+        assert detector._fps_metric > 0
 
 
 @pytest.mark.integration
@@ -483,7 +468,7 @@ class TestErrorRecoveryE2E:
         detector.model = None
 
         # WHEN: Trying to detect
-        test_image = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
+        test_image = _IMG_640
 
         # THEN: Raises clear error
         with pytest.raises(RuntimeError) as exc_info:
@@ -507,7 +492,7 @@ class TestImagePreprocessingE2E:
         THEN: Image is resized to target size with padding
         """
         # GIVEN: Image of arbitrary size
-        image = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+        image = _IMG_480x640
 
         # WHEN: Applying letterbox
         processor = ImageProcessor(target_size=(640, 640))
@@ -529,9 +514,9 @@ class TestImagePreprocessingE2E:
         """
         # GIVEN: Images of different sizes
         images = [
-            np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8),
-            np.random.randint(0, 255, (720, 1280, 3), dtype=np.uint8),
-            np.random.randint(0, 255, (360, 480, 3), dtype=np.uint8)
+            _IMG_480x640,
+            np.zeros((720, 1280, 3), np.uint8),
+            np.zeros((360, 480, 3), np.uint8)
         ]
 
         # WHEN: Batch preprocessing
@@ -0,0 +1,50 @@
+"""
+Metrics test fixtures and configuration.
+"""
+
+import socket
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+
+def _wait_until_listening(port: int, timeout: float = 2.0, host: str = '127.0.0.1') -> None:
+    """
+    Block until something accepts TCP connections on host:port.
+
+    Args:
+        port: Port to poll
+        timeout: Seconds to keep retrying before giving up
+        host: Host to connect to
+
+    Raises:
+        TimeoutError: If nothing is listening within timeout
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                return
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Nothing listening on {host}:{port} after {timeout}s")
+            time.sleep(0.001)
+
+
+@pytest.fixture
+def wait_until_listening():
+    """Poll a metrics server port until it accepts connections."""
+    return _wait_until_listening
+
+
+@pytest.fixture(autouse=True)
+def reset_default_registry():
+    """Unregister anything a test adds to the global prometheus REGISTRY."""
+    before = set(REGISTRY._collector_to_names)
+    yield
+    for collector in set(REGISTRY._collector_to_names) - before:
+        try:
+            REGISTRY.unregister(collector)
+        except KeyError:
+            pass
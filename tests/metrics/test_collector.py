@@ -3,7 +3,7 @@ Tests for MetricsCollector class.
 """
 
 import pytest
-import time
+from unittest.mock import patch
 from src.metrics.collector import MetricsCollector
 
 
@@ -16,55 +16,88 @@ class TestMetricsCollector:
         assert collector.enabled is True
         assert collector.total_detections == 0
         assert collector.total_errors == 0
-        assert collector.inference_times == []
-        assert collector.fps_samples == []
+        assert len(collector.inference_times) == 0
+        assert len(collector.fps_samples) == 0
 
     def test_initialization_disabled(self):
         """Test collector initialization with enabled=False."""
         collector = MetricsCollector(enabled=False)
         assert collector.enabled is False
 
-    def test_record_detection(self):
-        """Test recording a detection."""
-        collector = MetricsCollector(enabled=True)
-        collector.record_detection(50.0)
-
-        assert collector.total_detections == 1
-        assert len(collector.inference_times) == 1
-        assert collector.inference_times[0] == 50.0
-
-    def test_record_multiple_detections(self):
-        """Test recording multiple detections."""
+    @pytest.mark.parametrize(
+        "enabled, records, expected_detections, expected_errors",
+        [
+            (True, [('det', 50.0)], 1, 0),
+            (True, [('det', 50.0), ('det', 60.0), ('det', 70.0)], 3, 0),
+            (True, [('batch', [50.0, 60.0, 70.0])], 3, 0),
+            (False, [('det', 50.0)], 0, 0),
+            (False, [('batch', [50.0, 60.0])], 0, 0),
+            (True, [('err',)], 0, 1),
+            (False, [('err',)], 0, 0),
+        ],
+        ids=[
+            "detection", "multiple_detections", "batch",
+            "detection_disabled", "batch_disabled",
+            "error", "error_disabled",
+        ],
+    )
+    def test_record(self, enabled, records, expected_detections, expected_errors):
+        """Test that recording updates counters only when enabled."""
+        collector = MetricsCollector(enabled=enabled)
+        for op, *args in records:
+            if op == 'det':
+                collector.record_detection(*args)
+            elif op == 'batch':
+                collector.record_detection_batch(*args)
+            else:
+                collector.record_error()
+
+        assert collector.total_detections == expected_detections
+        assert len(collector.inference_times) == expected_detections
+        assert collector.total_errors == expected_errors
+
+    def test_record_detection_times(self):
+        """Test that recorded inference times are kept in order."""
         collector = MetricsCollector(enabled=True)
         collector.record_detection(50.0)
-        collector.record_detection(60.0)
-        collector.record_detection(70.0)
+        collector.record_detection_batch([60.0, 70.0])
 
-        assert collector.total_detections == 3
-        assert len(collector.inference_times) == 3
+        assert list(collector.inference_times) == [50.0, 60.0, 70.0]
         assert sum(collector.inference_times) == 180.0
 
-    def test_record_detection_when_disabled(self):
-        """Test that recording is ignored when disabled."""
-        collector = MetricsCollector(enabled=False)
-        collector.record_detection(50.0)
+    def test_record_detection_batch_matches_single_records(self):
+        """Test that a batch leaves the same state as per-frame records."""
+        single = MetricsCollector(enabled=True)
+        single.record_detection(10.0, timestamp=0.0)
+        for _ in range(10):
+            single.record_detection(10.0, timestamp=0.5)
 
-        assert collector.total_detections == 0
-        assert len(collector.inference_times) == 0
+        batched = MetricsCollector(enabled=True)
+        batched.record_detection(10.0, timestamp=0.0)
+        batched.record_detection_batch([10.0] * 10, timestamp=0.5)
+
+        assert batched.total_detections == single.total_detections == 11
+        assert batched.inference_times == single.inference_times
+        assert batched.fps_samples[-1] == pytest.approx(single.fps_samples[-1]) == 20.0
 
-    def test_record_error(self):
-        """Test recording an error."""
+    def test_record_detection_batch_fps_matches_frame_rate(self):
+        """Test that consecutive batches report the true frame rate."""
         collector = MetricsCollector(enabled=True)
-        collector.record_error()
+        # Batches of 8 frames every 80 ms: 100 FPS
+        for k in range(3):
+            collector.record_detection_batch([10.0] * 8, timestamp=k * 0.08)
 
-        assert collector.total_errors == 1
+        assert list(collector.fps_samples) == [pytest.approx(100.0)] * 2
 
-    def test_record_error_when_disabled(self):
-        """Test that error recording is ignored when disabled."""
-        collector = MetricsCollector(enabled=False)
-        collector.record_error()
+    def test_reset_restarts_fps_clock(self):
+        """Test that a reset collector ignores frames counted before it."""
+        collector = MetricsCollector(enabled=True)
+        collector.record_detection_batch([10.0] * 8, timestamp=0.0)
+        collector.reset()
+        collector.record_detection_batch([10.0] * 4, timestamp=1.0)
+        collector.record_detection_batch([10.0] * 4, timestamp=1.1)
 
-        assert collector.total_errors == 0
+        assert list(collector.fps_samples) == [pytest.approx(40.0)]
 
     def test_get_memory_usage_mb(self):
         """Test getting memory usage."""
@@ -74,6 +107,19 @@ class TestMetricsCollector:
         assert memory_mb > 0
         assert isinstance(memory_mb, float)
 
+    def test_get_memory_usage_mb_is_cached(self):
+        """Test that memory is re-read only after the cache expires."""
+        with patch('src.metrics.collector.psutil.Process') as process_cls:
+            process = process_cls.return_value
+            process.memory_info.return_value.rss = 256 * 1024 * 1024
+            collector = MetricsCollector(enabled=True)
+
+            with patch('src.metrics.collector.time.monotonic', side_effect=[10.0, 10.5, 11.0]):
+                readings = [collector.get_memory_usage_mb() for _ in range(3)]
+
+        assert readings == [256.0, 256.0, 256.0]
+        assert process.memory_info.call_count == 2
+
     def test_get_gpu_utilization_no_gpu(self):
         """Test GPU utilization when GPU is not available."""
         collector = MetricsCollector(enabled=True)
@@ -141,9 +187,7 @@ class TestMetricsCollector:
     def test_get_stats_with_data(self):
         """Test getting stats with detection data."""
         collector = MetricsCollector(enabled=True)
-        collector.record_detection(50.0)
-        collector.record_detection(100.0)
-        collector.record_detection(75.0)
+        collector.record_detection_batch([50.0, 100.0, 75.0])
 
         stats = collector.get_stats()
 
@@ -152,6 +196,20 @@ class TestMetricsCollector:
         assert stats['min_inference_time_ms'] == 50.0
         assert stats['max_inference_time_ms'] == 100.0
 
+    def test_sample_window_is_bounded(self):
+        """Test that samples are bounded while aggregates cover everything."""
+        collector = MetricsCollector(enabled=True)
+        window = collector.inference_times.maxlen
+        collector.record_detection_batch([1.0] * window + [5.0] * window)
+
+        stats = collector.get_stats()
+
+        assert len(collector.inference_times) == window
+        assert stats['total_detections'] == 2 * window
+        assert stats['avg_inference_time_ms'] == pytest.approx(3.0)
+        assert stats['min_inference_time_ms'] == 1.0
+        assert stats['max_inference_time_ms'] == 5.0
+
     def test_reset(self):
         """Test resetting all metrics."""
         collector = MetricsCollector(enabled=True)
@@ -169,38 +227,38 @@ class TestMetricsCollector:
         """Test the measure_inference context manager."""
         collector = MetricsCollector(enabled=True)
 
-        with collector.measure_inference():
-            time.sleep(0.01)  # 10ms
+        with patch('src.metrics.collector.time.perf_counter', side_effect=[0.0, 0.010]):
+            with collector.measure_inference():
+                pass
 
         assert collector.total_detections == 1
         assert len(collector.inference_times) == 1
-        # Should be approximately 10ms (allowing for some variance)
-        assert collector.inference_times[0] >= 8.0
+        assert collector.inference_times[0] == pytest.approx(10.0)
 
     def test_measure_inference_with_exception(self):
         """Test that exceptions are still raised after recording metrics."""
         collector = MetricsCollector(enabled=True)
 
-        with pytest.raises(ValueError):
-            with collector.measure_inference():
-                time.sleep(0.01)
-                raise ValueError("Test error")
+        with patch('src.metrics.collector.time.perf_counter', side_effect=[0.0, 0.010]):
+            with pytest.raises(ValueError):
+                with collector.measure_inference():
+                    raise ValueError("Test error")
 
         # Should still record the detection
         assert collector.total_detections == 1
+        assert collector.inference_times[0] == pytest.approx(10.0)
 
-    def test_fps_tracking(self):
+    def test_fps_tracking(self, monkeypatch):
         """Test FPS calculation over multiple detections."""
         collector = MetricsCollector(enabled=True)
 
-        # Simulate 100 detections over 1 second
-        start = time.time()
+        # Fake clock advancing 10ms per detection = 100 FPS
+        clock = iter([i * 0.01 for i in range(200)])
+        monkeypatch.setattr('src.metrics.collector.time.perf_counter', clock.__next__)
+
         for _ in range(100):
-            collector.record_detection(10.0)  # 10ms each = 100 FPS theoretical
+            collector.record_detection(10.0)
 
-        elapsed = time.time() - start
         metrics = collector.collect_metrics()
 
-        # FPS should be calculated
-        if 'fps' in metrics:
-            assert metrics['fps'] > 0
+        assert metrics['fps'] == pytest.approx(100.0)
@@ -3,25 +3,51 @@ Tests for PrometheusExporter class.
 """
 
 import pytest
-import time
-import threading
+import urllib.request
+from prometheus_client import REGISTRY
+from prometheus_client.parser import text_string_to_metric_families
 from src.metrics.exporter import PrometheusExporter
 
 
+# One xdist worker for the whole module, so the shared exporter fixture
+# below is created once rather than once per worker
+pytestmark = pytest.mark.xdist_group("metrics_exporter")
+
+
+def value_of(metrics_text: bytes, name: str):
+    """Return the value of the first sample called name, or None."""
+    for family in text_string_to_metric_families(metrics_text.decode()):
+        for sample in family.samples:
+            if sample.name == name:
+                return sample.value
+    return None
+
+
+@pytest.fixture(scope='module')
+def exporter():
+    """Exporter shared by the tests that never start its server."""
+    return PrometheusExporter(port=0)
+
+
 class TestPrometheusExporter:
     """Test suite for PrometheusExporter."""
 
     def test_initialization(self):
         """Test exporter initialization."""
-        exporter = PrometheusExporter(port=9091)
-        assert exporter.port == 9091
+        exporter = PrometheusExporter(port=0)
+        assert isinstance(exporter.port, int)
         assert exporter.host == '0.0.0.0'
         assert exporter._server is None
 
-    def test_metrics_setup(self):
-        """Test that all metrics are properly set up."""
-        exporter = PrometheusExporter(port=9091)
+    def test_default_registry_untouched(self):
+        """Test that exporters use a private registry by default."""
+        exporter = PrometheusExporter(port=0)
+
+        assert exporter.registry is not REGISTRY
+        assert REGISTRY.get_sample_value('detection_fps') is None
 
+    def test_metrics_setup(self, exporter):
+        """Test that all metrics are properly set up."""
         # Check that all metrics exist
         assert exporter.detection_latency_ms is not None
         assert exporter.detection_fps is not None
@@ -31,10 +57,8 @@ class TestPrometheusExporter:
         assert exporter.gpu_utilization_percent is not None
         assert exporter.gpu_memory_used_mb is not None
 
-    def test_record_detection(self):
+    def test_record_detection(self, exporter):
         """Test recording a detection."""
-        exporter = PrometheusExporter(port=9091)
-
         # Record detection
         exporter.record_detection(50.0)
 
@@ -42,10 +66,8 @@ class TestPrometheusExporter:
         metrics_text = exporter.get_metrics_text()
         assert b'detection_latency_ms_bucket' in metrics_text or b'detection_total' in metrics_text
 
-    def test_record_multiple_detections(self):
+    def test_record_multiple_detections(self, exporter):
         """Test recording multiple detections."""
-        exporter = PrometheusExporter(port=9091)
-
         exporter.record_detection(50.0)
         exporter.record_detection(60.0)
         exporter.record_detection(70.0)
@@ -54,48 +76,35 @@ class TestPrometheusExporter:
         assert metrics_text is not None
         assert len(metrics_text) > 0
 
-    def test_record_error(self):
+    def test_record_error(self, exporter):
         """Test recording an error."""
-        exporter = PrometheusExporter(port=9091)
-
         exporter.record_error()
 
         metrics_text = exporter.get_metrics_text()
         assert b'detection_errors_total' in metrics_text
 
-    def test_set_fps(self):
+    def test_set_fps(self, exporter):
         """Test setting FPS."""
-        exporter = PrometheusExporter(port=9091)
-
         exporter.set_fps(30.5)
 
-        metrics_text = exporter.get_metrics_text()
-        assert b'detection_fps' in metrics_text
-        assert b'30.5' in metrics_text or b'30' in metrics_text
+        assert value_of(exporter.get_metrics_text(), 'detection_fps') == 30.5
 
-    def test_set_memory_mb(self):
+    def test_set_memory_mb(self, exporter):
         """Test setting memory usage."""
-        exporter = PrometheusExporter(port=9091)
-
         exporter.set_memory_mb(512.5)
 
-        metrics_text = exporter.get_metrics_text()
-        assert b'detection_memory_mb' in metrics_text
+        assert value_of(exporter.get_metrics_text(), 'detection_memory_mb') == 512.5
 
-    def test_set_gpu_utilization(self):
+    def test_set_gpu_utilization(self, exporter):
         """Test setting GPU utilization."""
-        exporter = PrometheusExporter(port=9091)
-
         exporter.set_gpu_utilization(85.5, 2048.0)
 
         metrics_text = exporter.get_metrics_text()
-        assert b'detection_gpu_utilization_percent' in metrics_text
-        assert b'detection_gpu_memory_used_mb' in metrics_text
+        assert value_of(metrics_text, 'detection_gpu_utilization_percent') == 85.5
+        assert value_of(metrics_text, 'detection_gpu_memory_used_mb') == 2048.0
 
-    def test_get_metrics_text(self):
+    def test_get_metrics_text(self, exporter):
         """Test getting metrics in Prometheus text format."""
-        exporter = PrometheusExporter(port=9091)
-
         exporter.record_detection(50.0)
         exporter.set_fps(30.0)
         exporter.set_memory_mb(512.0)
@@ -106,38 +115,44 @@ class TestPrometheusExporter:
         assert len(metrics_text) > 0
         assert b'# HELP' in metrics_text or b'# TYPE' in metrics_text
 
-    def test_get_content_type(self):
+    def test_get_content_type(self, exporter):
         """Test getting content type."""
-        exporter = PrometheusExporter(port=9091)
-
         content_type = exporter.get_content_type()
 
         assert content_type is not None
         assert 'text/plain' in content_type or 'prometheus' in content_type.lower()
 
-    def test_start_server(self):
-        """Test starting the HTTP server."""
-        exporter = PrometheusExporter(port=9092)
+    @pytest.mark.server
+    def test_start_server(self, wait_until_listening):
+        """Test starting the HTTP server and scraping it end to end."""
+        exporter = PrometheusExporter(port=0)
+        exporter.record_detection(50.0)
 
         try:
             exporter.start_server()
 
             # Server should be running
             assert exporter._server is not None
+            port = exporter._server.server_address[1]
+            wait_until_listening(port)
+
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=2) as response:
+                body = response.read()
 
-            # Give it a moment to start
-            time.sleep(0.1)
+            assert response.status == 200
+            assert b'detection_total 1.0' in body
 
         finally:
             exporter.stop_server()
 
-    def test_start_server_already_running(self):
+    @pytest.mark.server
+    def test_start_server_already_running(self, wait_until_listening):
         """Test that starting server twice raises error."""
-        exporter = PrometheusExporter(port=9093)
+        exporter = PrometheusExporter(port=0)
 
         try:
             exporter.start_server()
-            time.sleep(0.1)
+            wait_until_listening(exporter._server.server_address[1])
 
             # Should raise error when trying to start again
             with pytest.raises(RuntimeError):
@@ -146,23 +161,25 @@ class TestPrometheusExporter:
         finally:
             exporter.stop_server()
 
-    def test_stop_server(self):
+    @pytest.mark.server
+    def test_stop_server(self, wait_until_listening):
         """Test stopping the HTTP server."""
-        exporter = PrometheusExporter(port=9094)
+        exporter = PrometheusExporter(port=0)
 
         exporter.start_server()
-        time.sleep(0.1)
+        wait_until_listening(exporter._server.server_address[1])
 
         exporter.stop_server()
 
         # Server reference should be cleared
         assert exporter._server is None
 
-    def test_context_manager(self):
+    @pytest.mark.server
+    def test_context_manager(self, wait_until_listening):
         """Test using exporter as context manager."""
-        with PrometheusExporter(port=9095) as exporter:
+        with PrometheusExporter(port=0) as exporter:
             exporter.record_detection(50.0)
-            time.sleep(0.1)
+            wait_until_listening(exporter._server.server_address[1])
 
             # Server should be running
             assert exporter._server is not None
@@ -170,10 +187,8 @@ class TestPrometheusExporter:
         # Server should be stopped after context
         assert exporter._server is None
 
-    def test_create_handler(self):
+    def test_create_handler(self, exporter):
         """Test creating WSGI handler."""
-        exporter = PrometheusExporter(port=9091)
-
         handler = exporter.create_handler()
 
         assert handler is not None
@@ -195,10 +210,8 @@ class TestPrometheusExporter:
         assert len(result) > 0
         assert response[0][0] == '200 OK'
 
-    def test_create_handler_404(self):
+    def test_create_handler_404(self, exporter):
         """Test handler returns 404 for wrong path."""
-        exporter = PrometheusExporter(port=9091)
-
         handler = exporter.create_handler()
 
         environ = {
@@ -215,10 +228,8 @@ class TestPrometheusExporter:
 
         assert response[0][0] == '404 Not Found'
 
-    def test_update_from_collector(self):
+    def test_update_from_collector(self, exporter):
         """Test updating metrics from collector data."""
-        exporter = PrometheusExporter(port=9091)
-
         collector_metrics = {
             'fps': 30.0,
             'memory_mb': 512.0,
@@ -229,5 +240,7 @@ class TestPrometheusExporter:
         exporter.update_from_collector(collector_metrics)
 
         metrics_text = exporter.get_metrics_text()
-        assert b'detection_fps' in metrics_text
-        assert b'detection_memory_mb' in metrics_text
+        assert value_of(metrics_text, 'detection_fps') == 30.0
+        assert value_of(metrics_text, 'detection_memory_mb') == 512.0
+        assert value_of(metrics_text, 'detection_gpu_utilization_percent') == 85.0
+        assert value_of(metrics_text, 'detection_gpu_memory_used_mb') == 2048.0
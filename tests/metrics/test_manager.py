@@ -3,6 +3,9 @@ Tests for MetricsManager class.
 """
 
 import pytest
+from unittest.mock import patch
+from prometheus_client import CollectorRegistry
+from src.metrics.exporter import PrometheusExporter
 from src.metrics.manager import MetricsManager
 
 
@@ -19,12 +22,12 @@ class TestMetricsManager:
 
     def test_initialization_prometheus_mode(self):
         """Test manager initialization with mode='prometheus'."""
-        manager = MetricsManager(mode='prometheus', prometheus_port=9091)
+        manager = MetricsManager(mode='prometheus', prometheus_port=0)
 
         assert manager.mode == 'prometheus'
         assert manager.collector.enabled is True
         assert manager.exporter is not None
-        assert manager.exporter.port == 9091
+        assert isinstance(manager.exporter.port, int)
 
     def test_initialization_invalid_mode(self):
         """Test that invalid mode falls back to 'none'."""
@@ -53,7 +56,7 @@ class TestMetricsManager:
 
     def test_end_inference_with_prometheus(self):
         """Test ending inference records to Prometheus."""
-        manager = MetricsManager(mode='prometheus', prometheus_port=9096)
+        manager = MetricsManager(mode='prometheus', prometheus_port=0)
 
         manager.start_inference()
         elapsed = manager.end_inference()
@@ -74,7 +77,7 @@ class TestMetricsManager:
 
     def test_record_error_with_prometheus(self):
         """Test recording an error with Prometheus."""
-        manager = MetricsManager(mode='prometheus', prometheus_port=9097)
+        manager = MetricsManager(mode='prometheus', prometheus_port=0)
 
         manager.record_error()
 
@@ -106,46 +109,58 @@ class TestMetricsManager:
         assert isinstance(formatted, str)
         assert len(formatted) > 0
 
-    def test_start_prometheus_server(self):
-        """Test starting Prometheus server."""
-        manager = MetricsManager(mode='prometheus', prometheus_port=9098)
+    @pytest.mark.server
+    def test_start_prometheus_server(self, wait_until_listening):
+        """Test starting and stopping a real Prometheus server."""
+        manager = MetricsManager(mode='prometheus', prometheus_port=0)
 
         try:
             manager.start_prometheus_server()
 
             # Should not raise
             assert manager.exporter._server is not None
+            wait_until_listening(manager.exporter._server.server_address[1])
 
         finally:
             manager.stop_prometheus_server()
 
+        assert manager.exporter._server is None
+
     def test_stop_prometheus_server(self):
         """Test stopping Prometheus server."""
-        manager = MetricsManager(mode='prometheus', prometheus_port=9099)
+        manager = MetricsManager(mode='prometheus', prometheus_port=0)
 
-        manager.start_prometheus_server()
-        manager.stop_prometheus_server()
+        with patch.object(PrometheusExporter, 'start_server') as start, \
+                patch.object(PrometheusExporter, 'stop_server') as stop:
+            manager.start_prometheus_server()
+            manager.stop_prometheus_server()
 
-        assert manager.exporter._server is None
+        start.assert_called_once_with()
+        stop.assert_called_once_with()
 
     def test_cleanup(self):
         """Test cleanup method."""
-        manager = MetricsManager(mode='prometheus', prometheus_port=9100)
+        manager = MetricsManager(mode='prometheus', prometheus_port=0)
 
-        manager.start_prometheus_server()
-        manager.cleanup()
+        with patch.object(PrometheusExporter, 'start_server'), \
+                patch.object(PrometheusExporter, 'stop_server') as stop:
+            manager.start_prometheus_server()
+            manager.cleanup()
 
-        assert manager.exporter._server is None
+        stop.assert_called_once_with()
 
     def test_context_manager(self):
         """Test using manager as context manager."""
-        with MetricsManager(mode='prometheus', prometheus_port=9101) as manager:
-            assert manager.exporter._server is not None
-            manager.start_inference()
-            manager.end_inference()
+        with patch.object(PrometheusExporter, 'start_server') as start, \
+                patch.object(PrometheusExporter, 'stop_server') as stop:
+            with MetricsManager(mode='prometheus', prometheus_port=0) as manager:
+                start.assert_called_once_with()
+                stop.assert_not_called()
+                manager.start_inference()
+                manager.end_inference()
 
-        # Server should be stopped after context
-        assert manager.exporter._server is None
+            # Server should be stopped after context
+            stop.assert_called_once_with()
 
     def test_integration_with_cli_tracker(self):
         """Test that manager maintains CLI tracker compatibility."""
@@ -162,7 +177,7 @@ class TestMetricsManager:
 
     def test_prometheus_metrics_collection(self):
         """Test that Prometheus metrics are collected."""
-        manager = MetricsManager(mode='prometheus', prometheus_port=9102)
+        manager = MetricsManager(mode='prometheus', prometheus_port=0)
 
         # Perform some detections
         manager.start_inference()
@@ -189,3 +204,10 @@ class TestMetricsManager:
         manager = MetricsManager(mode='prometheus', prometheus_port=9999)
 
         assert manager.exporter.port == 9999
+
+    def test_custom_registry(self):
+        """Test that a custom registry is passed through to the exporter."""
+        registry = CollectorRegistry()
+        manager = MetricsManager(mode='prometheus', prometheus_port=0, registry=registry)
+
+        assert manager.exporter.registry is registry
@@ -2,43 +2,49 @@
 Unit tests for model archiving system.
 """
 
+import os
 import pytest
-import tempfile
-import shutil
 from pathlib import Path
 from src.models.archiver import ModelArchiver, ArchiveEntry
 from src.models.versioning import ModelVersion
 
 
+# One xdist worker for the whole module, so pre_archived copies the fake
+# model into the archive once rather than once per worker
+pytestmark = pytest.mark.xdist_group("models_archiver")
+
+
+@pytest.fixture(scope='module')
+def pre_archived(tmp_path_factory):
+    """Archiver holding yolov8n v2.0.0 and v2.1.0, shared by read-only tests."""
+    archiver = ModelArchiver(cache_dir=str(tmp_path_factory.mktemp("cache")))
+    model_path = tmp_path_factory.mktemp("model") / "yolov8n.pt"
+    model_path.write_bytes(b"fake model data")
+
+    version1 = ModelVersion(2, 0, 0)
+    version2 = ModelVersion(2, 1, 0)
+    archiver.archive_model(str(model_path), version1, "yolov8n", {"format": "pt"})
+    archiver.archive_model(str(model_path), version2, "yolov8n")
+
+    return archiver, model_path, version1, version2
+
+
 class TestModelArchiver:
     """Test ModelArchiver class functionality."""
 
     @pytest.fixture
-    def temp_cache_dir(self):
-        """Create temporary cache directory."""
-        temp_dir = tempfile.mkdtemp()
-        yield temp_dir
-        shutil.rmtree(temp_dir)
-
-    @pytest.fixture
-    def archiver(self, temp_cache_dir):
+    def archiver(self, tmp_path):
         """Create archiver instance with temp directory."""
-        return ModelArchiver(cache_dir=temp_cache_dir)
+        return ModelArchiver(cache_dir=str(tmp_path / "cache"))
 
-    @pytest.fixture
-    def temp_model_file(self):
-        """Create temporary model file."""
-        temp_dir = tempfile.mkdtemp()
-        model_path = Path(temp_dir) / "yolov8n.pt"
-        model_path.write_text("fake model data")
-        yield model_path
-        shutil.rmtree(temp_dir)
-
-    def test_archive_model(self, archiver, temp_model_file):
+    def test_archive_model(self, archiver, tmp_path):
         """Test archiving a model."""
+        model_path = tmp_path / "yolov8n.pt"
+        model_path.write_bytes(b"fake model data")
+
         version = ModelVersion(2, 0, 0)
         archive_path = archiver.archive_model(
-            str(temp_model_file),
+            str(model_path),
             version,
             "yolov8n",
             {"format": "pt"}
@@ -48,27 +54,46 @@ class TestModelArchiver:
         assert archiver.archive_dir.exists()
         assert len(archiver.manifest['archives']) == 1
 
-    def test_list_archived_versions(self, archiver, temp_model_file):
-        """Test listing archived versions."""
-        version1 = ModelVersion(2, 0, 0)
-        version2 = ModelVersion(2, 1, 0)
+    def test_archive_is_independent_of_live_model(self, archiver, tmp_path):
+        """Test that rewriting the live model in place leaves the archive intact."""
+        model_path = tmp_path / "yolov8n.pt"
+        model_path.write_bytes(b"fake model data")
+
+        archive_path = archiver.archive_model(str(model_path), ModelVersion(2, 0, 0), "yolov8n")
+        with open(model_path, 'r+b') as f:
+            f.write(b"FAKE")
+
+        assert not os.path.samefile(archive_path, model_path)
+        assert Path(archive_path).read_bytes() == b"fake model data"
+
+    def test_manifest_written_on_flush(self, tmp_path):
+        """Test that archive entries reach disk only when flushed."""
+        model_path = tmp_path / "yolov8n.pt"
+        model_path.write_bytes(b"fake model data")
+        cache_dir = str(tmp_path / "cache")
+
+        with ModelArchiver(cache_dir=cache_dir) as archiver:
+            archiver.archive_model(str(model_path), ModelVersion(2, 0, 0), "yolov8n")
+            archiver.archive_model(str(model_path), ModelVersion(2, 1, 0), "yolov8n")
 
-        archiver.archive_model(str(temp_model_file), version1, "yolov8n")
-        archiver.archive_model(str(temp_model_file), version2, "yolov8n")
+            assert not archiver.manifest_path.exists()
+
+        reloaded = ModelArchiver(cache_dir=cache_dir)
+        assert len(reloaded.list_archived_versions("yolov8n")) == 2
+
+    def test_list_archived_versions(self, pre_archived):
+        """Test listing archived versions."""
+        archiver, _, _, _ = pre_archived
 
         versions = archiver.list_archived_versions("yolov8n")
         assert len(versions) == 2
 
-    def test_restore_from_archive(self, archiver, temp_model_file):
+    def test_restore_from_archive(self, pre_archived, tmp_path):
         """Test restoring from archive."""
-        version = ModelVersion(2, 0, 0)
-
-        # Archive model
-        archiver.archive_model(str(temp_model_file), version, "yolov8n")
+        archiver, model_path, version, _ = pre_archived
 
         # Restore to new location
-        restore_dir = tempfile.mkdtemp()
-        restore_path = Path(restore_dir) / "restored.pt"
+        restore_path = tmp_path / "restored.pt"
 
         result = archiver.restore_from_archive(
             "yolov8n",
@@ -77,4 +102,4 @@ class TestModelArchiver:
         )
 
         assert Path(result).exists()
-        shutil.rmtree(restore_dir)
+        assert Path(result).read_bytes() == model_path.read_bytes()
@@ -9,51 +9,30 @@ from src.models.versioning import (
 )
 
 
-class TestCompatibilityChecker:
-    """Test CompatibilityChecker class functionality."""
-
-    def test_compatible_same_version(self):
-        """Test compatibility with same version."""
-        toolkit_version = ModelVersion(2, 0, 0)
-        model_version = ModelVersion(2, 0, 0)
-
-        checker = CompatibilityChecker(toolkit_version)
-        result = checker.check_compatibility(model_version)
-
-        assert result.is_compatible
-        assert len(result.warnings) == 0
-
-    def test_incompatible_major_version(self):
-        """Test incompatibility with different major version."""
-        toolkit_version = ModelVersion(2, 0, 0)
-        model_version = ModelVersion(1, 0, 0)
-
-        checker = CompatibilityChecker(toolkit_version)
-        result = checker.check_compatibility(model_version)
+TOOLKIT_V2 = ModelVersion(2, 0, 0)
+CHECKER = CompatibilityChecker(TOOLKIT_V2)
 
-        assert not result.is_compatible
-        assert len(result.warnings) > 0
-        assert "Major version mismatch" in result.reason
 
-    def test_compatible_with_minor_warning(self):
-        """Test compatibility with minor version difference."""
-        toolkit_version = ModelVersion(2, 0, 0)
-        model_version = ModelVersion(2, 1, 0)
-
-        checker = CompatibilityChecker(toolkit_version)
-        result = checker.check_compatibility(model_version)
-
-        assert result.is_compatible
-        assert len(result.warnings) == 1
-        assert "Minor version difference" in result.warnings[0]
-
-    def test_compatible_patch_version(self):
-        """Test compatibility with patch version difference."""
-        toolkit_version = ModelVersion(2, 0, 0)
-        model_version = ModelVersion(2, 0, 1)
-
-        checker = CompatibilityChecker(toolkit_version)
-        result = checker.check_compatibility(model_version)
+class TestCompatibilityChecker:
+    """Test CompatibilityChecker class functionality."""
 
-        assert result.is_compatible
-        assert len(result.warnings) == 0
+    @pytest.mark.parametrize(
+        "model, compatible, num_warnings, warning_contains",
+        [
+            ((2, 0, 0), True, 0, None),
+            ((1, 0, 0), False, 1, "Major version mismatch"),
+            ((2, 1, 0), True, 1, "Minor version difference"),
+            ((2, 0, 1), True, 0, None),
+        ],
+        ids=["same_version", "major_mismatch", "minor_warning", "patch_difference"],
+    )
+    def test_compatibility(self, model, compatible, num_warnings, warning_contains):
+        """Test compatibility with toolkit v2.0.0 across major/minor/patch differences."""
+        result = CHECKER.check_compatibility(ModelVersion(*model))
+
+        assert result.is_compatible is compatible
+        assert len(result.warnings) == num_warnings
+        if warning_contains:
+            assert warning_contains in result.warnings[0]
+        if not compatible:
+            assert warning_contains in result.reason
@@ -13,28 +13,27 @@ import requests
 from src.models.model_manager import ModelManager, ModelDownloadError, IntegrityError
 
 
-@pytest.fixture
-def temp_cache_dir(tmp_path):
-    """Create a temporary cache directory for testing."""
-    cache_dir = tmp_path / "cache" / "models"
+@pytest.fixture(scope="module")
+def temp_cache_dir(tmp_path_factory):
+    """Create a temporary cache directory shared by this module's tests."""
+    cache_dir = tmp_path_factory.mktemp("cache") / "models"
     cache_dir.mkdir(parents=True)
     return cache_dir
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def model_manager(temp_cache_dir):
     """Create a ModelManager instance with temporary cache."""
-    # Reset singleton for testing
-    ModelManager._instance = None
     return ModelManager(cache_dir=temp_cache_dir)
 
 
 @pytest.fixture
 def mock_model_file(temp_cache_dir):
-    """Create a mock model file for testing."""
+    """Create a mock model file for testing, removed again afterwards."""
     model_path = temp_cache_dir / "yolov8n.pt"
     model_path.write_bytes(b"fake model data for testing")
-    return model_path
+    yield model_path
+    model_path.unlink(missing_ok=True)
 
 
 class TestModelManagerInit:
@@ -42,7 +41,7 @@ class TestModelManagerInit:
 
     def test_singleton_pattern(self, temp_cache_dir):
         """Test that ModelManager implements singleton pattern."""
-        ModelManager._instance = None
+        ModelManager._get.cache_clear()
 
         manager1 = ModelManager(cache_dir=temp_cache_dir)
         manager2 = ModelManager(cache_dir=temp_cache_dir)
@@ -50,9 +49,18 @@ class TestModelManagerInit:
         assert manager1 is manager2
         assert id(manager1) == id(manager2)
 
+    def test_singleton_per_cache_dir(self, tmp_path):
+        """Test that each cache directory gets its own shared instance."""
+        manager1 = ModelManager(cache_dir=tmp_path / "a")
+        manager2 = ModelManager(cache_dir=tmp_path / "b")
+
+        assert manager1 is not manager2
+        assert manager1 is ModelManager(cache_dir=tmp_path / "a")
+        assert manager2.cache_dir == tmp_path / "b"
+
     def test_cache_dir_creation(self, tmp_path):
         """Test that cache directory is created if it doesn't exist."""
-        ModelManager._instance = None
+        ModelManager._get.cache_clear()
         cache_dir = tmp_path / "new_cache"
 
         ModelManager(cache_dir=cache_dir)
@@ -62,7 +70,7 @@ class TestModelManagerInit:
 
     def test_default_cache_dir(self):
         """Test default cache directory location."""
-        ModelManager._instance = None
+        ModelManager._get.cache_clear()
         manager = ModelManager()
 
         expected_dir = Path.home() / ".cache" / "edge-detection" / "models"
@@ -95,19 +103,28 @@ class TestModelDownload:
         assert "Unknown model" in str(exc_info.value)
 
 
+@pytest.fixture(scope="class")
+def mock_response():
+    """Successful streamed response, shared by the tests in a class."""
+    mock_response = Mock()
+    mock_response.headers = {'content-length': '4'}
+    # A fresh generator per call, so the response can be consumed repeatedly
+    mock_response.iter_content.side_effect = lambda *args, **kwargs: iter((b"data",))
+    return mock_response
+
+
 class TestRetryLogic:
     """Test download retry logic."""
 
-    @patch('requests.get')
-    def test_retry_on_failure(self, mock_get, model_manager):
+    @pytest.fixture
+    def mock_get(self, model_manager):
+        """Patch the manager's HTTP session."""
+        with patch.object(model_manager._session, 'get') as mock_get:
+            yield mock_get
+
+    def test_retry_on_failure(self, mock_get, mock_response, model_manager):
         """Test that download retries on failure."""
         # Fail first two attempts, succeed on third
-        mock_response = Mock()
-        mock_response.headers = {'content-length': '1000'}
-        mock_response.iter_content.return_value = [b"data"]
-        mock_response.raise_for_status = Mock()
-
-        # First two attempts fail
         mock_get.side_effect = [
             requests.RequestException("Network error"),
             requests.RequestException("Network error"),
@@ -117,12 +134,13 @@ class TestRetryLogic:
         url = "http://test.com/model.pt"
         dest_path = model_manager.cache_dir / "model.pt"
 
-        result = model_manager._download_with_retry(url, dest_path, max_retries=3)
+        with patch('time.sleep'):
+            result = model_manager._download_with_retry(url, dest_path, max_retries=3)
 
         assert result is True
         assert mock_get.call_count == 3
+        assert dest_path.read_bytes() == b"data"
 
-    @patch('requests.get')
     def test_exponential_backoff(self, mock_get, model_manager):
         """Test exponential backoff between retries."""
         mock_get.side_effect = requests.RequestException("Network error")
@@ -135,10 +153,26 @@ class TestRetryLogic:
             )
 
             assert result is False
-            # Should sleep with exponential backoff: 1s, 2s
+            # Should sleep with jittered exponential backoff: 1-1.5s, 2-3s
             assert mock_sleep.call_count == 2
-            mock_sleep.assert_any_call(1)
-            mock_sleep.assert_any_call(2)
+            first, second = (c.args[0] for c in mock_sleep.call_args_list)
+            assert 1 <= first <= 1.5
+            assert 2 <= second <= 3
+
+    def test_backoff_is_capped(self, mock_get, model_manager):
+        """Test that backoff never exceeds RETRY_BACKOFF_MAX."""
+        mock_get.side_effect = requests.RequestException("Network error")
+
+        with patch('time.sleep') as mock_sleep:
+            model_manager._download_with_retry(
+                "http://test.com/model.pt",
+                model_manager.cache_dir / "model.pt",
+                max_retries=8
+            )
+
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(delays) == 7
+        assert max(delays) == ModelManager.RETRY_BACKOFF_MAX
 
 
 class TestModelCaching:
@@ -186,17 +220,29 @@ class TestIntegrityValidation:
         result = model_manager._validate_integrity(Path("nonexistent.pt"))
         assert result is False
 
-    def test_validate_with_checksum(self, model_manager, mock_model_file):
+    @pytest.mark.parametrize("algorithm", ["sha256", "blake3"])
+    def test_validate_with_checksum(self, model_manager, mock_model_file, algorithm):
         """Test validation with expected checksum."""
         # Calculate actual checksum
-        sha256_hash = hashlib.sha256()
-        with open(mock_model_file, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        expected_checksum = sha256_hash.hexdigest()
-
-        result = model_manager._validate_integrity(mock_model_file, expected_checksum)
-        assert result is True
+        if algorithm == "blake3":
+            blake3 = pytest.importorskip("blake3")
+            digest = blake3.blake3(mock_model_file.read_bytes()).hexdigest()
+        else:
+            digest = hashlib.sha256(mock_model_file.read_bytes()).hexdigest()
+
+        assert model_manager._validate_integrity(mock_model_file, f"{algorithm}:{digest}") is True
+        if algorithm == "sha256":
+            # Bare digests are SHA256
+            assert model_manager._validate_integrity(mock_model_file, digest) is True
+            # Hex digests match regardless of case, with or without a prefix
+            assert model_manager._validate_integrity(mock_model_file, digest.upper()) is True
+        assert model_manager._validate_integrity(mock_model_file, f"{algorithm.upper()}:{digest.upper()}") is True
+
+    def test_validate_blake3_requires_package(self, model_manager, mock_model_file):
+        """Test a blake3 checksum without the blake3 package raises ImportError."""
+        with patch('src.models.model_manager.BLAKE3_AVAILABLE', False):
+            with pytest.raises(ImportError, match="blake3"):
+                model_manager._validate_integrity(mock_model_file, "blake3:" + "0" * 64)
 
     def test_validate_with_wrong_checksum(self, model_manager, mock_model_file):
         """Test validation fails with wrong checksum."""
@@ -204,6 +250,27 @@ class TestIntegrityValidation:
         result = model_manager._validate_integrity(mock_model_file, wrong_checksum)
         assert result is False
 
+    def test_validate_reuses_download_digest(self, model_manager):
+        """Test that a freshly downloaded file is validated without re-reading it."""
+        data = b"streamed model data"
+        mock_response = Mock()
+        mock_response.headers = {'content-length': str(len(data))}
+        mock_response.iter_content.return_value = [data[:8], data[8:]]
+        dest_path = model_manager.cache_dir / "streamed.pt"
+
+        with patch.object(model_manager._session, 'get', return_value=mock_response):
+            assert model_manager._download_with_retry("http://test.com/streamed.pt", dest_path)
+
+        expected_checksum = hashlib.sha256(data).hexdigest()
+        with patch.object(model_manager, '_hash_file') as mock_hash:
+            assert model_manager._validate_integrity(dest_path, expected_checksum) is True
+            mock_hash.assert_not_called()
+
+        # Once the file changes on disk, it is hashed again
+        dest_path.write_bytes(b"tampered")
+        assert model_manager._validate_integrity(dest_path, expected_checksum) is False
+        dest_path.unlink()
+
 
 class TestCustomModelLoading:
     """Test custom model loading functionality."""
@@ -5,7 +5,7 @@ Tests version parsing, comparison, and semantic versioning logic.
 """
 
 import pytest
-from src.models.versioning import ModelVersion, VersionRange
+from src.models.versioning import ModelVersion, VersionRange, version_array
 
 
 class TestModelVersion:
@@ -27,6 +27,13 @@ class TestModelVersion:
         assert version.patch == 0
         assert version.prerelease == "alpha"
 
+    def test_parse_is_cached(self):
+        """Test that repeated parses of a string share one immutable instance."""
+        version = ModelVersion.parse("2.1.3")
+        assert ModelVersion.parse("2.1.3") is version
+        with pytest.raises(AttributeError):
+            version.major = 3
+
     def test_parse_version_with_v_prefix(self):
         """Test parsing version with 'v' prefix."""
         version = ModelVersion.parse("v2.0.0")
@@ -228,3 +235,26 @@ class TestVersionRange:
         """Test parsing invalid version range string."""
         with pytest.raises(ValueError):
             VersionRange.parse("invalid")
+
+    @pytest.mark.parametrize("range_str", [
+        "*", "=2.1.3", "=2.1.3-beta", ">2.1.3", ">=2.1.3", "<2.1.3", "<=2.1.3",
+        "^2.1.3", "~2.1.3", "2.0.0 - 2.5.0",
+    ])
+    def test_filter_compatible_matches_is_compatible(self, range_str):
+        """Test bulk filtering agrees with per-version checks, prereleases included."""
+        versions = [
+            ModelVersion(major, minor, patch, prerelease)
+            for major in (1, 2, 3)
+            for minor in (0, 1, 2, 5, 6)
+            for patch in (0, 2, 3, 4)
+            for prerelease in (None, "beta")
+        ]
+        range_spec = VersionRange.parse(range_str)
+        expected = [v for v in versions if range_spec.is_compatible(v)]
+
+        assert range_spec.filter_compatible(versions) == expected
+        assert range_spec.filter_compatible(versions, version_array(versions)) == expected
+
+    def test_filter_compatible_empty(self):
+        """Test bulk filtering of an empty list."""
+        assert VersionRange.parse("^2.0.0").filter_compatible([]) == []
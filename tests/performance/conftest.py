@@ -2,14 +2,19 @@
 Performance test fixtures and configuration.
 """
 
+import functools
 import pytest
 import numpy as np
 import torch
 from pathlib import Path
 from typing import Dict, Any
 import time
+import threading
+import tracemalloc
 import psutil
 import os
+import shutil
+import tempfile
 
 
 # Performance thresholds from NFR requirements
@@ -26,31 +31,114 @@ PERFORMANCE_THRESHOLDS = {
 }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def performance_thresholds():
     """Performance thresholds for validation."""
     return PERFORMANCE_THRESHOLDS.copy()
 
 
-@pytest.fixture
-def sample_image_640x640():
-    """Create a sample 640x640 RGB image for testing."""
-    return np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
+@pytest.fixture(scope="session")
+def _rng():
+    """Seeded random generator shared by the sample image fixtures."""
+    return np.random.default_rng(0)
 
 
-@pytest.fixture
-def sample_image_1280x720():
-    """Create a sample 1280x720 HD RGB image for testing."""
-    return np.random.randint(0, 255, (720, 1280, 3), dtype=np.uint8)
+@pytest.fixture(scope="session")
+def sample_image_640x640(_rng):
+    """Create a sample 640x640 RGB image for testing (shared, do not modify)."""
+    return _rng.integers(0, 256, (640, 640, 3), dtype=np.uint8)
+
+
+@pytest.fixture(scope="session")
+def sample_image_1280x720(_rng):
+    """Create a sample 1280x720 HD RGB image for testing (shared, do not modify)."""
+    return _rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+
+
+@pytest.fixture(scope="session")
+def sample_batch_images(_rng):
+    """Create a batch of sample images for batch processing tests (shared, do not modify)."""
+    # One allocation for the whole batch; the list holds views into it
+    return list(_rng.integers(0, 256, (8, 640, 640, 3), dtype=np.uint8))
+
+
+@pytest.fixture(scope="session")
+def sample_tensor_640x640(sample_image_640x640):
+    """
+    sample_image_640x640 preprocessed once into a (1, 3, 640, 640) float tensor.
+
+    Detectors with a detect_tensor() fast path skip their per-call
+    conversion when measured with this (shared, do not modify). The
+    channels are reversed like ultralytics does for numpy input (which it
+    reads as BGR), so detect() and detect_tensor() see the same pixels.
+    """
+    tensor = (
+        torch.from_numpy(np.ascontiguousarray(sample_image_640x640[..., ::-1]))
+        .permute(2, 0, 1)
+        .contiguous()
+        .float()
+        .div_(255.0)
+        .unsqueeze_(0)
+    )
+    if torch.cuda.is_available():
+        # Page-locked host memory lets the H2D copy run asynchronously
+        tensor = tensor.pin_memory()
+    return tensor
+
+
+def _detect_fn(detector, image):
+    """Return detector.detect_tensor for tensor inputs, else detector.detect."""
+    if isinstance(image, torch.Tensor):
+        return detector.detect_tensor
+    return detector.detect
+
+
+@pytest.fixture(scope="session")
+def yolov8_detector():
+    """
+    A yolov8n detector loaded and warmed up once per session (shared, do not reload).
+
+    Skips the requesting test if ultralytics or the model file is unavailable.
+    """
+    from src.detection.yolov8 import YOLOv8Detector
+
+    detector = YOLOv8Detector()
+    try:
+        detector.load_model("yolov8n.pt", device="cpu")
+    except (ImportError, ValueError) as e:
+        pytest.skip(f"YOLOv8 model unavailable: {e}")
+    detector.warmup()
+    return detector
+
+
+# Opt-in: EDGE_DETECTION_PERF_SHM=1 puts tmp_path on tmpfs for these tests
+SHM_ENV_VAR = "EDGE_DETECTION_PERF_SHM"
+SHM_DIR = "/dev/shm"
+
+
+@pytest.fixture(scope="session")
+def _shm_root():
+    """
+    A private /dev/shm directory for this run, or None when not enabled.
+
+    mkdtemp gives every run (and xdist worker) its own directory, so
+    concurrent runs never clean up each other's files.
+    """
+    if os.environ.get(SHM_ENV_VAR) != "1" or not os.access(SHM_DIR, os.W_OK):
+        yield None
+        return
+
+    root = tempfile.mkdtemp(prefix="pytest-perf-", dir=SHM_DIR)
+    yield Path(root)
+    shutil.rmtree(root, ignore_errors=True)
 
 
 @pytest.fixture
-def sample_batch_images():
-    """Create a batch of sample images for batch processing tests."""
-    return [
-        np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
-        for _ in range(8)
-    ]
+def tmp_path(tmp_path, _shm_root):
+    """tmp_path, moved to tmpfs when EDGE_DETECTION_PERF_SHM=1."""
+    if _shm_root is None:
+        return tmp_path
+    return Path(tempfile.mkdtemp(dir=_shm_root))
 
 
 @pytest.fixture
@@ -61,44 +149,52 @@ def temp_model_path(tmp_path):
     return model_dir
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def warmup_iterations():
     """Number of warmup iterations before benchmarking."""
     return 3
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def benchmark_iterations():
     """Number of benchmark iterations for measurement."""
     return 10
 
 
-@pytest.fixture
-def hardware_info():
-    """Get current hardware information."""
+@functools.cache
+def _hardware_info() -> Dict[str, Any]:
+    """Probe hardware once per process (CUDA queries initialize a context)."""
     import platform
 
-    info = {
+    cpu_freq = psutil.cpu_freq()
+    memory = psutil.virtual_memory()
+    cuda_available = torch.cuda.is_available()
+
+    return {
         'cpu': {
             'platform': platform.machine(),
             'cores': psutil.cpu_count(logical=False),
             'threads': psutil.cpu_count(logical=True),
-            'frequency_max': psutil.cpu_freq().max if psutil.cpu_freq() else None,
+            'frequency_max': cpu_freq.max if cpu_freq else None,
         },
         'ram': {
-            'total_gb': psutil.virtual_memory().total / (1024**3),
-            'available_gb': psutil.virtual_memory().available / (1024**3),
+            'total_gb': memory.total / (1024**3),
+            'available_gb': memory.available / (1024**3),
         },
         'gpu': {
-            'available': torch.cuda.is_available(),
-            'device_count': torch.cuda.device_count() if torch.cuda.is_available() else 0,
-            'device_name': torch.cuda.get_device_name(0) if torch.cuda.is_available() else None,
+            'available': cuda_available,
+            'device_count': torch.cuda.device_count() if cuda_available else 0,
+            'device_name': torch.cuda.get_device_name(0) if cuda_available else None,
         },
         'platform': platform.system(),
         'python_version': platform.python_version(),
     }
 
-    return info
+
+@pytest.fixture(scope="session")
+def hardware_info():
+    """Get current hardware information."""
+    return _hardware_info()
 
 
 @pytest.fixture
@@ -110,65 +206,130 @@ def measure_latency():
 
         Args:
             detector: Detector instance with detect() method
-            image: Input image
+            image: Input image, or a preprocessed tensor for detect_tensor()
             iterations: Number of measurement iterations
             warmup: Number of warmup iterations
 
         Returns:
             Dict with latency statistics (ms)
         """
+        detect = _detect_fn(detector, image)
+
         # Warmup
         for _ in range(warmup):
-            _ = detector.detect(image)
+            _ = detect(image)
 
-        # Measure
-        latencies = []
-        for _ in range(iterations):
+        # Measure into a preallocated array so the statistics below reduce
+        # one contiguous float64 buffer instead of converting a list each time
+        latencies = np.empty(iterations, dtype=np.float64)
+        for i in range(iterations):
             start = time.perf_counter()
-            _ = detector.detect(image)
+            _ = detect(image)
             end = time.perf_counter()
-            latencies.append((end - start) * 1000)  # Convert to ms
+            latencies[i] = (end - start) * 1000  # Convert to ms
+
+        # One sort yields min, max and median; no separate reductions
+        ordered = np.sort(latencies)
+        n = len(ordered)
 
         return {
-            'mean': np.mean(latencies),
-            'median': np.median(latencies),
-            'std': np.std(latencies),
-            'min': np.min(latencies),
-            'max': np.max(latencies),
+            'mean': latencies.mean(),
+            'median': 0.5 * (ordered[(n - 1) // 2] + ordered[n // 2]),
+            'std': latencies.std(),
+            'min': ordered[0],
+            'max': ordered[-1],
             'values': latencies,
         }
 
     return _measure_latency
 
 
+def _weights_mb(detector):
+    """Size of the detector's PyTorch parameters and buffers in MB, if any."""
+    module = getattr(getattr(detector, '_model', None), 'model', None)
+    if not isinstance(module, torch.nn.Module):
+        return None
+
+    tensors = [*module.parameters(), *module.buffers()]
+    return sum(t.numel() * t.element_size() for t in tensors) / (1024 * 1024)
+
+
+def _sample_rss_peak(process, stop, peak, interval_s=0.001):
+    """Poll process RSS until stop is set; peak[0] holds the highest value."""
+    while not stop.wait(interval_s):
+        peak[0] = max(peak[0], process.memory_info().rss)
+
+
 @pytest.fixture
 def measure_memory():
     """Helper function to measure memory usage."""
+    process = psutil.Process(os.getpid())
+
     def _measure_memory(detector, image):
         """
         Measure memory usage of detection.
 
+        The process RSS is sampled every millisecond during the call, so
+        'peak_mb' includes what PyTorch's and oneDNN's native allocators
+        take, not just the RSS left after the call. Python-side
+        allocations (including NumPy arrays) are additionally traced with
+        tracemalloc; these miss the native allocators and are only
+        supplementary detail. Model weights are reported separately.
+
         Args:
             detector: Detector instance
-            image: Input image
+            image: Input image, or a list of images for detect_batch()
 
         Returns:
-            Memory usage in MB
+            Dict with memory usage in MB: 'before_mb'/'after_mb' (RSS),
+            'used_mb' (RSS delta), 'peak_mb' (RSS peak during the call),
+            'python_used_mb'/'python_peak_mb' (tracemalloc net and peak),
+            'weights_mb' and, on CUDA, 'cuda_peak_mb'
         """
-        process = psutil.Process(os.getpid())
-        mem_before = process.memory_info().rss / (1024 * 1024)  # MB
+        detect = detector.detect_batch if isinstance(image, list) else detector.detect
+        cuda = torch.cuda.is_available()
 
-        # Run detection
-        _ = detector.detect(image)
+        # Leave tracing on if it was already started (e.g. -X tracemalloc)
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        if cuda:
+            torch.cuda.reset_peak_memory_stats()
 
-        mem_after = process.memory_info().rss / (1024 * 1024)  # MB
+        rss_before = process.memory_info().rss
+        peak = [rss_before]
+        stop = threading.Event()
+        sampler = threading.Thread(target=_sample_rss_peak, args=(process, stop, peak), daemon=True)
+        sampler.start()
 
-        return {
-            'before_mb': mem_before,
-            'after_mb': mem_after,
-            'used_mb': mem_after - mem_before,
-            'peak_mb': mem_after,  # Simplified
+        tracemalloc.reset_peak()
+        traced_before, _ = tracemalloc.get_traced_memory()
+
+        # Run detection
+        try:
+            _ = detect(image)
+            traced_after, traced_peak = tracemalloc.get_traced_memory()
+        finally:
+            stop.set()
+            sampler.join()
+            if not was_tracing:
+                tracemalloc.stop()
+
+        rss_after = process.memory_info().rss
+        mb = 1024 * 1024
+
+        results = {
+            'before_mb': rss_before / mb,
+            'after_mb': rss_after / mb,
+            'used_mb': (rss_after - rss_before) / mb,
+            'peak_mb': max(peak[0], rss_after) / mb,
+            'python_used_mb': (traced_after - traced_before) / mb,
+            'python_peak_mb': (traced_peak - traced_before) / mb,
+            'weights_mb': _weights_mb(detector),
         }
+        if cuda:
+            results['cuda_peak_mb'] = torch.cuda.max_memory_allocated() / mb
+        return results
 
     return _measure_memory
 
@@ -182,24 +343,28 @@ def measure_throughput():
 
         Args:
             detector: Detector instance
-            images: List of input images
+            images: List of input images or preprocessed tensors
             duration_sec: Duration to measure (seconds)
 
         Returns:
             Dict with throughput metrics
         """
-        start_time = time.time()
+        detect_fns = [_detect_fn(detector, img) for img in images]
+        start_ns = time.perf_counter_ns()
+        deadline_ns = start_ns + int(duration_sec * 1e9)
         count = 0
 
-        while time.time() - start_time < duration_sec:
-            for img in images:
-                _ = detector.detect(img)
-                count += 1
+        # Read the clock once per pass over images, not around every detection
+        while True:
+            for detect, img in zip(detect_fns, images):
+                _ = detect(img)
+            count += len(images)
 
-            if time.time() - start_time >= duration_sec:
+            now_ns = time.perf_counter_ns()
+            if now_ns >= deadline_ns:
                 break
 
-        elapsed = time.time() - start_time
+        elapsed = (now_ns - start_ns) / 1e9
         fps = count / elapsed if elapsed > 0 else 0
 
         return {
@@ -212,7 +377,7 @@ def measure_throughput():
     return _measure_throughput
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def baseline_path():
     """Path to baseline measurements file."""
     return Path(__file__).parent.parent.parent / "baselines" / "performance_baseline.json"
@@ -8,15 +8,47 @@ Validates that async doesn't block main thread and achieves 1.5x throughput gain
 import pytest
 import numpy as np
 import asyncio
+import importlib.util
+import shutil
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 import time
 
-# Import detection components
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+# Import detection components through src. only, so detection.base is not
+# loaded a second time under another module name
+from src.detection.yolov8 import YOLOv8Detector
+from src.api import AsyncDetector, BatchScheduler
 
-from detection.yolov8 import YOLOv8Detector
+MODEL_PATH = "yolov8n.pt"
+
+# Skip at collection time, before any image or detector fixture is built
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("ultralytics") is None or not Path(MODEL_PATH).exists(),
+    reason=f"Requires ultralytics and a local {MODEL_PATH} model file"
+)
+
+
+# Modules the OpenVINO precisions need besides ultralytics
+OPENVINO_REQUIREMENTS = {"fp32": (), "fp16": ("openvino",), "int8": ("openvino", "nncf")}
+
+
+@pytest.fixture(scope="session")
+def openvino_ir_cache(request, tmp_path_factory):
+    """
+    Directory for exported OpenVINO IRs, kept across runs in pytest's cache
+    (a per-session temp dir when the cache plugin is disabled).
+    """
+    cache = getattr(request.config, "cache", None)
+    if cache is not None:
+        return cache.mkdir("openvino_ir")
+    return tmp_path_factory.mktemp("openvino_ir")
+
+
+def _cached_openvino_ir(cache_dir: Path, tag: str, **export_args) -> str:
+    """OpenVINO IR of MODEL_PATH from export_openvino(**export_args), exported on first use."""
+    ir_dir = cache_dir / f"{Path(MODEL_PATH).stem}_{tag}{YOLOv8Detector.OPENVINO_SUFFIX}"
+    if not ir_dir.exists():
+        shutil.move(YOLOv8Detector.export_openvino(MODEL_PATH, **export_args), ir_dir)
+    return str(ir_dir)
 
 
 @pytest.mark.benchmark
@@ -33,19 +65,14 @@ class TestBatchProcessing:
 
     def test_synchronous_baseline(
         self,
-        temp_model_path,
+        yolov8_detector,
         sample_batch_images,
         measure_throughput
     ):
         """
         Measure synchronous detection throughput (baseline).
         """
-        pytest.skip("Skipping: Requires model file - run with actual model")
-
-        detector = YOLOv8Detector()
-        detector.load_model("yolov8n.pt", device="cpu")
-
-        results = measure_throughput(detector, sample_batch_images, duration_sec=3.0)
+        results = measure_throughput(yolov8_detector, sample_batch_images, duration_sec=3.0)
 
         print(f"\nSynchronous Throughput:")
         print(f"  FPS: {results['fps']:.2f}")
@@ -55,7 +82,7 @@ class TestBatchProcessing:
 
     def test_batch_processing_throughput(
         self,
-        temp_model_path,
+        yolov8_detector,
         sample_batch_images,
         measure_throughput,
         performance_thresholds,
@@ -67,31 +94,28 @@ class TestBatchProcessing:
 
         Compares batch vs sequential processing.
         """
-        pytest.skip("Skipping: Requires model file - run with actual model")
-
-        detector = YOLOv8Detector()
-        detector.load_model("yolov8n.pt", device="cpu")
-
         # Synchronous (sequential)
-        sync_results = measure_throughput(detector, sample_batch_images, duration_sec=3.0)
+        sync_results = measure_throughput(yolov8_detector, sample_batch_images, duration_sec=3.0)
 
         # Batch processing
         # Note: detect_batch should be more efficient
-        batch_images = sample_batch_images * 3  # More images for batch
-        start_time = time.time()
-        count = 0
-
-        while time.time() - start_time < 3.0:
-            # Process in batches of 8
-            for i in range(0, len(batch_images), 8):
-                batch = batch_images[i:i+8]
-                _ = detector.detect_batch(batch)
-                count += len(batch)
-
-            if time.time() - start_time >= 3.0:
-                break
-
-        elapsed = time.time() - start_time
+        batch = sample_batch_images[:8]
+        for _ in range(10):  # Warmup
+            _ = yolov8_detector.detect_batch(batch)
+
+        # Size a fixed-iteration loop (~3s) from one timed batch, so the
+        # clock is only read around the whole measurement
+        start_ns = time.perf_counter_ns()
+        _ = yolov8_detector.detect_batch(batch)
+        per_batch_s = (time.perf_counter_ns() - start_ns) / 1e9
+        iterations = max(10, int(3.0 / per_batch_s)) if per_batch_s > 0 else 10
+
+        start_ns = time.perf_counter_ns()
+        for _ in range(iterations):
+            _ = yolov8_detector.detect_batch(batch)
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+
+        count = iterations * len(batch)
         batch_fps = count / elapsed if elapsed > 0 else 0
 
         batch_results = {
@@ -138,55 +162,144 @@ class TestBatchProcessing:
             f"Batch: {batch_results['fps']:.2f} FPS"
         )
 
-    def test_batch_size_effectiveness(
+    def test_openvino_batch_throughput(
         self,
-        temp_model_path,
-        sample_image_640x640,
-        measure_latency
+        yolov8_detector,
+        openvino_ir_cache,
+        sample_batch_images,
+        measure_throughput
     ):
         """
-        Test optimal batch size for throughput.
+        Compare OpenVINO batch throughput against the PyTorch sequential path.
 
-        Evaluates different batch sizes to find optimal configuration.
+        Runs an OpenVINO IR with a static batch of 8 (exported once and
+        cached across runs), loaded with batch=8 so it runs in throughput
+        mode on an async infer queue.
         """
-        pytest.skip("Skipping: Requires model file - run with actual model")
+        pytest.importorskip("openvino")
 
-        detector = YOLOv8Detector()
-        detector.load_model("yolov8n.pt", device="cpu")
+        sync_results = measure_throughput(yolov8_detector, sample_batch_images, duration_sec=3.0)
 
-        batch_sizes = [1, 2, 4, 8, 16]
-        results = {}
+        ov_detector = YOLOv8Detector()
+        ov_detector.load_model(
+            _cached_openvino_ir(openvino_ir_cache, "fp16_batch8", half=True, batch=8),
+            device="cpu",
+            batch=8
+        )
+        batch_images = sample_batch_images[:8]
+        _ = ov_detector.detect_batch(batch_images)  # compile + warm up
 
-        for batch_size in batch_sizes:
-            batch = [sample_image_640x640] * batch_size
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < 3.0:
+            _ = ov_detector.detect_batch(batch_images)
+            count += len(batch_images)
+        ov_fps = count / (time.perf_counter() - start)
 
-            # Measure time for batch
-            start = time.perf_counter()
-            _ = detector.detect_batch(batch)
-            elapsed = time.perf_counter() - start
+        speedup = ov_fps / sync_results['fps'] if sync_results['fps'] > 0 else 0
+
+        print(f"\nOpenVINO Batch Throughput:")
+        print(f"  PyTorch Sync FPS: {sync_results['fps']:.2f}")
+        print(f"  OpenVINO Batch FPS: {ov_fps:.2f}")
+        print(f"  Speedup: {speedup:.2f}x")
+
+        assert ov_detector.get_model_info().metadata['backend'] == "openvino"
 
-            # Calculate per-image latency
-            per_image_ms = (elapsed / batch_size) * 1000
+    def test_batch_size_effectiveness(
+        self,
+        openvino_ir_cache,
+        sample_image_640x640,
+        sample_tensor_640x640,
+        measure_latency
+    ):
+        """
+        Test optimal batch size for throughput.
 
-            results[batch_size] = {
-                'total_time_ms': elapsed * 1000,
-                'per_image_ms': per_image_ms,
-                'throughput_fps': batch_size / elapsed if elapsed > 0 else 0
-            }
+        Evaluates different batch sizes and inference precisions to find
+        the optimal configuration. fp16/int8 run a dynamic-batch OpenVINO
+        IR exported once and cached across runs, reloaded for each batch
+        size because OpenVINO fixes its performance mode at load time;
+        torch.compile is left out so every batch size runs the same eager
+        model.
 
-        print(f"\nBatch Size Effectiveness:")
-        for batch_size, metrics in results.items():
-            print(f"  Batch {batch_size}: {metrics['per_image_ms']:.2f}ms/img, "
-                  f"{metrics['throughput_fps']:.1f} FPS")
+        Not yet verified end to end: it needs ultralytics, yolov8n.pt and,
+        for fp16/int8, openvino (plus nncf for int8), which the dev
+        environment does not have.
+        """
+        # Largest first: the first (cold) shape is the biggest one, and the
+        # smaller shapes after it mostly reuse its algorithm choices
+        batch_sizes = [16, 8, 4, 2, 1]
+        timed_iterations = 5
+        results = {}
 
-        # Find optimal batch size
+        for precision in YOLOv8Detector.PRECISIONS:
+            missing = [m for m in OPENVINO_REQUIREMENTS[precision] if importlib.util.find_spec(m) is None]
+            if missing:
+                print(f"\n  {precision}: unavailable (needs {', '.join(missing)})")
+                continue
+
+            try:
+                source = MODEL_PATH if precision == "fp32" else _cached_openvino_ir(
+                    openvino_ir_cache, f"{precision}_dynamic",
+                    half=True, int8=precision == "int8", dynamic=True
+                )
+                detectors = {}
+                for batch_size in batch_sizes:
+                    detectors[batch_size] = YOLOv8Detector()
+                    detectors[batch_size].load_model(
+                        source, device="cpu", precision=precision, batch=batch_size
+                    )
+            except (ImportError, ValueError) as e:
+                print(f"\n  {precision}: unavailable ({e})")
+                continue
+
+            for batch_size, detector in detectors.items():
+
+                # The sample is preprocessed once per session; expand() repeats
+                # it batch_size times as a view, without copying or re-running
+                # letterbox/normalize per image
+                batch = sample_tensor_640x640.expand(batch_size, -1, -1, -1)
+                # Each batch size is a new input shape (new cuDNN autotune
+                # entry, new OpenVINO shape inference)
+                detector.warmup(shape=(batch_size, 3, *sample_image_640x640.shape[:2]))
+
+                # Median of several timed calls, so one slow call (first-use
+                # autotune, scheduler noise) doesn't decide the result
+                times_ns = np.empty(timed_iterations, dtype=np.int64)
+                for i in range(timed_iterations):
+                    start_ns = time.perf_counter_ns()
+                    _ = detector.detect_preprocessed(batch)
+                    times_ns[i] = time.perf_counter_ns() - start_ns
+                elapsed = np.median(times_ns) / 1e9
+
+                # Calculate per-image latency
+                per_image_ms = (elapsed / batch_size) * 1000
+
+                results[(precision, batch_size)] = {
+                    'total_time_ms': elapsed * 1000,
+                    'per_image_ms': per_image_ms,
+                    'throughput_fps': batch_size / elapsed if elapsed > 0 else 0
+                }
+
+        print(f"\nBatch Size Effectiveness (FPS):")
+        precisions = sorted({p for p, _ in results}, key=YOLOv8Detector.PRECISIONS.index)
+        print("  Batch " + "".join(f"{p:>10}" for p in precisions))
+        for batch_size in sorted(batch_sizes):
+            row = "".join(
+                f"{results[(p, batch_size)]['throughput_fps']:>10.1f}" for p in precisions
+            )
+            print(f"  {batch_size:>5} {row}")
+
+        # Find optimal configuration
         optimal = max(results.items(), key=lambda x: x[1]['throughput_fps'])
-        print(f"\n  Optimal batch size: {optimal[0]} ({optimal[1]['throughput_fps']:.1f} FPS)")
+        (precision, batch_size), metrics = optimal
+        print(f"\n  Optimal: {precision}, batch size {batch_size} "
+              f"({metrics['throughput_fps']:.1f} FPS)")
 
     @pytest.mark.smoke
     def test_smoke_batch_processing(
         self,
-        temp_model_path,
+        yolov8_detector,
         sample_batch_images
     ):
         """
@@ -194,13 +307,8 @@ class TestBatchProcessing:
 
         Verifies batch processing works without errors.
         """
-        pytest.skip("Skipping: Requires model file - run with actual model")
-
-        detector = YOLOv8Detector()
-        detector.load_model("yolov8n.pt", device="cpu")
-
         # Process batch
-        results = detector.detect_batch(sample_batch_images[:4])
+        results = yolov8_detector.detect_batch(sample_batch_images[:4])
 
         # Verify results
         assert len(results) == 4, f"Expected 4 results, got {len(results)}"
@@ -220,7 +328,7 @@ class TestAsyncDetection:
 
     def test_async_detection_non_blocking(
         self,
-        temp_model_path,
+        yolov8_detector,
         sample_image_640x640
     ):
         """
@@ -228,27 +336,21 @@ class TestAsyncDetection:
 
         Measures that main thread remains responsive during async detection.
         """
-        pytest.skip("Skipping: Requires async API - run after Story 2.6")
-
-        # This test would use the async API from Story 2.6
-        # For now, we simulate with ThreadPoolExecutor
-
-        detector = YOLOv8Detector()
-        detector.load_model("yolov8n.pt", device="cpu")
+        async def run(async_detector):
+            # Start detection on a worker thread
+            task = asyncio.create_task(async_detector.detect_async(sample_image_640x640))
 
-        # Simulate async detection
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            # Submit detection task
-            future = executor.submit(detector.detect, sample_image_640x640)
-
-            # Main thread should be responsive
-            # Measure time until we can do other work
+            # The event loop must stay free to do other work meanwhile
             start = time.perf_counter()
+            await asyncio.sleep(0)
             dummy_work = sum(i*i for i in range(1000))
-            main_thread_time = time.perf_counter() - start
+            loop_time = time.perf_counter() - start
+
+            result = await asyncio.wait_for(task, timeout=10)
+            return loop_time, result
 
-            # Wait for detection
-            result = future.result(timeout=10)
+        with AsyncDetector(yolov8_detector, max_workers=4) as async_detector:
+            main_thread_time, result = asyncio.run(run(async_detector))
 
         # Main thread work should complete quickly (not blocked)
         assert main_thread_time < 0.1, f"Main thread blocked: {main_thread_time:.3f}s"
@@ -259,7 +361,7 @@ class TestAsyncDetection:
 
     def test_async_throughput(
         self,
-        temp_model_path,
+        yolov8_detector,
         sample_batch_images,
         measure_throughput,
         performance_thresholds
@@ -269,37 +371,26 @@ class TestAsyncDetection:
 
         Compares async workers vs synchronous processing.
         """
-        pytest.skip("Skipping: Requires async API - run after Story 2.6")
-
-        detector = YOLOv8Detector()
-        detector.load_model("yolov8n.pt", device="cpu")
-
         # Synchronous baseline
-        sync_results = measure_throughput(detector, sample_batch_images, duration_sec=2.0)
+        sync_results = measure_throughput(yolov8_detector, sample_batch_images, duration_sec=2.0)
 
-        # Async with 4 workers
+        # Async with 4 workers: the forward releases the GIL, so detections
+        # running on different workers overlap
         num_workers = 4
-        start_time = time.time()
-        count = 0
-
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = []
-
-            while time.time() - start_time < 2.0:
-                # Submit detection tasks
-                for img in sample_batch_images:
-                    future = executor.submit(detector.detect, img)
-                    futures.append(future)
-                    count += 1
 
-                if time.time() - start_time >= 2.0:
-                    break
+        async def run(async_detector):
+            count = 0
+            start_ns = time.perf_counter_ns()
+            while time.perf_counter_ns() - start_ns < 2e9:
+                await asyncio.gather(
+                    *(async_detector.detect_async(img) for img in sample_batch_images)
+                )
+                count += len(sample_batch_images)
+            return count, (time.perf_counter_ns() - start_ns) / 1e9
 
-            # Wait for all to complete
-            for future in futures:
-                future.result(timeout=10)
+        with AsyncDetector(yolov8_detector, max_workers=num_workers) as async_detector:
+            count, elapsed = asyncio.run(run(async_detector))
 
-        elapsed = time.time() - start_time
         async_fps = count / elapsed if elapsed > 0 else 0
 
         speedup = async_fps / sync_results['fps'] if sync_results['fps'] > 0 else 0
@@ -319,6 +410,49 @@ class TestAsyncDetection:
         else:
             print(f"  ⚠️  Below threshold {threshold:.1f}x")
 
+    def test_batch_scheduler_throughput(
+        self,
+        yolov8_detector,
+        sample_batch_images,
+        measure_throughput,
+        performance_thresholds
+    ):
+        """
+        Measure micro-batched throughput of concurrent single-image requests.
+
+        Requests submitted concurrently are coalesced by BatchScheduler into
+        detect_batch calls instead of each running its own forward pass.
+        """
+        # Synchronous baseline
+        sync_results = measure_throughput(yolov8_detector, sample_batch_images, duration_sec=2.0)
+
+        async def run():
+            async with BatchScheduler(yolov8_detector, max_batch=8, max_delay_ms=5) as scheduler:
+                count = 0
+                start_ns = time.perf_counter_ns()
+                while time.perf_counter_ns() - start_ns < 2e9:
+                    await asyncio.gather(*(scheduler.submit(img) for img in sample_batch_images))
+                    count += len(sample_batch_images)
+                elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+                return count, elapsed, scheduler.get_stats()
+
+        count, elapsed, stats = asyncio.run(run())
+        scheduler_fps = count / elapsed if elapsed > 0 else 0
+
+        speedup = scheduler_fps / sync_results['fps'] if sync_results['fps'] > 0 else 0
+
+        print(f"\nBatch Scheduler Throughput:")
+        print(f"  Sync FPS: {sync_results['fps']:.2f}")
+        print(f"  Scheduler FPS: {scheduler_fps:.2f}")
+        print(f"  Avg batch size: {stats['avg_batch_size']:.1f}")
+        print(f"  Speedup: {speedup:.2f}x")
+
+        threshold = performance_thresholds['async_speedup']
+        if speedup >= threshold:
+            print(f"  ✅ Meets threshold {threshold:.1f}x")
+        else:
+            print(f"  ⚠️  Below threshold {threshold:.1f}x")
+
 
 @pytest.mark.benchmark
 class TestMemoryUsage:
@@ -328,7 +462,7 @@ class TestMemoryUsage:
 
     def test_memory_within_limits(
         self,
-        temp_model_path,
+        yolov8_detector,
         sample_batch_images,
         measure_memory,
         performance_thresholds
@@ -338,33 +472,25 @@ class TestMemoryUsage:
 
         NFR-P4: Memory usage should be < 500MB.
         """
-        pytest.skip("Skipping: Requires model file - run with actual model")
-
-        detector = YOLOv8Detector()
-        detector.load_model("yolov8n.pt", device="cpu")
-
         # Measure memory for batch processing
-        import psutil
-        import os
-
-        process = psutil.Process(os.getpid())
-        mem_before = process.memory_info().rss / (1024 * 1024)  # MB
-
-        # Process batch
-        results = detector.detect_batch(sample_batch_images)
-
-        mem_after = process.memory_info().rss / (1024 * 1024)  # MB
-        mem_used = mem_after - mem_before
+        mem = measure_memory(yolov8_detector, sample_batch_images)
 
         print(f"\nMemory Usage:")
-        print(f"  Before: {mem_before:.2f}MB")
-        print(f"  After: {mem_after:.2f}MB")
-        print(f"  Used: {mem_used:.2f}MB")
-
-        # Check threshold
+        print(f"  Weights: {mem['weights_mb']:.2f}MB")
+        print(f"  Process RSS peak: {mem['peak_mb']:.2f}MB")
+        print(f"  Process RSS after: {mem['after_mb']:.2f}MB")
+        print(f"  Python allocations (tracemalloc) peak: {mem['python_peak_mb']:.2f}MB")
+        if 'cuda_peak_mb' in mem:
+            print(f"  CUDA peak: {mem['cuda_peak_mb']:.2f}MB")
+
+        # Check threshold against memory the native allocators actually took
         threshold = performance_thresholds['memory_mb']
-        assert mem_after < threshold, (
-            f"Memory usage {mem_after:.2f}MB exceeds threshold {threshold}MB"
+        assert mem['peak_mb'] < threshold, (
+            f"Process RSS peak {mem['peak_mb']:.2f}MB exceeds threshold {threshold}MB"
         )
+        if 'cuda_peak_mb' in mem:
+            assert mem['cuda_peak_mb'] < threshold, (
+                f"CUDA peak memory {mem['cuda_peak_mb']:.2f}MB exceeds threshold {threshold}MB"
+            )
 
         print(f"  ✅ Within threshold {threshold}MB")
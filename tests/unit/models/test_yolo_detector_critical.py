@@ -183,6 +183,26 @@ class TestModelLoading:
         with pytest.raises(ImportError):
             detector.load_model()
 
+    @pytest.mark.unit
+    @patch('src.models.yolo_detector.YOLO')
+    def test_lazy_load_defers_model_until_first_detect(self, mock_yolo_class,
+                                                       mock_yolo_model, sample_image):
+        """
+        [P1] GIVEN: YOLODetector created with lazy_load=True
+        WHEN: detect() is called without load_model()
+        THEN: Model is loaded once, on the first detection
+        """
+        mock_yolo_class.return_value = mock_yolo_model
+
+        detector = YOLODetector(model_path='yolov8n.pt', lazy_load=True)
+        assert detector.model is None
+        mock_yolo_class.assert_not_called()
+
+        detector.detect(sample_image)
+        detector.detect(sample_image)
+
+        mock_yolo_class.assert_called_once_with('yolov8n.pt')
+
 
 class TestObjectDetection:
     """
@@ -280,6 +300,39 @@ class TestObjectDetection:
         # THEN: Returns at most 100 detections
         assert len(detections) <= 100
 
+    @pytest.mark.unit
+    @patch('src.models.yolo_detector.YOLO')
+    def test_detect_truncates_to_first_max_detections(self, mock_yolo_class, sample_image):
+        """
+        [P0] GIVEN: Model returning 20 stacked boxes and max_detections=5
+        WHEN: detect() is called
+        THEN: Exactly the first 5 boxes are returned as plain Python values
+        """
+        import torch
+        mock_box = Mock()
+        mock_box.xyxy = [torch.tensor([[i, i, i + 10, i + 10] for i in range(20)])]
+        mock_box.conf = [torch.linspace(0.9, 0.5, 20)]
+        mock_box.cls = [torch.zeros(20)]
+
+        mock_result = Mock()
+        mock_result.boxes = [mock_box]
+        mock_result.names = {0: "person"}
+
+        mock_model = Mock()
+        mock_model.return_value = [mock_result]
+        mock_yolo_class.return_value = mock_model
+
+        detector = YOLODetector(config=ConfigManager())
+        detector.max_detections = 5
+        detector.load_model()
+
+        detections = detector.detect(sample_image)
+
+        assert len(detections) == 5
+        assert [d['bbox'][0] for d in detections] == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert all(isinstance(d['confidence'], float) for d in detections)
+        assert all(d['class_id'] == 0 and d['class_name'] == "person" for d in detections)
+
     @pytest.mark.unit
     @patch('src.models.yolo_detector.YOLO')
     def test_detect_with_no_detections(self, mock_yolo_class, sample_image):
@@ -403,6 +403,18 @@ class TestDotNotationAccess:
         else:
             pytest.fail("ConfigManager not implemented")
 
+    def test_defaults_available_before_load(self):
+        """Test that built-in defaults are usable without calling load_config()"""
+        if ConfigManager:
+            manager = ConfigManager()
+            assert manager.get('model.path') == 'yolov8n.pt'
+
+            # Each instance owns its copy of the defaults
+            manager.set('detection.max_detections', 5)
+            assert ConfigManager().get('detection.max_detections') == 100
+        else:
+            pytest.fail("ConfigManager not implemented")
+
 
 class TestProfileLoading:
     """Test profile-based configuration loading"""
@@ -477,6 +489,31 @@ class TestProfileLoading:
         else:
             pytest.fail("ConfigManager not implemented")
 
+    def test_switch_profile_reapplies_profile_layer(self, tmp_path):
+        """Test that switch_profile replaces the profile layer on the loaded base"""
+        default_config = tmp_path / "default.yaml"
+        with open(default_config, 'w') as f:
+            yaml.dump({'detection': {'confidence_threshold': 0.5, 'iou_threshold': 0.4}}, f)
+        with open(tmp_path / "dev.yaml", 'w') as f:
+            yaml.dump({'detection': {'confidence_threshold': 0.3}}, f)
+        with open(tmp_path / "prod.yaml", 'w') as f:
+            yaml.dump({'detection': {'iou_threshold': 0.6}}, f)
+
+        if ConfigManager:
+            manager = ConfigManager(default_config=str(default_config), profile='dev')
+            manager.config_dir = tmp_path
+            assert manager.load_config()['detection']['confidence_threshold'] == 0.3
+
+            config = manager.switch_profile('prod')
+
+            # Dev overrides are gone, prod overrides applied, base kept
+            assert manager.profile == 'prod'
+            assert config['detection']['confidence_threshold'] == 0.5
+            assert config['detection']['iou_threshold'] == 0.6
+            assert manager.get('detection.iou_threshold') == 0.6
+        else:
+            pytest.fail("ConfigManager not implemented")
+
     def test_missing_profile_raises_error(self, tmp_path):
         """Test that missing profile file raises helpful error"""
         default_config = tmp_path / "default.yaml"
@@ -662,6 +699,31 @@ class TestConfigValidationIntegration:
         else:
             pytest.fail("ConfigManager not implemented")
 
+    def test_validate_reuses_load_config_result(self, tmp_path, monkeypatch):
+        """Test that validate() right after load_config() does not re-run the rules"""
+        config_file = tmp_path / "config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump({'detection': {'confidence_threshold': 0.6}}, f)
+
+        if ConfigManager:
+            manager = ConfigManager(str(config_file))
+            manager.load_config()
+
+            calls = []
+            original = manager.validator.validate_values
+            monkeypatch.setattr(manager.validator, 'validate_values',
+                                lambda values: calls.append(1) or original(values))
+
+            assert manager.validate() is True
+            assert calls == []
+
+            # Any change to a validated value forces a fresh pass
+            manager.set('detection.confidence_threshold', 1.5)
+            assert manager.validate() is False
+            assert calls == [1]
+        else:
+            pytest.fail("ConfigManager not implemented")
+
 
 class TestProfileValidation:
     """Test validation with profile-based configurations"""
@@ -727,6 +789,44 @@ class TestProfileValidation:
             pytest.fail("ConfigManager not implemented")
 
 
+class TestYAMLCache:
+    """Test mtime/size keyed caching of parsed YAML files"""
+
+    def test_repeat_load_returns_independent_copies(self, tmp_path):
+        """Test that cached documents can be mutated without affecting later loads"""
+        config_file = tmp_path / "config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump({'detection': {'confidence_threshold': 0.6}}, f)
+
+        if ConfigManager:
+            ConfigManager.clear_cache()
+            first = ConfigManager(str(config_file)).load_config()
+            first['detection']['confidence_threshold'] = 0.9
+
+            second = ConfigManager(str(config_file)).load_config()
+            assert second['detection']['confidence_threshold'] == 0.6
+        else:
+            pytest.fail("ConfigManager not implemented")
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        """Test that a changed file invalidates the cached document"""
+        config_file = tmp_path / "config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump({'detection': {'confidence_threshold': 0.6}}, f)
+
+        if ConfigManager:
+            ConfigManager.clear_cache()
+            manager = ConfigManager(str(config_file))
+            assert manager.load_config()['detection']['confidence_threshold'] == 0.6
+
+            with open(config_file, 'w') as f:
+                yaml.dump({'detection': {'confidence_threshold': 0.75}}, f)
+
+            assert manager.load_config()['detection']['confidence_threshold'] == 0.75
+        else:
+            pytest.fail("ConfigManager not implemented")
+
+
 # Run tests if this file is executed directly
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -11,6 +11,7 @@ from src.preprocessing.image_processor import (
     ImageAugmentor,
     EdgeOptimizer
 )
+from src.preprocessing._kernels import hwc_u8_to_chw_f32, letterbox_into, preprocess_into
 
 
 @pytest.mark.unit
@@ -120,6 +121,76 @@ class TestImageProcessor:
 
             assert padded.shape == (640, 640, 3)
 
+    @pytest.mark.unit
+    def test_decode_scaled_limits_long_side(self):
+        """Test decode_scaled decodes JPEG bytes to max_dim on the long side"""
+        processor = ImageProcessor(target_size=(640, 640))
+        image = np.random.randint(0, 255, (1200, 1600, 3), dtype=np.uint8)
+        ok, encoded = cv2.imencode('.jpg', image)
+        assert ok
+
+        decoded = processor.decode_scaled(encoded.tobytes())
+
+        assert decoded.shape == (480, 640, 3)
+        assert decoded.dtype == np.uint8
+
+    @pytest.mark.unit
+    def test_decode_scaled_rejects_invalid_data(self):
+        """Test decode_scaled raises ValueError for non-image data"""
+        processor = ImageProcessor()
+
+        with pytest.raises(ValueError):
+            processor.decode_scaled(b'not an image')
+
+    @pytest.mark.unit
+    def test_letterbox_kernel_matches_cv2_resize(self):
+        """Test fused letterbox kernel agrees with cv2.resize and keeps the padding"""
+        image = np.random.randint(0, 255, (30, 40, 3), dtype=np.uint8)
+        padded = np.full((64, 64, 3), 114, dtype=np.uint8)
+
+        letterbox_into(image, padded, 0, 8, 64, 48)
+
+        expected = cv2.resize(image, (64, 48), interpolation=cv2.INTER_LINEAR)
+        diff = np.abs(padded[8:56].astype(np.int16) - expected.astype(np.int16))
+        assert diff.max() <= 1
+        assert (padded[:8] == 114).all()
+        assert (padded[56:] == 114).all()
+
+    @pytest.mark.unit
+    def test_preprocess_kernel_matches_reference(self):
+        """Test fused preprocess kernel matches resize + RGB + normalize + CHW"""
+        processor = ImageProcessor(target_size=(64, 64))
+        image = np.random.randint(0, 255, (30, 40, 3), dtype=np.uint8)
+
+        resized = cv2.resize(image, (64, 48), interpolation=cv2.INTER_LINEAR)
+        rgb = resized[:, :, ::-1].astype(np.float32) / 255.0
+        expected = ((rgb - processor.mean) / processor.std).transpose(2, 0, 1)
+
+        scale = (1.0 / (255.0 * processor.std)).astype(np.float32)
+        offset = (-processor.mean / processor.std).astype(np.float32)
+        out = np.empty((3, 64, 64), dtype=np.float32)
+        out[...] = offset[:, None, None]
+        preprocess_into(image, out, 0, 8, 64, 48, scale, offset)
+
+        np.testing.assert_allclose(out[:, 8:56], expected, atol=0.05)
+        np.testing.assert_allclose(out[:, :8], np.broadcast_to(offset[:, None, None], (3, 8, 64)))
+
+    @pytest.mark.unit
+    def test_layout_kernel_matches_numpy(self):
+        """Test HWC uint8 -> CHW float32 kernel matches the NumPy chain"""
+        processor = ImageProcessor()
+        image = np.random.randint(0, 255, (16, 24, 3), dtype=np.uint8)
+
+        rgb = image[:, :, ::-1].astype(np.float32) / 255.0
+        expected = ((rgb - processor.mean) / processor.std).transpose(2, 0, 1)
+
+        scale = (1.0 / (255.0 * processor.std)).astype(np.float32)
+        offset = (-processor.mean / processor.std).astype(np.float32)
+        out = np.empty((3, 16, 24), dtype=np.float32)
+        hwc_u8_to_chw_f32(image, out, scale, offset)
+
+        np.testing.assert_allclose(out, expected, atol=1e-5)
+
     @pytest.mark.unit
     def test_batch_preprocess(self, sample_images_batch):
         """Test batch preprocessing"""
@@ -129,6 +200,16 @@ class TestImageProcessor:
         assert batch.shape[0] == len(sample_images_batch)
         assert batch.shape[1] == 3  # Channels
         assert len(batch.shape) == 4  # NCHW format
+        assert batch.dtype == np.float32
+
+    @pytest.mark.unit
+    def test_batch_preprocess_uint8_keeps_raw_pixels(self, sample_images_batch):
+        """Test uint8 processor returns raw RGB pixels in NCHW layout"""
+        processor = ImageProcessor(dtype=np.uint8)
+        batch = processor.batch_preprocess(sample_images_batch)
+
+        assert batch.dtype == np.uint8
+        assert batch.shape == (len(sample_images_batch), 3, 640, 640)
 
 
 @pytest.mark.unit
@@ -165,6 +165,26 @@ class TestONNXDetector:
 
         assert isinstance(preprocessed, np.ndarray)
 
+    def test_preprocess_uint8_input_skips_float_conversion(self, tmp_path):
+        """Test models with a uint8 input get raw pixels without /255 scaling."""
+        onnx_file = tmp_path / "test.onnx"
+        onnx_file.write_bytes(b"dummy onnx model")
+
+        config = {
+            'model_path': str(onnx_file),
+            'device': 'cpu'
+        }
+        detector = ONNXDetector(config=config)
+        # As set by load_model() for a 'tensor(uint8)' input
+        detector.uint8_input = True
+
+        test_image = np.full((640, 640, 3), 200, dtype=np.uint8)
+        preprocessed = detector.preprocess(test_image)
+
+        assert preprocessed.dtype == np.uint8
+        assert preprocessed.shape == (1, 3, 640, 640)
+        assert preprocessed.max() == 200
+
     def test_postprocess(self, tmp_path):
         """Test output postprocessing."""
         onnx_file = tmp_path / "test.onnx"
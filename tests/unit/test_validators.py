@@ -396,6 +396,37 @@ class TestValidationErrorDataclass:
         assert error.hint == 'Use valid value'
 
 
+class TestSinglePassValidation:
+    """Test value collection and rule checking as separate passes"""
+
+    def test_collect_values_follows_rule_order(self):
+        """Test that collected values line up with validator.rules"""
+        validator = ConfigValidator()
+        config = {'detection': {'confidence_threshold': 0.7}}
+
+        values = validator.collect_values(config)
+
+        assert len(values) == len(validator.rules)
+        for rule, value in zip(validator.rules, values):
+            expected = 0.7 if rule.parameter_path == 'detection.confidence_threshold' else None
+            assert value == expected
+
+    def test_validate_values_matches_validate(self):
+        """Test that validating collected values gives the same errors as validate()"""
+        validator = ConfigValidator()
+        config = {
+            'detection': {'confidence_threshold': 1.5, 'iou_threshold': -0.5},
+            'metrics': {'port': 80}
+        }
+
+        errors = validator.validate_values(validator.collect_values(config))
+
+        assert errors == validator.validate(config)
+        assert {e.parameter for e in errors} == {
+            'detection.confidence_threshold', 'detection.iou_threshold', 'metrics.port'
+        }
+
+
 class TestValidatorExceptionHandling:
     """Test exception handling in validators (Issue #8)"""
 